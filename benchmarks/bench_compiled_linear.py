@@ -0,0 +1,63 @@
+"""
+Latencia por request (un texto por llamada) de la Regresión Logística:
+pipeline de sklearn vs scorer compilado.
+
+Uso:
+    python -m benchmarks.bench_compiled_linear [--requests 2000]
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.model.logistic_regression_model import LogisticRegressionModel
+from src.settings import DATA_PATH, LOGISTIC_REGRESSION_MODEL_PATH
+
+
+def measure(fn: Callable[[List[str]], object], texts: List[str]) -> Dict[str, float]:
+    """Latencias en microsegundos llamando a `fn` con un texto por vez."""
+    for text in texts[:50]:
+        fn([text])
+
+    latencies = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        started = time.perf_counter()
+        fn([text])
+        latencies[i] = (time.perf_counter() - started) * 1e6
+
+    return {
+        'p50_us': float(np.percentile(latencies, 50)),
+        'p95_us': float(np.percentile(latencies, 95)),
+        'mean_us': float(latencies.mean()),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Cantidad de requests a medir")
+    args = parser.parse_args(argv)
+
+    if LOGISTIC_REGRESSION_MODEL_PATH.exists():
+        pipeline = LogisticRegressionModel.load(LOGISTIC_REGRESSION_MODEL_PATH)._pipeline
+    else:
+        pipeline = LogisticRegressionModel.train(DATA_PATH, LOGISTIC_REGRESSION_MODEL_PATH)._pipeline
+
+    texts = pd.read_csv(DATA_PATH)["message"].astype(str).tolist()
+    texts = (texts * (args.requests // len(texts) + 1))[:args.requests]
+
+    engines = {
+        'sklearn': LogisticRegressionModel(pipeline),
+        'compiled': LogisticRegressionModel(pipeline, compiled=True),
+    }
+    results = {name: measure(model.predict_with_proba, texts) for name, model in engines.items()}
+
+    print(f"{'motor':<10} {'p50 (µs)':>10} {'p95 (µs)':>10} {'media (µs)':>11}")
+    for name, stats in results.items():
+        print(f"{name:<10} {stats['p50_us']:>10.1f} {stats['p95_us']:>10.1f} {stats['mean_us']:>11.1f}")
+    print(f"\nspeedup p50: {results['sklearn']['p50_us'] / results['compiled']['p50_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
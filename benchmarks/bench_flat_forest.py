@@ -0,0 +1,46 @@
+"""
+Latencia por request (un texto por llamada) y throughput en lote del Random
+Forest: sklearn vs bosque aplanado.
+
+Uso:
+    python -m benchmarks.bench_flat_forest [--requests 500] [--batch 1000]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.bench_compiled_linear import measure
+from src.model.flat_forest import flat_path
+from src.model.random_forest_model import RandomForestModel
+from src.settings import DATA_PATH, RANDOM_FOREST_MODEL_PATH
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="Cantidad de requests a medir")
+    parser.add_argument("--batch", type=int, default=1000, help="Textos del lote para medir throughput")
+    args = parser.parse_args(argv)
+
+    if not RANDOM_FOREST_MODEL_PATH.exists() or not flat_path(RANDOM_FOREST_MODEL_PATH).exists():
+        RandomForestModel.train(DATA_PATH, str(RANDOM_FOREST_MODEL_PATH))
+
+    texts = pd.read_csv(DATA_PATH)["message"].astype(str).tolist()
+    texts = (texts * (max(args.requests, args.batch) // len(texts) + 1))
+
+    engines = {
+        'sklearn': RandomForestModel.load(RANDOM_FOREST_MODEL_PATH),
+        'flat': RandomForestModel.load(RANDOM_FOREST_MODEL_PATH, flat=True),
+    }
+
+    print(f"{'motor':<10} {'p50 (µs)':>10} {'p95 (µs)':>10} {'lote (textos/s)':>16}")
+    for name, model in engines.items():
+        stats = measure(model.predict_with_proba, texts[:args.requests])
+        started = time.perf_counter()
+        model.predict_with_proba(texts[:args.batch])
+        throughput = args.batch / (time.perf_counter() - started)
+        print(f"{name:<10} {stats['p50_us']:>10.1f} {stats['p95_us']:>10.1f} {throughput:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Efecto del TextNormalizer en el tamaño del vocabulario y en el throughput
+de vectorización: TF-IDF sin normalizar vs normalizado.
+
+Mide con las reseñas de data/reviews.csv (largas, no se memoizan) y con
+mensajes cortos que se repiten, como llegan a la API.
+
+Uso:
+    python -m benchmarks.bench_text_normalizer [--texts 5000]
+"""
+import argparse
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from src.model.training import build_tfidf, split_dataset
+from src.settings import DATA_PATH
+
+SHORT_MESSAGES = [
+    "Excelente atención!!",
+    "Pésimo servicio 😡",
+    "muy buenoooo 👍",
+    "No me respondieron",
+    "Llegó a tiempo.",
+    "¡¡¡Nunca más!!!",
+    "Todo bien, gracias",
+    "El pedido llegó roto 💔",
+]
+
+
+def throughput(vectorizer, texts: List[str], repeats: int = 3) -> float:
+    """Textos por segundo de `transform` (el mejor de `repeats`)."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        vectorizer.transform(texts)
+        best = min(best, time.perf_counter() - started)
+    return len(texts) / best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=5000, help="Cantidad de textos a vectorizar por medición")
+    args = parser.parse_args(argv)
+
+    X_train, X_test, _, _ = split_dataset(DATA_PATH)
+    reviews = X_test.astype(str).tolist()
+    reviews = (reviews * (args.texts // len(reviews) + 1))[:args.texts]
+    short = (SHORT_MESSAGES * (args.texts // len(SHORT_MESSAGES) + 1))[:args.texts]
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, normalize in [('sin normalizar', False), ('normalizado', True)]:
+        full = build_tfidf(normalize=normalize, ngram_range=(1, 2)).fit(X_train)
+        vectorizer = build_tfidf(normalize=normalize, max_features=5000, ngram_range=(1, 2)).fit(X_train)
+        results[name] = {
+            'vocabulary': len(full.vocabulary_),
+            'reviews_per_sec': throughput(vectorizer, reviews),
+            'short_per_sec': throughput(vectorizer, short),
+            'nnz_per_review': vectorizer.transform(reviews[:500]).nnz / 500,
+        }
+
+    print(f"{'vectorizador':<15} {'vocabulario':>12} {'reseñas/s':>11} {'cortos/s':>10} {'nnz/reseña':>11}")
+    for name, stats in results.items():
+        print(
+            f"{name:<15} {stats['vocabulary']:>12} {stats['reviews_per_sec']:>11.0f} "
+            f"{stats['short_per_sec']:>10.0f} {stats['nnz_per_review']:>11.1f}"
+        )
+
+    plain, normalized = results['sin normalizar'], results['normalizado']
+    print(f"\nvocabulario: {normalized['vocabulary'] / plain['vocabulary'] - 1:+.1%}")
+    print(f"throughput reseñas: {normalized['reviews_per_sec'] / plain['reviews_per_sec']:.2f}x")
+    print(f"throughput mensajes cortos: {normalized['short_per_sec'] / plain['short_per_sec']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Suite de benchmarks de inferencia con comparación contra un baseline.
+
+Mide, para cada modelo y con textos de data/reviews.csv:
+- latencia de un texto por llamada de `SentimentAnalyzer.analyze` y `predict`
+- throughput de `analyze_many` con distintos tamaños de lote
+- arranque en frío (carga del modelo + primer análisis) y memoria, en un proceso nuevo
+- latencia del endpoint POST /analyze (en proceso, con TestClient)
+
+Uso:
+    python -m benchmarks.suite [--output resultados.json] [--save-baseline] [--check]
+
+Si existe el baseline (benchmarks/baseline.json por defecto), compara los
+resultados y termina con código 1 si alguna métrica empeoró más que
+`--tolerance`. Sin baseline solo avisa, salvo con --check (el modo para CI),
+que termina con código 2 antes de medir.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer.registry import create_default_registry
+from src.settings import DATA_PATH
+
+BASELINE_PATH = Path("benchmarks/baseline.json")
+
+DEFAULT_MODELS = ["logistic_regression", "random_forest"]
+DEFAULT_BATCH_SIZES = [1, 8, 32, 128, 512]
+
+# Métricas que empeoran al subir y al bajar
+LOWER_IS_BETTER = {"p50_ms", "p95_ms", "p99_ms", "cold_start_ms", "memory_mb"}
+HIGHER_IS_BETTER = {"items_per_sec"}
+
+
+def summarize(latencies: List[float], items: int = 1) -> Dict[str, float]:
+    """Percentiles en ms e items por segundo a partir de las duraciones (s) de cada llamada."""
+    latencies = np.asarray(latencies)
+    return {
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'items_per_sec': float(items * len(latencies) / latencies.sum()),
+    }
+
+
+def time_calls(fn: Callable[[Any], Any], args: List[Any], warmup: int = 20) -> List[float]:
+    for arg in args[:warmup]:
+        fn(arg)
+
+    latencies = []
+    for arg in args:
+        started = time.perf_counter()
+        fn(arg)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def sample_texts(n: int, seed: int = 0) -> List[str]:
+    texts = pd.read_csv(DATA_PATH)["message"].dropna().astype(str)
+    return texts.sample(n, replace=n > len(texts), random_state=seed).tolist()
+
+
+def bench_model(model: str, texts: List[str], batch_sizes: List[int]) -> Dict[str, Any]:
+    # Sin cache de resultados: se mide el modelo, no los aciertos del cache
+    analyzer = create_default_registry(use_cache=False).get(model)
+
+    batches = {}
+    for size in batch_sizes:
+        repeats = max(5, min(50, len(texts) // size))
+        chunks = [texts[(i * size) % len(texts):][:size] or texts[:size] for i in range(repeats)]
+        batches[str(size)] = summarize(time_calls(analyzer.analyze_many, chunks, warmup=1), items=size)
+
+    return {
+        'analyze': summarize(time_calls(analyzer.analyze, texts)),
+        'predict': summarize(time_calls(analyzer.predict, texts)),
+        'batch': batches,
+        **cold_start(model, texts[0]),
+    }
+
+
+def cold_start(model: str, text: str) -> Dict[str, float]:
+    """Carga + primer análisis en un proceso nuevo, con la memoria que suma."""
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_cold_start_child, (model, text))
+
+
+def _cold_start_child(model: str, text: str) -> Dict[str, float]:
+    registry = create_default_registry(use_cache=False)
+    started = time.perf_counter()
+    analyzer = registry.get(model)
+    analyzer.analyze(text)
+    elapsed = time.perf_counter() - started
+
+    # La memoria se mide aparte para no sumar el costo de tracemalloc al arranque.
+    # Cuenta lo que queda vivo tras cargar el modelo (los arrays mapeados con mmap no suman)
+    tracemalloc.start()
+    traced = create_default_registry(use_cache=False)
+    traced.get(model).analyze(text)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {'cold_start_ms': elapsed * 1000, 'memory_mb': memory / (1024 * 1024)}
+
+
+def bench_endpoint(models: List[str], texts: List[str]) -> Dict[str, Any]:
+    """Latencia de POST /analyze de punta a punta (validación, batcher, pool y modelo)."""
+    from fastapi.testclient import TestClient
+
+    from src import main_api
+
+    main_api.registry = create_default_registry(use_cache=False)
+    results = {}
+    with TestClient(main_api.app) as client:
+        while not main_api.registry.is_ready():
+            time.sleep(0.1)
+        for model in models:
+            def post(text: str) -> None:
+                client.post("/analyze", json={"text": text, "model": model}).raise_for_status()
+            results[model] = summarize(time_calls(post, texts))
+    return results
+
+
+def run(models: List[str], requests: int, batch_sizes: List[int], endpoint: bool = True) -> Dict[str, Any]:
+    # Entrena los modelos que falten antes de medir
+    registry = create_default_registry(use_cache=False)
+    for model in models:
+        registry.get(model)
+
+    texts = sample_texts(requests)
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'requests': requests,
+        },
+        'models': {model: bench_model(model, texts, batch_sizes) for model in models},
+    }
+    if endpoint:
+        results['endpoint'] = bench_endpoint(models, texts)
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Métricas que empeoraron más que `tolerance` respecto del baseline."""
+    regressions = []
+    for path, base_value, value in _paired_metrics(current, baseline):
+        metric = path[-1]
+        if metric in LOWER_IS_BETTER and value > base_value * (1 + tolerance):
+            regressions.append(f"{'.'.join(path)}: {base_value:.3f} -> {value:.3f}")
+        elif metric in HIGHER_IS_BETTER and value < base_value * (1 - tolerance):
+            regressions.append(f"{'.'.join(path)}: {base_value:.1f} -> {value:.1f}")
+    return regressions
+
+
+def _paired_metrics(current: Dict[str, Any], baseline: Dict[str, Any], path=()):
+    for key, base_value in baseline.items():
+        if key == 'meta' or key not in current:
+            continue
+        value = current[key]
+        if isinstance(base_value, dict) and isinstance(value, dict):
+            yield from _paired_metrics(value, base_value, path + (key,))
+        elif isinstance(base_value, (int, float)) and isinstance(value, (int, float)):
+            yield path + (key,), base_value, value
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    print(f"{'modelo':<22} {'medición':<14} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'items/s':>10}")
+    for model, metrics in results['models'].items():
+        rows = [('analyze', metrics['analyze']), ('predict', metrics['predict'])]
+        rows += [(f"lote {size}", stats) for size, stats in metrics['batch'].items()]
+        rows += [("POST /analyze", results['endpoint'][model])] if 'endpoint' in results else []
+        for name, stats in rows:
+            print(f"{model:<22} {name:<14} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} "
+                  f"{stats['p99_ms']:>9.3f} {stats['items_per_sec']:>10,.0f}")
+        print(f"{model:<22} arranque en frío {metrics['cold_start_ms']:.1f} ms, "
+              f"memoria {metrics['memory_mb']:.1f} MB")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de inferencia")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS, help="Modelos a medir")
+    parser.add_argument("--requests", type=int, default=500, help="Textos por medición de latencia")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES, help="Tamaños de lote")
+    parser.add_argument("--no-endpoint", dest="endpoint", action="store_false", help="No medir POST /analyze")
+    parser.add_argument("--output", help="Guardar los resultados en un JSON")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="JSON de referencia")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar estos resultados como baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Empeoramiento tolerado (0.2 = 20%%)")
+    parser.add_argument("--check", action="store_true", help="Fallar si no hay baseline contra el cual comparar")
+    args = parser.parse_args(argv)
+
+    baseline_path = Path(args.baseline)
+    if args.check and not args.save_baseline and not baseline_path.exists():
+        print(f"Error: no hay baseline en {baseline_path} (se crea con --save-baseline)", file=sys.stderr)
+        return 2
+
+    results = run(args.models, args.requests, args.batch_sizes, endpoint=args.endpoint)
+    print_summary(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nBaseline guardado en {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(
+            f"\nAVISO: no hay baseline en {baseline_path}, no se comparó contra nada (se crea con --save-baseline)",
+            file=sys.stderr,
+        )
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+    if regressions:
+        print(f"\nRegresiones respecto de {baseline_path} (tolerancia {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print(f"\nSin regresiones respecto de {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
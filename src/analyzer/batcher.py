@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.analyzer.worker_pool import InferencePool
+from src.settings import BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS
+
+
+class BatchMetrics:
+    """Tamaño y latencia de los lotes procesados por un MicroBatcher."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.total_latency_ms = 0.0
+        self.last_batch_size = 0
+        self.last_latency_ms = 0.0
+
+    def record(self, batch_size: int, latency_ms: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self.items += batch_size
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+            self.total_latency_ms += latency_ms
+            self.last_batch_size = batch_size
+            self.last_latency_ms = latency_ms
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'items': self.items,
+                'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+                'max_batch_size': self.max_batch_size,
+                'avg_latency_ms': self.total_latency_ms / self.batches if self.batches else 0.0,
+                'last_batch_size': self.last_batch_size,
+                'last_latency_ms': self.last_latency_ms,
+            }
+
+
+class MicroBatcher:
+    """
+    Agrupa los textos de requests concurrentes en un solo lote.
+
+    Junta hasta `max_batch_size` textos o espera como máximo `max_wait_ms`
+    desde el primero, los analiza con una sola llamada a `analyze_many` y
+    devuelve a cada request su resultado. Si recibe un `pool`, la inferencia
+    corre ahí y cada texto ocupa un lugar en su cola mientras espera.
+    """
+
+    def __init__(
+        self,
+        get_analyzer: Callable[[], SentimentAnalyzer],
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        pool: Optional[InferencePool] = None,
+    ):
+        self._get_analyzer = get_analyzer
+        self._pool = pool
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+        self.metrics = BatchMetrics()
+
+    async def analyze(self, text: str) -> Dict:
+        """
+        Encola el texto y espera su análisis.
+
+        Lanza ValueError si el texto es inválido y PoolSaturatedError si la
+        cola del pool está llena.
+        """
+        if self._pool is None:
+            return self._unwrap(await self._enqueue(text))
+
+        with self._pool.reserve():
+            return self._unwrap(await self._enqueue(text))
+
+    async def close(self) -> None:
+        """Detiene el worker y espera los lotes en curso."""
+        # Un worker de otro event loop (ya cerrado) no se puede esperar desde acá
+        if self._loop is not asyncio.get_running_loop():
+            self._worker = None
+            self._pending.clear()
+            return
+
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _enqueue(self, text: str) -> Dict:
+        self._ensure_worker()
+
+        future = self._loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    @staticmethod
+    def _unwrap(result: Dict) -> Dict:
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result
+
+    def _ensure_worker(self) -> None:
+        # El worker queda atado al event loop en el que se creó
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect_batches())
+
+    async def _collect_batches(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self._max_wait
+
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # El lote se procesa aparte para seguir juntando el siguiente
+            task = self._loop.create_task(self._process(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _process(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        started = time.perf_counter()
+
+        try:
+            if self._pool is None:
+                results = await self._loop.run_in_executor(None, self._analyze_many, texts)
+            else:
+                results = await self._pool.run(self._analyze_many, texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.metrics.record(len(batch), (time.perf_counter() - started) * 1000)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _analyze_many(self, texts: List[str]) -> List[Dict]:
+        return self._get_analyzer().analyze_many(texts)
@@ -0,0 +1,210 @@
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, TextIO
+
+import pandas as pd
+
+from src.analyzer.registry import create_default_registry
+from src.model.base import SENTIMENTS
+from src.settings import BULK_CHUNK_SIZE, BULK_OUTPUT_FORMATS
+
+
+def read_chunks(input_path: str, chunksize: int = BULK_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Lee un CSV, JSONL o Parquet de a `chunksize` filas sin cargarlo entero."""
+    suffix = Path(input_path).suffix.lower()
+
+    if suffix == ".parquet":
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif suffix in (".jsonl", ".ndjson"):
+        with pd.read_json(input_path, lines=True, chunksize=chunksize) as reader:
+            yield from reader
+    else:
+        with pd.read_csv(input_path, chunksize=chunksize) as reader:
+            yield from reader
+
+
+def score_chunk(analyzer, chunk: pd.DataFrame, text_column: str = "message", keep_text: bool = False) -> pd.DataFrame:
+    """Analiza un chunk con una sola llamada vectorizada y agrega las columnas de resultado."""
+    if text_column not in chunk.columns:
+        raise ValueError(f"El archivo no tiene la columna '{text_column}'")
+    texts = chunk[text_column].fillna("").astype(str).tolist()
+    results = analyzer.analyze_many(texts)
+
+    scored = chunk if keep_text else chunk.drop(columns=[text_column])
+    scored = scored.reset_index(drop=True)
+    scored["predicted_sentiment"] = [r.get("sentiment") for r in results]
+    scored["score"] = [r.get("score") for r in results]
+    for class_name in SENTIMENTS:
+        scored[f"confidence_{class_name}"] = [r.get("confidence", {}).get(class_name) for r in results]
+    scored["error"] = [r.get("error") for r in results]
+    return scored
+
+
+class ResultWriter:
+    """Escribe los chunks de resultados a medida que llegan."""
+
+    def __init__(self, output_path: str, output_format: str):
+        self._output_path = output_path
+        self._format = output_format
+        self._file: Optional[TextIO] = None
+        self._parquet_writer = None
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self._format == "parquet":
+            self._write_parquet(frame)
+            return
+
+        first = self._file is None
+        if first:
+            self._file = open(self._output_path, "w", encoding="utf-8", newline="")
+
+        if self._format == "jsonl":
+            if len(frame):
+                lines = frame.to_json(orient="records", lines=True, force_ascii=False)
+                self._file.write(lines.rstrip("\n") + "\n")
+        else:
+            frame.to_csv(self._file, header=first, index=False)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+    def _write_parquet(self, frame: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self._output_path, _parquet_schema(frame))
+        table = pa.Table.from_pandas(frame, schema=self._parquet_writer.schema, preserve_index=False)
+        self._parquet_writer.write_table(table)
+
+
+def _parquet_schema(frame: pd.DataFrame):
+    """
+    Schema del archivo Parquet: las columnas de resultado tienen tipo fijo y
+    las del archivo de entrada se infieren del primer chunk. Una columna que
+    en ese chunk viene vacía sería de tipo null y fallaría con los siguientes.
+    """
+    import pyarrow as pa
+
+    result_types = {
+        "predicted_sentiment": pa.string(),
+        "score": pa.float64(),
+        **{f"confidence_{class_name}": pa.float64() for class_name in SENTIMENTS},
+        "error": pa.string(),
+    }
+    inferred = pa.Schema.from_pandas(frame, preserve_index=False)
+    return pa.schema([
+        pa.field(field.name, result_types.get(field.name, pa.string() if pa.types.is_null(field.type) else field.type))
+        for field in inferred
+    ])
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    model: str = "logistic_regression",
+    chunksize: int = BULK_CHUNK_SIZE,
+    workers: int = 1,
+    text_column: str = "message",
+    output_format: Optional[str] = None,
+    keep_text: bool = False,
+    analyzer_factory: Optional[Callable] = None,
+    progress: Optional[TextIO] = sys.stderr,
+) -> Dict[str, float]:
+    """
+    Analiza un archivo grande por chunks y escribe los resultados de forma incremental.
+
+    La memoria queda acotada por `chunksize` (y por `2 * workers` chunks en vuelo
+    cuando se reparte entre procesos), sin importar el tamaño del archivo.
+
+    Args:
+        analyzer_factory: Función sin argumentos que crea el analyzer. Por
+            defecto se usa el registry con `model`. Con `workers > 1` se llama
+            una vez en cada proceso, así que debe poder serializarse.
+
+    Retorna la cantidad de filas, segundos y filas por segundo.
+    """
+    output_format = output_format or Path(output_path).suffix.lstrip(".").lower() or "csv"
+    if output_format not in BULK_OUTPUT_FORMATS:
+        raise ValueError(f"Formato de salida no soportado: {output_format}")
+    if output_format == "parquet":
+        _require_pyarrow()
+
+    analyzer_factory = analyzer_factory or partial(_registry_analyzer, model)
+    score = partial(_score_with_worker_analyzer, text_column=text_column, keep_text=keep_text)
+    writer = ResultWriter(output_path, output_format)
+    rows = 0
+    started = time.perf_counter()
+
+    def report(frame: pd.DataFrame) -> None:
+        nonlocal rows
+        writer.write(frame)
+        rows += len(frame)
+        if progress is not None:
+            elapsed = time.perf_counter() - started
+            progress.write(f"\r  {rows:,} filas | {rows / elapsed:,.0f} filas/s")
+            progress.flush()
+
+    # El modelo se prepara (y se entrena si falta) una sola vez antes de repartir
+    _init_worker(analyzer_factory)
+
+    try:
+        if workers <= 1:
+            for chunk in read_chunks(input_path, chunksize):
+                report(score(chunk))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(analyzer_factory,)) as executor:
+                # Como mucho 2 chunks en vuelo por proceso; se escriben en el orden de entrada
+                in_flight = deque()
+                for chunk in read_chunks(input_path, chunksize):
+                    in_flight.append(executor.submit(score, chunk))
+                    if len(in_flight) >= workers * 2:
+                        report(in_flight.popleft().result())
+                while in_flight:
+                    report(in_flight.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    if progress is not None:
+        progress.write("\n")
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed else 0.0,
+    }
+
+
+# Analyzer del proceso actual (uno por worker cuando se reparte entre procesos)
+_worker_analyzer = None
+
+
+def _init_worker(analyzer_factory: Callable) -> None:
+    global _worker_analyzer
+    _worker_analyzer = analyzer_factory()
+
+
+def _score_with_worker_analyzer(chunk: pd.DataFrame, text_column: str, keep_text: bool) -> pd.DataFrame:
+    return score_chunk(_worker_analyzer, chunk, text_column, keep_text)
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Leer o escribir Parquet requiere pyarrow: pip install pyarrow") from None
+
+
+def _registry_analyzer(model: str):
+    return create_default_registry().get(model)
@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from src.analyzer.chunking import analyze_long
+from src.analyzer.result_store import ResultStore
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.settings import LONG_TEXT_TOP_SPANS, RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza el texto para usarlo como clave de cache.
+
+    Solo colapsa espacios y pasa a minúsculas, que el TfidfVectorizer ya
+    ignora: dos textos con la misma clave siempre tienen el mismo resultado.
+    """
+    return " ".join(text.lower().split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache LRU con TTL para resultados de análisis.
+
+    Las claves son (modelo, versión, hash del texto), así que el texto no se
+    guarda y la memoria queda acotada por `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self._ttl and time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, model_id: str) -> int:
+        """Elimina todas las entradas de un modelo. Retorna cuántas se borraron."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == model_id]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self._max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class CachedSentimentAnalyzer:
+    """
+    Envuelve un SentimentAnalyzer y reutiliza los resultados de textos ya
+    analizados con la misma versión del modelo.
+
+    Con un `store`, lo que no está en memoria se busca ahí (una consulta por
+    lote) y los resultados nuevos se guardan también ahí. Si el store falla
+    se sigue sin él: es un cache, no puede tirar el análisis.
+    """
+
+    def __init__(
+        self,
+        analyzer: SentimentAnalyzer,
+        cache: ResultCache,
+        model_id: str,
+        model_version: Hashable,
+        store: Optional[ResultStore] = None,
+    ):
+        self._analyzer = analyzer
+        self._cache = cache
+        self._model_id = model_id
+        self._model_version = model_version
+        self._store = store
+
+    def analyze(self, text: str) -> Dict:
+        result = self.analyze_many([text])[0]
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result
+
+    def predict(self, text: str) -> str:
+        return self.analyze(text)['sentiment']
+
+    def analyze_long(self, text: str, top_k: int = LONG_TEXT_TOP_SPANS) -> Dict:
+        # Los chunks pasan por el cache: los mensajes citados en un hilo se analizan una vez
+        return analyze_long(self, text, top_k)
+
+    def analyze_many(self, texts: List[str]) -> List[Dict]:
+        results: List[Optional[Dict]] = [None] * len(texts)
+        missing: Dict[Hashable, List[int]] = {}
+
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text.strip():
+                # Los textos inválidos los reporta el analyzer
+                missing.setdefault(("invalid", index), []).append(index)
+                continue
+
+            key = self._key(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                results[index] = self._copy(cached)
+            else:
+                # Textos repetidos dentro del lote se analizan una sola vez
+                missing.setdefault(key, []).append(index)
+
+        if missing and self._store is not None:
+            for key, result in self._read_store(list(missing)).items():
+                self._cache.put(key, result)
+                for index in missing.pop(key):
+                    results[index] = self._copy(result)
+
+        if missing:
+            keys = list(missing)
+            analyzed = self._analyzer.analyze_many([texts[missing[key][0]] for key in keys])
+            fresh: Dict[str, Dict] = {}
+            for key, result in zip(keys, analyzed):
+                if 'error' not in result:
+                    self._cache.put(key, result)
+                    fresh[key[2]] = result
+                for index in missing[key]:
+                    results[index] = self._copy(result)
+            if fresh and self._store is not None:
+                self._write_store(fresh)
+
+        return results
+
+    def _read_store(self, keys: List[Hashable]) -> Dict[Hashable, Dict]:
+        hashes = [key[2] for key in keys if key[0] != "invalid"]
+        try:
+            stored = self._store.get_many(self._model_id, self._model_version, hashes)
+        except sqlite3.Error:
+            logger.warning("No se pudo leer el cache persistente %s", self._store.path, exc_info=True)
+            return {}
+        return {self._key_for_hash(text_hash): result for text_hash, result in stored.items()}
+
+    def _write_store(self, results: Dict[str, Dict]) -> None:
+        try:
+            self._store.put_many(self._model_id, self._model_version, results)
+        except sqlite3.Error:
+            logger.warning("No se pudo escribir el cache persistente %s", self._store.path, exc_info=True)
+
+    def _key(self, text: str) -> Tuple[str, Hashable, str]:
+        return self._key_for_hash(text_hash(text))
+
+    def _key_for_hash(self, hashed: str) -> Tuple[str, Hashable, str]:
+        return (self._model_id, self._model_version, hashed)
+
+    @staticmethod
+    def _copy(result: Dict) -> Dict:
+        if 'confidence' not in result:
+            return dict(result)
+        return {**result, 'confidence': dict(result['confidence'])}
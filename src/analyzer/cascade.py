@@ -0,0 +1,100 @@
+import threading
+from typing import Callable, Dict, List
+
+from src.analyzer.chunking import analyze_long
+from src.metrics import CASCADE_TEXTS_TOTAL
+from src.settings import CASCADE_SECONDARY_WEIGHT, CASCADE_THRESHOLD, LONG_TEXT_TOP_SPANS
+
+
+class CascadeAnalyzer:
+    """
+    Analiza primero con un modelo barato y escala al caro solo los textos
+    dudosos.
+
+    Cada texto pasa por `primary`; si la probabilidad de su clase más
+    probable queda por debajo de `threshold`, pasa también por `secondary`
+    y las probabilidades se combinan (`secondary_weight` es el peso del
+    segundo modelo; con 1.0 se usa solo ése). Cada resultado trae `stage`:
+    'primary' o 'secondary', según quién respondió.
+
+    Recibe funciones que retornan los analyzers (como el MicroBatcher), así
+    siempre usa el modelo vigente cuando el registry lo recarga.
+    """
+
+    def __init__(
+        self,
+        primary: Callable[[], object],
+        secondary: Callable[[], object],
+        threshold: float = CASCADE_THRESHOLD,
+        secondary_weight: float = CASCADE_SECONDARY_WEIGHT,
+    ):
+        self._primary = primary
+        self._secondary = secondary
+        self.threshold = threshold
+        self.secondary_weight = secondary_weight
+        self._lock = threading.Lock()
+        self.texts = 0
+        self.escalated = 0
+
+    def analyze(self, text: str) -> Dict:
+        result = self.analyze_many([text])[0]
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result
+
+    def predict(self, text: str) -> str:
+        return self.analyze(text)['sentiment']
+
+    def analyze_long(self, text: str, top_k: int = LONG_TEXT_TOP_SPANS) -> Dict:
+        # Cada chunk se escala por separado: solo los fragmentos dudosos pasan por el segundo modelo
+        return analyze_long(self, text, top_k)
+
+    def analyze_many(self, texts: List[str]) -> List[Dict]:
+        """
+        Una pasada del primer modelo por todo el lote y una del segundo por
+        los textos dudosos. Los textos inválidos traen {'error': mensaje}.
+        """
+        results = self._primary().analyze_many(texts)
+
+        uncertain = [
+            index for index, result in enumerate(results)
+            if 'error' not in result and result['score'] < self.threshold
+        ]
+        for index, result in enumerate(results):
+            if 'error' not in result:
+                result['stage'] = 'primary'
+
+        if uncertain:
+            escalated = self._secondary().analyze_many([texts[index] for index in uncertain])
+            for index, secondary in zip(uncertain, escalated):
+                results[index] = self._merge(results[index], secondary)
+
+        valid = sum('error' not in result for result in results)
+        self._record(valid, len(uncertain))
+        return results
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'threshold': self.threshold,
+                'texts': self.texts,
+                'escalated': self.escalated,
+                'escalation_rate': self.escalated / self.texts if self.texts else 0.0,
+            }
+
+    def _merge(self, primary: Dict, secondary: Dict) -> Dict:
+        weight = self.secondary_weight
+        confidence = {
+            sentiment: (1 - weight) * probability + weight * secondary['confidence'].get(sentiment, 0.0)
+            for sentiment, probability in primary['confidence'].items()
+        }
+        sentiment = max(confidence, key=confidence.get)
+        return {'sentiment': sentiment, 'score': confidence[sentiment], 'confidence': confidence, 'stage': 'secondary'}
+
+    def _record(self, texts: int, escalated: int) -> None:
+        with self._lock:
+            self.texts += texts
+            self.escalated += escalated
+        CASCADE_TEXTS_TOTAL.inc(texts - escalated, stage='primary')
+        if escalated:
+            CASCADE_TEXTS_TOTAL.inc(escalated, stage='secondary')
@@ -0,0 +1,114 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+from src.settings import LONG_TEXT_CHUNK_CHARS, LONG_TEXT_MAX_CHARS, LONG_TEXT_TOP_SPANS
+
+# Fin de oración: puntuación seguida de espacio (o fin del texto), o un salto de línea
+_SENTENCE_END = re.compile(r"[.!?…]+(?=\s|$)|\n")
+_WORD = re.compile(r"\S+")
+
+
+@dataclass
+class Span:
+    """Fragmento del texto original: posiciones [start, end) en caracteres."""
+    start: int
+    end: int
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+
+def sentence_spans(text: str) -> List[Span]:
+    """Oraciones del texto, sin los espacios de los bordes."""
+    spans = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        _append_trimmed(text, start, match.end(), spans)
+        start = match.end()
+    _append_trimmed(text, start, len(text), spans)
+    return spans
+
+
+def chunk_spans(text: str, max_chars: int = LONG_TEXT_CHUNK_CHARS) -> List[Span]:
+    """
+    Agrupa oraciones consecutivas en chunks de hasta `max_chars` caracteres.
+
+    Una oración más larga que `max_chars` se parte en ventanas de palabras.
+    Como cada chunk se llena con todas las oraciones que entran, dos chunks
+    seguidos suman más de `max_chars`: un texto de n caracteres da a lo sumo
+    2n / max_chars + 1 chunks, y la latencia queda acotada por el largo.
+    """
+    chunks: List[Span] = []
+    for sentence in sentence_spans(text):
+        pieces = [sentence] if len(sentence) <= max_chars else _word_windows(text, sentence, max_chars)
+        for piece in pieces:
+            if chunks and piece.end - chunks[-1].start <= max_chars:
+                chunks[-1].end = piece.end
+            else:
+                chunks.append(Span(piece.start, piece.end))
+    return chunks
+
+
+def analyze_long(analyzer, text: str, top_k: int = LONG_TEXT_TOP_SPANS) -> Dict:
+    """
+    Analiza un texto largo por partes.
+
+    Parte el texto en chunks (ver `chunk_spans`), los analiza con una sola
+    llamada a `analyzer.analyze_many` y combina las probabilidades de cada
+    clase pesándolas por el largo de cada chunk. Retorna el sentimiento
+    combinado y hasta `top_k` chunks negativos, del más negativo al menos.
+    """
+    if not text or not text.strip():
+        raise ValueError("El texto no puede estar vacío")
+    if len(text) > LONG_TEXT_MAX_CHARS:
+        raise ValueError(f"El texto supera el máximo de {LONG_TEXT_MAX_CHARS} caracteres")
+
+    spans = chunk_spans(text)
+    results = analyzer.analyze_many([text[span.start:span.end] for span in spans])
+
+    total = sum(len(span) for span in spans)
+    confidence: Dict[str, float] = {}
+    for span, result in zip(spans, results):
+        for sentiment, probability in result['confidence'].items():
+            confidence[sentiment] = confidence.get(sentiment, 0.0) + probability * len(span) / total
+    sentiment = max(confidence, key=confidence.get)
+
+    negatives = sorted(
+        (
+            (result['confidence']['negativo'], span)
+            for span, result in zip(spans, results)
+            if result['sentiment'] == 'negativo'
+        ),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    return {
+        'sentiment': sentiment,
+        'score': confidence[sentiment],
+        'confidence': confidence,
+        'chunks': len(spans),
+        'negative_spans': [
+            {'start': span.start, 'end': span.end, 'text': text[span.start:span.end], 'score': score}
+            for score, span in negatives[:top_k]
+        ],
+    }
+
+
+def _append_trimmed(text: str, start: int, end: int, spans: List[Span]) -> None:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append(Span(start, end))
+
+
+def _word_windows(text: str, sentence: Span, max_chars: int) -> List[Span]:
+    windows: List[Span] = []
+    for match in _WORD.finditer(text, sentence.start, sentence.end):
+        if windows and match.end() - windows[-1].start <= max_chars:
+            windows[-1].end = match.end()
+        else:
+            windows.append(Span(match.start(), match.end()))
+    return windows
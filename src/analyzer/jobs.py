@@ -0,0 +1,363 @@
+import csv
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.analyzer.result_store import write_transaction
+from src.settings import (
+    JOBS_CHUNK_SIZE,
+    JOBS_DB_PATH,
+    JOBS_LEASE_SECONDS,
+    JOBS_POLL_INTERVAL,
+    JOBS_RETENTION_SECONDS,
+    JOBS_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Formatos aceptados como archivo (el cuerpo de la request), por Content-Type
+UPLOAD_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "text/plain": "lines",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    busy_seconds REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    lease_until REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, position)
+) WITHOUT ROWID;
+"""
+
+
+class _LeaseLost(Exception):
+    """El job pasó a otro proceso mientras éste analizaba un chunk."""
+
+
+def read_texts(body: bytes, content_type: str, column: str = "message") -> List[str]:
+    """
+    Textos de un archivo subido como cuerpo de la request: un CSV con la
+    columna `column`, JSONL (objetos con `column` o strings) o texto plano
+    con un comentario por línea. Lanza ValueError si no se puede leer.
+    """
+    upload_format = UPLOAD_FORMATS.get(content_type)
+    if upload_format is None:
+        raise ValueError(f"Formato no soportado: {content_type}")
+    try:
+        content = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("El archivo debe estar en UTF-8") from None
+
+    if upload_format == "lines":
+        return [line for line in content.splitlines() if line.strip()]
+
+    if upload_format == "csv":
+        reader = csv.DictReader(io.StringIO(content, newline=""))
+        if column not in (reader.fieldnames or []):
+            raise ValueError(f"El CSV no tiene la columna '{column}'")
+        return [row[column] or "" for row in reader]
+
+    texts = []
+    for line_number, line in enumerate(content.splitlines()):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(f"Línea {line_number}: JSON inválido") from None
+        if isinstance(item, dict):
+            item = item.get(column, "")
+        if not isinstance(item, str):
+            raise ValueError(f"Línea {line_number}: se esperaba un texto en '{column}'")
+        texts.append(item)
+    return texts
+
+
+class JobManager:
+    """
+    Jobs de análisis en segundo plano, guardados en un archivo SQLite.
+
+    `submit` guarda los textos y retorna enseguida; los threads del manager
+    los analizan de a `chunk_size` con `analyze_many(model, texts)` y, en la
+    misma transacción, guardan los resultados del chunk y el avance. Así un
+    reinicio retoma cada job desde el último chunk guardado.
+
+    Varios procesos pueden compartir el archivo (los workers de uvicorn): un
+    job lo toma un solo proceso por vez y, si ese proceso muere, otro lo
+    retoma cuando vence su lease (`lease_seconds` sin avanzar).
+    """
+
+    def __init__(
+        self,
+        analyze_many: Callable[[str, List[str]], List[Dict]],
+        path: Path = JOBS_DB_PATH,
+        workers: int = JOBS_WORKERS,
+        chunk_size: int = JOBS_CHUNK_SIZE,
+        poll_interval: float = JOBS_POLL_INTERVAL,
+        lease_seconds: float = JOBS_LEASE_SECONDS,
+        retention_seconds: float = JOBS_RETENTION_SECONDS,
+    ):
+        self.path = Path(path)
+        self._analyze_many = analyze_many
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._retention_seconds = retention_seconds
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # Una conexión por proceso: las transacciones son cortas y se serializan con el lock
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """Lanza los threads (si no corren ya), que retoman los jobs que quedaron sin terminar."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            self._purge()
+            self._threads = [
+                threading.Thread(target=self._work, name=f"jobs-{index}", daemon=True)
+                for index in range(self._workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Detiene los threads al terminar su chunk; los jobs a medio hacer quedan en cola."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, texts: List[str], model: str) -> Dict:
+        """Guarda un job nuevo y retorna su estado. Lanza ValueError si no hay textos."""
+        if not texts:
+            raise ValueError("El job no tiene textos")
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            connection = self._db()
+            with write_transaction(connection):
+                connection.execute(
+                    "INSERT INTO jobs (id, model, status, total, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                    (job_id, model, len(texts), time.time()),
+                )
+                connection.executemany(
+                    "INSERT INTO job_items (job_id, position, text) VALUES (?, ?, ?)",
+                    ((job_id, position, text) for position, text in enumerate(texts)),
+                )
+
+        self.start()
+        self._wakeup.set()
+        return self.status(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Estado, avance y throughput del job, o None si no existe."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT id, model, status, total, processed, errors, busy_seconds, "
+                "created_at, started_at, finished_at, error FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        (job_id, model, status, total, processed, errors, busy_seconds,
+         created_at, started_at, finished_at, error) = row
+        texts_per_second = processed / busy_seconds if busy_seconds else None
+        remaining = total - processed
+        return {
+            'id': job_id,
+            'model': model,
+            'status': status,
+            'total': total,
+            'processed': processed,
+            'errors': errors,
+            'progress': processed / total,
+            'texts_per_second': texts_per_second,
+            'eta_seconds': remaining / texts_per_second if texts_per_second and remaining else None,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at,
+            'error': error,
+        }
+
+    def results(self, job_id: str, offset: int = 0, limit: int = JOBS_CHUNK_SIZE) -> List[Dict]:
+        """Resultados ya analizados desde la posición `offset`, en orden: {'index': posición, **resultado}."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT position, result FROM job_items WHERE job_id = ? AND position >= ? "
+                "AND result IS NOT NULL ORDER BY position LIMIT ?",
+                (job_id, offset, limit),
+            ).fetchall()
+        return [{'index': position, **json.loads(result)} for position, result in rows]
+
+    def pending(self) -> int:
+        """Jobs en cola o en curso, de todos los procesos."""
+        with self._lock:
+            return self._db().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job_id = self._claim()
+                if job_id is not None:
+                    self._run(job_id)
+                    continue
+            except Exception:
+                logger.exception("Error procesando jobs en %s", self.path)
+            self._wakeup.wait(self._poll_interval)
+            self._wakeup.clear()
+
+    def _claim(self) -> Optional[str]:
+        """Toma el job en cola más viejo (o uno cuyo proceso dejó vencer el lease)."""
+        query = (
+            "SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+            "ORDER BY created_at LIMIT 1"
+        )
+        now = time.time()
+        with self._lock:
+            connection = self._db()
+            # Primero se mira sin transacción: sin jobs pendientes no se toma el lock de escritura
+            if connection.execute(query, (now,)).fetchone() is None:
+                return None
+            with write_transaction(connection):
+                row = connection.execute(query, (now,)).fetchone()
+                if row is None:
+                    return None
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?, "
+                    "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (self._owner, now + self._lease_seconds, now, row[0]),
+                )
+        return row[0]
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            model, processed, total = self._db().execute(
+                "SELECT model, processed, total FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+
+        while processed < total:
+            if self._stopping.is_set():
+                # Vuelve a la cola sin esperar que venza el lease: al reiniciar se retoma enseguida
+                self._finish(job_id, "queued")
+                return
+
+            with self._lock:
+                rows = self._db().execute(
+                    "SELECT position, text FROM job_items WHERE job_id = ? AND position >= ? ORDER BY position LIMIT ?",
+                    (job_id, processed, self._chunk_size),
+                ).fetchall()
+
+            started = time.perf_counter()
+            try:
+                results = self._analyze_many(model, [text for _, text in rows])
+            except Exception as e:
+                logger.exception("Falló el job %s", job_id)
+                self._finish(job_id, "failed", error=str(e))
+                return
+
+            if not self._save_chunk(job_id, rows, results, started):
+                # Otro proceso tomó el job (este tardó más que el lease): se deja de procesarlo
+                logger.warning("El job %s pasó a otro proceso", job_id)
+                return
+            processed += len(rows)
+
+        self._finish(job_id, "done")
+        self._purge()
+
+    def _save_chunk(self, job_id: str, rows: List, results: List[Dict], started: float) -> bool:
+        """Guarda los resultados del chunk y el avance; False si el job ya no es de este proceso."""
+        errors = sum('error' in result for result in results)
+        try:
+            with self._lock:
+                connection = self._db()
+                with write_transaction(connection):
+                    connection.executemany(
+                        "UPDATE job_items SET result = ? WHERE job_id = ? AND position = ?",
+                        (
+                            (json.dumps(result, ensure_ascii=False), job_id, position)
+                            for (position, _), result in zip(rows, results)
+                        ),
+                    )
+                    # El throughput incluye guardar los resultados, no solo analizarlos
+                    updated = connection.execute(
+                        "UPDATE jobs SET processed = processed + ?, errors = errors + ?, "
+                        "busy_seconds = busy_seconds + ?, lease_until = ? WHERE id = ? AND owner = ?",
+                        (len(rows), errors, time.perf_counter() - started, time.time() + self._lease_seconds,
+                         job_id, self._owner),
+                    ).rowcount
+                    if not updated:
+                        # Se revierten también los resultados: los escribe el proceso que tiene el job
+                        raise _LeaseLost
+        except _LeaseLost:
+            return False
+        return True
+
+    def _finish(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        finished_at = time.time() if status in ("done", "failed") else None
+        with self._lock:
+            connection = self._db()
+            with write_transaction(connection):
+                connection.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ?, owner = NULL, lease_until = NULL "
+                    "WHERE id = ? AND owner = ?",
+                    (status, finished_at, error, job_id, self._owner),
+                )
+
+    def _purge(self) -> None:
+        """Borra los jobs terminados hace más de `retention_seconds`."""
+        cutoff = time.time() - self._retention_seconds
+        with self._lock:
+            connection = self._db()
+            with write_transaction(connection):
+                connection.execute(
+                    "DELETE FROM job_items WHERE job_id IN (SELECT id FROM jobs WHERE finished_at < ?)", (cutoff,)
+                )
+                connection.execute("DELETE FROM jobs WHERE finished_at < ?", (cutoff,))
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
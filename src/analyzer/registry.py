@@ -0,0 +1,249 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.analyzer.cache import CachedSentimentAnalyzer, ResultCache
+from src.analyzer.result_store import ResultStore
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.metrics import MODEL_LOAD_SECONDS
+from src.model.file_lock import FileLock
+from src.model.incremental_model import IncrementalModel
+from src.model.logistic_regression_model import LogisticRegressionModel
+from src.model.random_forest_model import RandomForestModel
+from src.settings import (
+    LOGISTIC_REGRESSION_MODEL_PATH,
+    RANDOM_FOREST_MODEL_PATH,
+    INCREMENTAL_MODEL_PATH,
+    INCREMENTAL_SERVING,
+    DATA_PATH,
+    LOGISTIC_REGRESSION_COMPILED,
+    MODEL_RELOAD_CHECK_INTERVAL,
+    RANDOM_FOREST_FLAT,
+    MODEL_ARTIFACTS,
+    MODEL_MMAP_MODE,
+    RESULT_CACHE_SIZE,
+    RESULT_STORE_PATH,
+    WARMUP_TEXTS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _RegistryEntry:
+    name: str
+    model_class: type
+    model_path: Path
+    data_path: str
+    load_options: Dict[str, Any] = field(default_factory=dict)
+    analyzer: Optional[SentimentAnalyzer | CachedSentimentAnalyzer] = None
+    version: Optional[int] = None
+    checked_at: float = 0.0
+    state: str = "pending"
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class AnalyzerRegistry:
+    """
+    Mantiene un SentimentAnalyzer por modelo, compartido por todo el proceso.
+
+    Cada modelo se carga una sola vez (en el primer uso o con `preload`) y se
+    recarga en segundo plano cuando el .pkl cambia en disco. Mientras tanto las
+    requests en curso siguen usando la instancia anterior.
+
+    Si recibe un `cache`, los analyzers que entrega reutilizan resultados y
+    las entradas de un modelo se invalidan cada vez que se recarga. Un
+    `store` agrega el cache persistente debajo del de memoria (solo se usa
+    junto con `cache`); al cargar un modelo se borran ahí los resultados de
+    sus otras versiones. Si recibe `warmup_texts`, cada modelo los analiza
+    antes de empezar a atender.
+    """
+
+    def __init__(
+        self,
+        reload_check_interval: float = MODEL_RELOAD_CHECK_INTERVAL,
+        cache: Optional[ResultCache] = None,
+        warmup_texts: Optional[List[str]] = None,
+        store: Optional[ResultStore] = None,
+    ):
+        self._entries: Dict[str, _RegistryEntry] = {}
+        self._reload_check_interval = reload_check_interval
+        self._warmup_texts = warmup_texts or []
+        self.cache = cache
+        self.store = store
+
+    def register(self, name: str, model_class: type, model_path: Path, data_path: str, **load_options: Any) -> None:
+        """
+        Registra un modelo. `model_class` debe exponer `train` y `load`; las
+        `load_options` se pasan tal cual a `load`.
+        """
+        self._entries[name] = _RegistryEntry(name, model_class, Path(model_path), data_path, load_options)
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, name: str) -> SentimentAnalyzer | CachedSentimentAnalyzer:
+        """Retorna el analyzer del modelo, cargándolo si todavía no existe."""
+        entry = self._get_entry(name)
+
+        if entry.analyzer is None:
+            with entry.lock:
+                if entry.analyzer is None:
+                    self._load(entry)
+            return entry.analyzer
+
+        # Se toma antes de lanzar la recarga: esta request sigue con el modelo actual
+        analyzer = entry.analyzer
+        if self._is_stale(entry):
+            self._schedule_reload(entry)
+
+        return analyzer
+
+    def version(self, name: str) -> Optional[int]:
+        """Versión del modelo cargado (mtime del .pkl en ns) o None si no se cargó."""
+        return self._get_entry(name).version
+
+    def preload(self, stop: Optional[threading.Event] = None) -> None:
+        """
+        Carga todos los modelos registrados. Un modelo que falla no impide
+        cargar el resto: su error queda en `status`. Si `stop` se activa, no
+        se empieza a cargar ningún modelo más (el que está en curso termina).
+        """
+        for name in self._entries:
+            if stop is not None and stop.is_set():
+                logger.info("Precarga interrumpida antes de cargar %s", name)
+                return
+            try:
+                self.get(name)
+            except Exception:
+                logger.exception("No se pudo cargar el modelo %s", name)
+
+    def is_ready(self) -> bool:
+        return all(entry.state == "ready" for entry in self._entries.values())
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de carga de cada modelo: pending, loading, ready o failed."""
+        return {
+            name: {
+                'state': entry.state,
+                'load_seconds': entry.load_seconds,
+                'version': entry.version,
+                'error': entry.error,
+            }
+            for name, entry in self._entries.items()
+        }
+
+    def reload(self, name: str) -> SentimentAnalyzer | CachedSentimentAnalyzer:
+        """Recarga el modelo desde disco de forma sincrónica."""
+        entry = self._get_entry(name)
+        with entry.lock:
+            self._load(entry)
+        return entry.analyzer
+
+    def _get_entry(self, name: str) -> _RegistryEntry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise ValueError(f"Modelo desconocido: {name}") from None
+
+    def _is_stale(self, entry: _RegistryEntry) -> bool:
+        now = time.monotonic()
+        if now - entry.checked_at < self._reload_check_interval:
+            return False
+
+        entry.checked_at = now
+        try:
+            return entry.model_path.stat().st_mtime_ns != entry.version
+        except FileNotFoundError:
+            return False
+
+    def _schedule_reload(self, entry: _RegistryEntry) -> None:
+        # Si ya hay una recarga en curso no se lanza otra
+        if not entry.lock.acquire(blocking=False):
+            return
+
+        def reload_and_release():
+            try:
+                self._load(entry)
+            except Exception:
+                logger.exception("No se pudo recargar el modelo %s", entry.model_path)
+            finally:
+                entry.lock.release()
+
+        threading.Thread(target=reload_and_release, daemon=True).start()
+
+    def _load(self, entry: _RegistryEntry) -> None:
+        started = time.perf_counter()
+        # Una recarga no cambia el estado: se sigue atendiendo con el modelo anterior
+        if entry.analyzer is None:
+            entry.state = "loading"
+
+        try:
+            if not entry.model_path.exists():
+                self._train(entry)
+
+            version = entry.model_path.stat().st_mtime_ns
+            model = entry.model_class.load(entry.model_path, **entry.load_options)
+
+            analyzer = SentimentAnalyzer(model)
+            if self._warmup_texts:
+                analyzer.analyze_many(self._warmup_texts)
+        except Exception as e:
+            if entry.analyzer is None:
+                entry.state = "failed"
+                entry.error = str(e)
+            raise
+
+        if self.cache is not None:
+            self.cache.invalidate(entry.name)
+            if self.store is not None:
+                self.store.discard_stale(entry.name, version)
+            analyzer = CachedSentimentAnalyzer(analyzer, self.cache, entry.name, version, store=self.store)
+
+        # La versión se publica antes que el analyzer: quien vea el modelo nuevo ve también su versión
+        entry.version = version
+        entry.analyzer = analyzer
+        entry.checked_at = time.monotonic()
+        entry.state = "ready"
+        entry.error = None
+        entry.load_seconds = time.perf_counter() - started
+        MODEL_LOAD_SECONDS.observe(entry.load_seconds, model=entry.name)
+
+    def _train(self, entry: _RegistryEntry) -> None:
+        # Varios procesos pueden arrancar a la vez sin modelo: entrena solo el primero
+        with FileLock(entry.model_path.with_name(entry.model_path.name + ".lock")):
+            if not entry.model_path.exists():
+                entry.model_class.train(entry.data_path, str(entry.model_path))
+
+
+def create_default_registry(use_cache: bool = True) -> AnalyzerRegistry:
+    """
+    Registry con los modelos de Regresión Logística y Random Forest, más el
+    incremental si INCREMENTAL_SERVING está activado.
+    
+    Con use_cache=False no se usa el cache de resultados (por ejemplo, para
+    medir la latencia real de los modelos). El cache persistente se agrega
+    si RESULT_STORE_PATH está configurado.
+    """
+    cache = ResultCache() if use_cache and RESULT_CACHE_SIZE > 0 else None
+    store = ResultStore(RESULT_STORE_PATH) if cache is not None and RESULT_STORE_PATH else None
+    registry = AnalyzerRegistry(cache=cache, warmup_texts=WARMUP_TEXTS, store=store)
+    registry.register(
+        "logistic_regression", LogisticRegressionModel, LOGISTIC_REGRESSION_MODEL_PATH, DATA_PATH,
+        mmap_mode=MODEL_MMAP_MODE, compiled=LOGISTIC_REGRESSION_COMPILED, artifact=MODEL_ARTIFACTS
+    )
+    registry.register(
+        "random_forest", RandomForestModel, RANDOM_FOREST_MODEL_PATH, DATA_PATH,
+        mmap_mode=MODEL_MMAP_MODE, flat=RANDOM_FOREST_FLAT, artifact=MODEL_ARTIFACTS
+    )
+    if INCREMENTAL_SERVING:
+        registry.register(
+            "incremental", IncrementalModel, INCREMENTAL_MODEL_PATH, DATA_PATH,
+            mmap_mode=MODEL_MMAP_MODE
+        )
+    return registry
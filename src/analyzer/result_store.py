@@ -0,0 +1,194 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List
+
+from src.settings import RESULT_STORE_MAX_ENTRIES, RESULT_STORE_TRIM_EVERY
+
+# Claves por consulta: las versiones viejas de SQLite aceptan hasta 999 parámetros
+_MAX_KEYS_PER_QUERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    model TEXT NOT NULL,
+    version TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (model, version, text_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at);
+"""
+
+
+class ResultStore:
+    """
+    Cache persistente de resultados en un archivo SQLite en modo WAL.
+
+    Es la segunda capa, debajo del ResultCache en memoria: sobrevive a los
+    reinicios y la comparten los workers del host (en WAL las lecturas no
+    esperan a quien escribe). Las claves son (modelo, versión, hash del
+    texto), igual que en el ResultCache, así que un modelo recargado nunca
+    lee resultados de la versión anterior.
+
+    Cuando pasa de `max_entries` borra las entradas escritas hace más tiempo
+    hasta quedar en el 90%. Leer no escribe nada, para que las lecturas no
+    compitan por el lock de escritura.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = RESULT_STORE_MAX_ENTRIES,
+        trim_every: int = RESULT_STORE_TRIM_EVERY,
+        timeout: float = 5.0,
+    ):
+        self.path = Path(path)
+        self._max_entries = max_entries
+        self._trim_every = trim_every
+        self._timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._written_since_trim = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        # Al arrancar sobre un archivo de una corrida anterior se respeta el max_entries actual
+        self._trim(connection)
+
+    def get_many(self, model_id: str, version: Hashable, hashes: List[str]) -> Dict[str, Dict]:
+        """Resultados guardados para `hashes`, por hash. Los que no están no aparecen."""
+        found: Dict[str, Dict] = {}
+        unique = list(dict.fromkeys(hashes))
+        connection = self._connection()
+        for start in range(0, len(unique), _MAX_KEYS_PER_QUERY):
+            chunk = unique[start:start + _MAX_KEYS_PER_QUERY]
+            rows = connection.execute(
+                "SELECT text_hash, result FROM results WHERE model = ? AND version = ? "
+                f"AND text_hash IN ({', '.join('?' * len(chunk))})",
+                [model_id, str(version), *chunk],
+            )
+            found.update((text_hash, json.loads(result)) for text_hash, result in rows)
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, model_id: str, version: Hashable, results: Dict[str, Dict]) -> None:
+        """Guarda los resultados por hash en una sola transacción."""
+        if not results:
+            return
+
+        now = time.time()
+        rows = [
+            (model_id, str(version), text_hash, json.dumps(result, ensure_ascii=False), now)
+            for text_hash, result in results.items()
+        ]
+        connection = self._connection()
+        with write_transaction(connection):
+            connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+
+        with self._lock:
+            self.writes += len(rows)
+            self._written_since_trim += len(rows)
+            # Contar las filas recorre la tabla: se hace cada `trim_every` escrituras
+            should_trim = self._written_since_trim >= self._trim_every
+            if should_trim:
+                self._written_since_trim = 0
+        if should_trim:
+            self._trim(connection)
+
+    def discard_stale(self, model_id: str, version: Hashable) -> int:
+        """Borra las entradas de otras versiones del modelo. Retorna cuántas se borraron."""
+        connection = self._connection()
+        with write_transaction(connection):
+            removed = connection.execute(
+                "DELETE FROM results WHERE model = ? AND version != ?", (model_id, str(version))
+            ).rowcount
+        return removed
+
+    def clear(self) -> None:
+        connection = self._connection()
+        with write_transaction(connection):
+            connection.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        size = len(self)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': str(self.path),
+                'size': size,
+                'max_entries': self._max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'writes': self.writes,
+                'evictions': self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Una conexión por thread y por proceso: las conexiones no se comparten después de un fork
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(
+            self.path, timeout=self._timeout, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # En WAL, NORMAL no arriesga la base ante un corte: a lo sumo se pierden las últimas escrituras
+        connection.execute("PRAGMA synchronous=NORMAL")
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def _trim(self, connection: sqlite3.Connection) -> None:
+        size = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if size <= self._max_entries:
+            return
+
+        excess = size - int(self._max_entries * 0.9)
+        with write_transaction(connection):
+            removed = connection.execute(
+                "DELETE FROM results WHERE (model, version, text_hash) IN "
+                "(SELECT model, version, text_hash FROM results ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            ).rowcount
+        with self._lock:
+            self.evictions += removed
+
+
+@contextmanager
+def write_transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # IMMEDIATE toma el lock de escritura al empezar: si otro proceso escribe, se espera ahí y no a mitad de camino
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
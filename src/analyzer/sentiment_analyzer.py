@@ -1,9 +1,12 @@
-from typing import Dict
+from typing import Dict, List
 
-from src.model.base import Model
+from src.analyzer.chunking import analyze_long
+from src.metrics import ANALYZE_SECONDS, BATCH_SIZE, INVALID_TEXTS_TOTAL, TEXTS_TOTAL
+from src.model.base import Model, SENTIMENTS
+from src.settings import LONG_TEXT_TOP_SPANS
 
 class SentimentAnalyzer:
-    SENTIMENTS = ['positivo', 'neutral', 'negativo']
+    SENTIMENTS = SENTIMENTS
     
     def __init__(self, model: Model):
         """
@@ -11,30 +14,70 @@ class SentimentAnalyzer:
             model: Cualquier implementación de Model (sklearn, transformers, etc.)
         """
         self._model = model
+        self._name = model.name
+        self._analyze_seconds = ANALYZE_SECONDS.labels(model=self._name)
+        self._batch_size = BATCH_SIZE.labels(model=self._name)
     
     def analyze(self, text: str) -> Dict:
         self._validate_text(text)
+        return self._analyze_valid([text])[0]
+    
+    def analyze_many(self, texts: List[str]) -> List[Dict]:
+        """
+        Analiza una lista de textos con una sola pasada por el modelo.
+        
+        Los textos inválidos no cortan el lote: su resultado es {'error': mensaje}.
+        """
+        results: List[Dict] = [None] * len(texts)
+        valid_indexes, valid_texts = [], []
+        
+        for index, text in enumerate(texts):
+            try:
+                self._validate_text(text)
+            except ValueError as e:
+                results[index] = {'error': str(e)}
+            else:
+                valid_indexes.append(index)
+                valid_texts.append(text)
         
-        sentiment = self._model.predict([text])[0]
-        probas = self._get_probabilities(text)
+        if valid_texts:
+            for index, result in zip(valid_indexes, self._analyze_valid(valid_texts)):
+                results[index] = result
         
-        return {
-            'sentiment': sentiment,
-            'score': probas[sentiment],
-            'confidence': probas
-        }
+        return results
+    
+    def analyze_long(self, text: str, top_k: int = LONG_TEXT_TOP_SPANS) -> Dict:
+        """
+        Analiza un texto largo (hilos de mails, transcripciones) por chunks, en
+        un solo lote: sentimiento combinado y los fragmentos más negativos.
+        """
+        self._validate_text(text)
+        return analyze_long(self, text, top_k)
     
     def predict(self, text: str) -> str:
         self._validate_text(text)
-        return self._model.predict([text])[0]
+        self._record_batch(1)
+        with self._analyze_seconds.time():
+            return self._model.predict([text])[0]
+    
+    def _analyze_valid(self, texts: List[str]) -> List[Dict]:
+        self._record_batch(len(texts))
+        with self._analyze_seconds.time():
+            sentiments, confidences = self._model.predict_with_proba(texts)
+        return [
+            {
+                'sentiment': sentiment,
+                'score': confidence[sentiment],
+                'confidence': confidence
+            }
+            for sentiment, confidence in zip(sentiments, confidences)
+        ]
     
-    def _get_probabilities(self, text: str) -> Dict[str, float]:
-        probas = self._model.predict_proba([text])[0]
-        return {
-            class_name: float(proba) 
-            for class_name, proba in zip(self.SENTIMENTS, probas)
-        }
+    def _record_batch(self, size: int) -> None:
+        self._batch_size.observe(size)
+        TEXTS_TOTAL.inc(size, model=self._name)
     
     def _validate_text(self, text: str) -> None:
         if not text or not text.strip():
-            raise ValueError("El texto no puede estar vacío")
\ No newline at end of file
+            INVALID_TEXTS_TOTAL.inc(model=self._name)
+            raise ValueError("El texto no puede estar vacío")
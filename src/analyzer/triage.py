@@ -0,0 +1,192 @@
+import base64
+import json
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from src.settings import TRIAGE_MAX_AGE_SECONDS, TRIAGE_MAX_ENTRIES
+
+# Probabilidades que difieren en menos de esto se consideran iguales y se ordenan por recencia
+PRIORITY_STEP = 0.01
+
+# (-prioridad redondeada, -recibido, -secuencia, id): el orden natural va del más crítico al menos
+_Key = Tuple[float, float, int, str]
+
+
+@dataclass
+class TriageEntry:
+    id: str
+    text: str
+    sentiment: str
+    priority: float
+    confidence: Dict[str, float]
+    model: Optional[str]
+    received_at: float
+    _key: _Key = field(repr=False, compare=False, default=None)
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'text': self.text,
+            'sentiment': self.sentiment,
+            'priority': self.priority,
+            'confidence': self.confidence,
+            'model': self.model,
+            'received_at': self.received_at,
+        }
+
+
+class TriageQueue:
+    """
+    Cola de casos críticos ordenada por probabilidad de negativo y recencia.
+
+    Mantiene una lista ordenada de claves (insertar es una búsqueda binaria
+    y un memmove), un dict por id y una cola por orden de llegada para
+    desalojar los casos viejos. Así el top-K y cada página son un slice de
+    la lista, sin recorrer ni reordenar los casos.
+
+    Con más de `max_entries` casos se descartan los menos críticos; los de
+    más de `max_age_seconds` se descartan al ingresar o consultar.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TRIAGE_MAX_ENTRIES,
+        max_age_seconds: Optional[float] = TRIAGE_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._max_entries = max_entries
+        self._max_age = max_age_seconds
+        self._clock = clock
+        self._order: List[_Key] = []
+        self._entries: Dict[str, TriageEntry] = {}
+        self._arrivals: Deque[Tuple[float, int, str]] = deque()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ingest(self, text: str, result: Dict, model: Optional[str] = None, case_id: Optional[str] = None) -> TriageEntry:
+        """
+        Agrega un caso a partir del resultado de `SentimentAnalyzer.analyze`.
+
+        La prioridad es `confidence['negativo']`. Si ya existe un caso con el
+        mismo `case_id` se reemplaza.
+        """
+        priority = float(result['confidence']['negativo'])
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            if case_id is not None and case_id in self._entries:
+                self._remove(self._entries[case_id])
+
+            self._sequence += 1
+            entry = TriageEntry(
+                id=case_id or uuid.uuid4().hex,
+                text=text,
+                sentiment=result['sentiment'],
+                priority=priority,
+                confidence=dict(result['confidence']),
+                model=model,
+                received_at=now,
+            )
+            entry._key = (-round(priority / PRIORITY_STEP) * PRIORITY_STEP, -now, -self._sequence, entry.id)
+            insort(self._order, entry._key)
+            self._entries[entry.id] = entry
+            if self._max_age:
+                self._arrivals.append((now, self._sequence, entry.id))
+
+            while len(self._order) > self._max_entries:
+                self._remove(self._entries[self._order[-1][3]])
+                self.evicted += 1
+            self._compact_arrivals()
+            return entry
+
+    def top(self, k: int) -> List[TriageEntry]:
+        """Los `k` casos más críticos."""
+        with self._lock:
+            self._expire(self._clock())
+            return [self._entries[key[3]] for key in self._order[:k]]
+
+    def page(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[TriageEntry], Optional[str]]:
+        """
+        Una página de casos, del más crítico al menos, y el cursor de la
+        siguiente (None si no hay más).
+
+        El cursor es la posición del último caso entregado, no un offset: los
+        casos que llegan mientras se pagina no desplazan las páginas.
+        """
+        start_key = _decode_cursor(cursor) if cursor else None
+        with self._lock:
+            self._expire(self._clock())
+            start = bisect_right(self._order, start_key) if start_key else 0
+            keys = self._order[start:start + limit]
+            entries = [self._entries[key[3]] for key in keys]
+            has_more = start + limit < len(self._order)
+        return entries, _encode_cursor(keys[-1]) if keys and has_more else None
+
+    def get(self, case_id: str) -> Optional[TriageEntry]:
+        with self._lock:
+            self._expire(self._clock())
+            return self._entries.get(case_id)
+
+    def remove(self, case_id: str) -> bool:
+        """Saca un caso de la cola (por ejemplo, porque ya se atendió)."""
+        with self._lock:
+            entry = self._entries.get(case_id)
+            if entry is None:
+                return False
+            self._remove(entry)
+            return True
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_entries': self._max_entries,
+                'max_age_seconds': self._max_age,
+                'evicted': self.evicted,
+                'expired': self.expired,
+            }
+
+    def _remove(self, entry: TriageEntry) -> None:
+        # La entrada en _arrivals queda y se ignora al salir (su id ya no apunta a esta secuencia)
+        del self._order[bisect_left(self._order, entry._key)]
+        del self._entries[entry.id]
+
+    def _expire(self, now: float) -> None:
+        if not self._max_age:
+            return
+        limit = now - self._max_age
+        while self._arrivals and self._arrivals[0][0] < limit:
+            _, sequence, case_id = self._arrivals.popleft()
+            entry = self._entries.get(case_id)
+            if entry is not None and -entry._key[2] == sequence:
+                self._remove(entry)
+                self.expired += 1
+
+    def _compact_arrivals(self) -> None:
+        # Las entradas de casos reemplazados o desalojados se limpian si pasan a ser mayoría
+        if len(self._arrivals) <= 2 * max(len(self._entries), 1024):
+            return
+        live = [(entry.received_at, -entry._key[2], entry.id) for entry in self._entries.values()]
+        self._arrivals = deque(sorted(live))
+
+
+def _encode_cursor(key: _Key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> _Key:
+    try:
+        bucket, received_at, sequence, case_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (float(bucket), float(received_at), int(sequence), str(case_id))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Cursor inválido") from None
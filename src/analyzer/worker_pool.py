@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from src.settings import INFERENCE_WORKERS, INFERENCE_QUEUE_LIMIT
+
+
+class PoolSaturatedError(RuntimeError):
+    """No hay lugar en la cola de inferencia."""
+
+
+class InferencePool:
+    """
+    Pool de threads dedicado a la inferencia, con una cola acotada.
+
+    Antes de encolar trabajo hay que reservar lugar con `reserve`: si ya hay
+    `max_pending` textos esperando o en proceso se lanza PoolSaturatedError,
+    así la API rechaza rápido en lugar de acumular requests que van a vencer.
+    """
+
+    def __init__(self, max_workers: int = INFERENCE_WORKERS, max_pending: int = INFERENCE_QUEUE_LIMIT):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_pending(self) -> int:
+        return self._max_pending
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @contextmanager
+    def reserve(self, items: int = 1) -> Iterator[None]:
+        """Reserva lugar para `items` textos mientras dura el bloque."""
+        if not self._try_acquire(items):
+            raise PoolSaturatedError("El servicio está saturado, reintente en unos segundos")
+        try:
+            yield
+        finally:
+            self._release(items)
+
+    @asynccontextmanager
+    async def reserve_when_available(self, items: int = 1, poll_interval: float = 0.01) -> AsyncIterator[None]:
+        """Como `reserve`, pero espera a que se libere lugar en vez de fallar."""
+        while not self._try_acquire(items):
+            await asyncio.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            self._release(items)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Ejecuta `fn(*args)` en el pool sin bloquear el event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _try_acquire(self, items: int) -> bool:
+        with self._lock:
+            if self._pending + items > self._max_pending:
+                return False
+            self._pending += items
+            return True
+
+    def _release(self, items: int) -> None:
+        with self._lock:
+            self._pending -= items
@@ -1,22 +1,70 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
 from enum import Enum
+from typing import AsyncIterator
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
-from src.model.logistic_regression_model import LogisticRegressionModel
-from src.model.random_forest_model import RandomForestModel
+from src.analyzer.batcher import MicroBatcher
+from src.analyzer.cascade import CascadeAnalyzer
+from src.analyzer.jobs import UPLOAD_FORMATS, JobManager, read_texts
+from src.analyzer.registry import create_default_registry
 from src.analyzer.sentiment_analyzer import SentimentAnalyzer
-from src.settings import LOGISTIC_REGRESSION_MODEL_PATH, RANDOM_FOREST_MODEL_PATH, DATA_PATH
+from src.analyzer.triage import TriageQueue
+from src.analyzer.worker_pool import InferencePool, PoolSaturatedError
+from src.metrics import METRICS, MetricsMiddleware, gauge_lines
+from src.settings import (
+    JOBS_MAX_TEXTS,
+    INCREMENTAL_SERVING,
+    JOBS_PAGE_SIZE,
+    LONG_TEXT_CHUNK_CHARS,
+    LONG_TEXT_MAX_CHARS,
+    LONG_TEXT_TOP_SPANS,
+    MAX_BATCH_SIZE,
+    STREAM_CHUNK_SIZE,
+    TRIAGE_PAGE_SIZE,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Carga (o entrena, bajo un lock de archivo) y precalienta los modelos en
+    segundo plano al arrancar: /health responde enseguida y /ready pasa a
+    200 cuando todos los modelos están listos. También retoma los jobs que
+    quedaron sin terminar.
+
+    Al cerrar no se espera a la precarga (entrenar un modelo puede tardar
+    minutos): se detienen los jobs y los batchers y la precarga no empieza
+    ningún modelo más.
+    """
+    stop_loading = threading.Event()
+    loading = asyncio.create_task(asyncio.to_thread(registry.preload, stop_loading))
+    jobs.start()
+    yield
+    await asyncio.to_thread(jobs.stop)
+    for batcher in batchers.values():
+        await batcher.close()
+    stop_loading.set()
+    loading.cancel()
 
 app = FastAPI(
     title="The Smart Feedback API",
     description="API para análisis de sentimiento de feedback",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
+app.add_middleware(MetricsMiddleware)
 
 class ModelType(str, Enum):
     LOGISTIC_REGRESSION = "logistic_regression"
     RANDOM_FOREST = "random_forest"
+    CASCADE = "cascade"
+    if INCREMENTAL_SERVING:
+        INCREMENTAL = "incremental"
 
 # --- Request/Response Models ---
 class AnalyzeRequest(BaseModel):
@@ -27,24 +75,248 @@ class AnalyzeResponse(BaseModel):
     sentiment: str
     score: float
     confidence: dict[str, float]
+    stage: str | None = Field(default=None, description="Solo con model=cascade: primary o secondary, según el modelo que respondió")
+
+class BatchAnalyzeRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE, examples=[["Excelente servicio!", "Pésima atención"]])
+    model: ModelType = Field(default=ModelType.LOGISTIC_REGRESSION, description="Modelo a usar")
+
+class BatchItemResult(BaseModel):
+    index: int
+    sentiment: str | None = None
+    score: float | None = None
+    confidence: dict[str, float] | None = None
+    stage: str | None = None
+    error: str | None = None
+
+class BatchAnalyzeResponse(BaseModel):
+    results: list[BatchItemResult]
+
+class LongAnalyzeRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=LONG_TEXT_MAX_CHARS, examples=["Hola, escribo por el pedido... Sigo sin respuesta."])
+    model: ModelType = Field(default=ModelType.LOGISTIC_REGRESSION, description="Modelo a usar")
+    top_k: int = Field(default=LONG_TEXT_TOP_SPANS, ge=0, le=20, description="Fragmentos negativos a retornar")
+
+class NegativeSpan(BaseModel):
+    start: int
+    end: int
+    text: str
+    score: float
+
+class LongAnalyzeResponse(BaseModel):
+    sentiment: str
+    score: float
+    confidence: dict[str, float]
+    chunks: int
+    negative_spans: list[NegativeSpan]
+
+class TriageItem(BaseModel):
+    text: str
+    id: str | None = Field(default=None, description="Id propio del caso (por ejemplo, el del ticket); si se repite, reemplaza al anterior")
+
+class TriageIngestRequest(BaseModel):
+    items: list[TriageItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    model: ModelType = Field(default=ModelType.LOGISTIC_REGRESSION, description="Modelo a usar")
+
+class TriageIngestResult(BaseModel):
+    index: int
+    id: str | None = None
+    sentiment: str | None = None
+    priority: float | None = None
+    error: str | None = None
+
+class TriageIngestResponse(BaseModel):
+    results: list[TriageIngestResult]
+
+class TriageCase(BaseModel):
+    id: str
+    text: str
+    sentiment: str
+    priority: float
+    confidence: dict[str, float]
+    model: str | None
+    received_at: float
+
+class TriageTopResponse(BaseModel):
+    items: list[TriageCase]
+
+class TriagePageResponse(BaseModel):
+    items: list[TriageCase]
+    next_cursor: str | None
+    total: int
+
+class JobRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, max_length=JOBS_MAX_TEXTS, examples=[["Excelente servicio!", "Pésima atención"]])
+    model: ModelType = Field(default=ModelType.LOGISTIC_REGRESSION, description="Modelo a usar")
+
+class JobResponse(BaseModel):
+    id: str
+    model: str
+    status: str = Field(description="queued, running, done o failed")
+    total: int
+    processed: int
+    errors: int = Field(description="Textos inválidos entre los procesados")
+    progress: float
+    texts_per_second: float | None
+    eta_seconds: float | None
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+    error: str | None
+
+class JobResultsResponse(JobResponse):
+    results: list[BatchItemResult]
+    next_offset: int | None = Field(description="`offset` de la página siguiente; None si ya no quedan textos")
 
 class HealthResponse(BaseModel):
     status: str
     models_available: list[str]
 
+class ModelStatus(BaseModel):
+    state: str
+    load_seconds: float | None
+    version: int | None
+    error: str | None
+
+class ReadyResponse(BaseModel):
+    ready: bool
+    models: dict[str, ModelStatus]
+
 # --- Model Loading ---
-def get_analyzer(model_type: ModelType) -> SentimentAnalyzer:
-    """Carga y retorna el analyzer con el modelo especificado."""
-    if model_type == ModelType.LOGISTIC_REGRESSION:
-        if not LOGISTIC_REGRESSION_MODEL_PATH.exists():
-            LogisticRegressionModel.train(DATA_PATH, str(LOGISTIC_REGRESSION_MODEL_PATH))
-        model = LogisticRegressionModel.load(LOGISTIC_REGRESSION_MODEL_PATH)
-    else:
-        if not RANDOM_FOREST_MODEL_PATH.exists():
-            RandomForestModel.train(DATA_PATH, str(RANDOM_FOREST_MODEL_PATH))
-        model = RandomForestModel.load(RANDOM_FOREST_MODEL_PATH)
+registry = create_default_registry()
+
+# Regresión Logística primero; Random Forest solo para los textos dudosos
+cascade = CascadeAnalyzer(
+    lambda: registry.get(ModelType.LOGISTIC_REGRESSION.value),
+    lambda: registry.get(ModelType.RANDOM_FOREST.value),
+)
+
+def get_analyzer(model_type: ModelType) -> SentimentAnalyzer | CascadeAnalyzer:
+    """Retorna el analyzer compartido del modelo especificado (se carga una sola vez)."""
+    if model_type is ModelType.CASCADE:
+        return cascade
+    return registry.get(model_type.value)
+
+def analyze_many(model_type: ModelType, texts: list[str]) -> list[dict]:
+    return get_analyzer(model_type).analyze_many(texts)
+
+def analyze_long(model_type: ModelType, text: str, top_k: int) -> dict:
+    return get_analyzer(model_type).analyze_long(text, top_k)
+
+# Pool acotado donde corre toda la inferencia
+pool = InferencePool()
+
+# Un batcher por modelo: agrupa los textos de requests concurrentes
+batchers = {
+    model_type: MicroBatcher(lambda model_type=model_type: get_analyzer(model_type), pool=pool)
+    for model_type in ModelType
+}
+
+# Casos críticos, ordenados por probabilidad de negativo y recencia
+triage = TriageQueue()
+
+# Jobs asíncronos: se guardan en disco y los analizan threads propios, fuera del
+# pool de inferencia, así un job grande no llena la cola de /analyze
+jobs = JobManager(lambda model, texts: analyze_many(ModelType(model), texts))
+
+def collect_service_metrics() -> list[str]:
+    """Estado del pool, de la cola de triage, de los jobs, de la cascada y del cache de resultados al momento de exportar /metrics."""
+    lines = gauge_lines("sentiment_inference_pending", "Textos en la cola del pool de inferencia", pool.pending)
+    lines += gauge_lines("sentiment_triage_cases", "Casos en la cola de triage", len(triage))
+    lines += gauge_lines("sentiment_jobs_pending", "Jobs en cola o en curso", jobs.pending())
+    lines += gauge_lines(
+        "sentiment_cascade_escalation_ratio", "Proporción de textos que la cascada escaló al segundo modelo",
+        cascade.stats()['escalation_rate']
+    )
+    if registry.cache is not None:
+        stats = registry.cache.stats()
+        lines += gauge_lines("sentiment_cache_entries", "Entradas en el cache de resultados", stats['size'])
+        lines += gauge_lines("sentiment_cache_hits_total", "Aciertos del cache de resultados", stats['hits'], "counter")
+        lines += gauge_lines("sentiment_cache_misses_total", "Fallos del cache de resultados", stats['misses'], "counter")
+        lines += gauge_lines("sentiment_cache_evictions_total", "Entradas desalojadas del cache", stats['evictions'], "counter")
+        lines += gauge_lines("sentiment_cache_hit_ratio", "Proporción de aciertos del cache", stats['hit_rate'])
+    if registry.store is not None:
+        stats = registry.store.stats()
+        lines += gauge_lines("sentiment_store_entries", "Entradas en el cache persistente", stats['size'])
+        lines += gauge_lines("sentiment_store_hits_total", "Aciertos del cache persistente", stats['hits'], "counter")
+        lines += gauge_lines("sentiment_store_misses_total", "Fallos del cache persistente", stats['misses'], "counter")
+        lines += gauge_lines("sentiment_store_evictions_total", "Entradas borradas del cache persistente", stats['evictions'], "counter")
+    return lines
+
+METRICS.add_collector(collect_service_metrics)
+
+# --- NDJSON Streaming ---
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que no escucha la desconexión del cliente en paralelo.
+    
+    El generador lee el cuerpo de la request mientras responde (y detecta
+    ahí la desconexión); si además se escuchara `receive` en otra tarea,
+    ésta se quedaría con los mensajes del cuerpo.
+    """
+    media_type = "application/x-ndjson"
     
-    return SentimentAnalyzer(model)
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Parte el cuerpo de la request en líneas a medida que llega."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+async def analyze_lines(lines: list[tuple[int, bytes]]) -> list[BatchItemResult]:
+    """Valida cada línea como AnalyzeRequest y analiza las válidas agrupadas por modelo."""
+    results = []
+    texts_by_model: dict[ModelType, list[tuple[int, str]]] = {}
+    
+    for line_number, line in lines:
+        try:
+            item = AnalyzeRequest.model_validate_json(line)
+        except ValidationError as e:
+            results.append(BatchItemResult(index=line_number, error=e.errors()[0]["msg"]))
+        else:
+            texts_by_model.setdefault(item.model, []).append((line_number, item.text))
+    
+    for model_type, items in texts_by_model.items():
+        texts = [text for _, text in items]
+        async with pool.reserve_when_available(len(texts)):
+            analyzed = await pool.run(analyze_many, model_type, texts)
+        for (line_number, _), result in zip(items, analyzed):
+            results.append(BatchItemResult(index=line_number, **result))
+    
+    return sorted(results, key=lambda result: result.index)
+
+async def stream_analysis(body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Analiza el cuerpo NDJSON de a STREAM_CHUNK_SIZE líneas y emite un resultado por línea."""
+    pending = []
+    line_number = 0
+    
+    async for line in iter_lines(body):
+        if line.strip():
+            pending.append((line_number, line))
+        line_number += 1
+        
+        if len(pending) >= STREAM_CHUNK_SIZE:
+            for result in await analyze_lines(pending):
+                yield result.model_dump_json() + "\n"
+            pending = []
+    
+    if pending:
+        for result in await analyze_lines(pending):
+            yield result.model_dump_json() + "\n"
+
+@app.exception_handler(PoolSaturatedError)
+def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    """La cola de inferencia está llena: se rechaza rápido en lugar de encolar."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
 
 # --- Endpoints ---
 @app.get("/health", response_model=HealthResponse)
@@ -55,42 +327,228 @@ def health_check():
         "models_available": [m.value for m in ModelType]
     }
 
-@app.post("/analyze", response_model=AnalyzeResponse)
-def analyze_feedback(request: AnalyzeRequest):
+@app.get("/ready", response_model=ReadyResponse, responses={503: {"model": ReadyResponse}})
+def readiness_check():
+    """Indica si todos los modelos están cargados, con el estado y el tiempo de carga de cada uno."""
+    ready = registry.is_ready()
+    content = {"ready": ready, "models": registry.status()}
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics() -> PlainTextResponse:
+    """Métricas en formato de texto de Prometheus: conteos, tamaños de lote y tiempos por etapa."""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/batching")
+def batching_metrics() -> dict:
+    """Tamaño y latencia de los lotes armados por el micro-batcher de cada modelo."""
+    return {
+        model_type.value: batcher.metrics.snapshot()
+        for model_type, batcher in batchers.items()
+    }
+
+@app.get("/metrics/cascade")
+def cascade_metrics() -> dict:
+    """Textos analizados por la cascada y cuántos se escalaron al segundo modelo."""
+    return cascade.stats()
+
+@app.get("/metrics/cache")
+def cache_metrics() -> dict:
+    """Aciertos, desalojos y tamaño del cache de resultados (y del persistente, si está activo)."""
+    if registry.cache is None:
+        return {"enabled": False}
+    store = registry.store.stats() if registry.store is not None else None
+    return {"enabled": True, **registry.cache.stats(), "store": store}
+
+@app.post("/analyze", response_model=AnalyzeResponse, response_model_exclude_none=True)
+async def analyze_feedback(request: AnalyzeRequest):
     """
     Analiza el sentimiento de un texto.
     
     - text: Texto a analizar
-    - model: Modelo a usar (logistic_regression o random_forest)
+    - model: Modelo a usar (logistic_regression, random_forest, cascade o incremental si INCREMENTAL_SERVING está activado)
     
     Retorna:
     - sentiment: positivo, neutral o negativo
     - score: confianza del sentimiento predicho (0-1)
     - confidence: probabilidades de cada clase
+    - stage: con cascade, qué modelo respondió (primary o secondary)
     """
     try:
-        analyzer = get_analyzer(request.model)
-        result = analyzer.analyze(request.text)
+        result = await batchers[request.model].analyze(request.text)
         return {
             **result
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/analyze/batch", response_model=BatchAnalyzeResponse)
+async def analyze_feedback_batch(request: BatchAnalyzeRequest):
+    """
+    Analiza el sentimiento de una lista de textos en una sola pasada por el modelo.
+    
+    - texts: Textos a analizar
+    - model: Modelo a usar (logistic_regression, random_forest, cascade o incremental si INCREMENTAL_SERVING está activado)
+    
+    Retorna un resultado por texto, en el mismo orden. Los textos inválidos
+    no hacen fallar el lote: su resultado trae `error` en lugar del sentimiento.
+    """
+    with pool.reserve(len(request.texts)):
+        results = await pool.run(analyze_many, request.model, request.texts)
+    return {
+        "results": [{"index": index, **result} for index, result in enumerate(results)]
+    }
+
+@app.post("/analyze/long", response_model=LongAnalyzeResponse)
+async def analyze_feedback_long(request: LongAnalyzeRequest):
+    """
+    Analiza un texto largo (hilos de mails, transcripciones de chat).
+    
+    El texto se parte en oraciones agrupadas en chunks de hasta
+    LONG_TEXT_CHUNK_CHARS caracteres, que se analizan en un solo lote.
+    
+    Retorna:
+    - sentiment, score y confidence: combinados, pesando cada chunk por su largo
+    - chunks: cantidad de chunks analizados
+    - negative_spans: hasta `top_k` fragmentos negativos (posiciones en el texto original)
+    """
+    # A lo sumo 2n / LONG_TEXT_CHUNK_CHARS + 1 chunks: se reserva ese lugar en la cola
+    with pool.reserve(2 * len(request.text) // LONG_TEXT_CHUNK_CHARS + 1):
+        try:
+            return await pool.run(analyze_long, request.model, request.text, request.top_k)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/analyze/stream")
+async def analyze_feedback_stream(request: Request):
+    """
+    Analiza un cuerpo NDJSON (una línea `AnalyzeRequest` por comentario) y
+    responde NDJSON a medida que se producen los resultados.
+    
+    Cada línea de la respuesta trae `index` (número de línea de la entrada,
+    desde 0) y el resultado del análisis o `error`. La entrada se procesa
+    en bloques de STREAM_CHUNK_SIZE líneas, así que la memoria no crece con
+    el tamaño del cuerpo.
+    """
+    return NDJSONStreamingResponse(stream_analysis(request.stream()))
+
 @app.post("/predict")
-def predict_sentiment(request: AnalyzeRequest) -> dict:
+async def predict_sentiment(request: AnalyzeRequest) -> dict:
     """
     Retorna solo el sentimiento (positivo, neutral, negativo).
     - text: Texto a analizar
-    - model: Modelo a usar (logistic_regression o random_forest)
+    - model: Modelo a usar (logistic_regression, random_forest, cascade o incremental si INCREMENTAL_SERVING está activado)
 
     Retorna:
     - sentiment: sentimiento predicho
     """
     try:
-        analyzer = get_analyzer(request.model)
+        result = await batchers[request.model].analyze(request.text)
         return {
-            "sentiment": analyzer.predict(request.text)
+            "sentiment": result["sentiment"]
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/triage", response_model=TriageIngestResponse)
+async def ingest_triage(request: TriageIngestRequest):
+    """
+    Analiza comentarios y los agrega a la cola de triage.
+    
+    La prioridad de cada caso es su probabilidad de ser negativo. Retorna
+    un resultado por comentario, en el mismo orden; los textos inválidos
+    traen `error` y no se agregan.
+    """
+    texts = [item.text for item in request.items]
+    with pool.reserve(len(texts)):
+        results = await pool.run(analyze_many, request.model, texts)
+    
+    response = []
+    for index, (item, result) in enumerate(zip(request.items, results)):
+        if 'error' in result:
+            response.append({"index": index, "error": result['error']})
+            continue
+        entry = triage.ingest(item.text, result, model=request.model.value, case_id=item.id)
+        response.append({"index": index, "id": entry.id, "sentiment": entry.sentiment, "priority": entry.priority})
+    return {"results": response}
+
+@app.get("/triage/top", response_model=TriageTopResponse)
+def triage_top(k: int = Query(default=10, ge=1, le=1000, description="Cantidad de casos")):
+    """Los `k` casos más críticos: mayor probabilidad de negativo y, a igualdad, los más recientes."""
+    return {"items": [entry.to_dict() for entry in triage.top(k)]}
+
+@app.get("/triage", response_model=TriagePageResponse)
+def triage_page(
+    limit: int = Query(default=TRIAGE_PAGE_SIZE, ge=1, le=1000, description="Casos por página"),
+    cursor: str | None = Query(default=None, description="`next_cursor` de la página anterior"),
+):
+    """Recorre la cola de triage por páginas, del caso más crítico al menos."""
+    try:
+        entries, next_cursor = triage.page(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": [entry.to_dict() for entry in entries], "next_cursor": next_cursor, "total": len(triage)}
+
+@app.delete("/triage/{case_id}", status_code=204)
+def resolve_triage_case(case_id: str):
+    """Saca un caso de la cola (por ejemplo, porque ya se atendió)."""
+    if not triage.remove(case_id):
+        raise HTTPException(status_code=404, detail="Caso no encontrado")
+    return Response(status_code=204)
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(
+    request: Request,
+    response: Response,
+    model: ModelType = Query(default=ModelType.LOGISTIC_REGRESSION, description="Modelo a usar, si se sube un archivo"),
+    column: str = Query(default="message", description="Columna con el texto, si se sube un CSV o JSONL"),
+):
+    """
+    Crea un job de análisis en segundo plano y retorna su id enseguida.
+    
+    El cuerpo puede ser un JSON `{"texts": [...], "model": ...}` o un archivo
+    (con su Content-Type): CSV (`text/csv`, columna `column`), JSONL
+    (`application/x-ndjson`) o texto plano con un comentario por línea
+    (`text/plain`). El avance y los resultados se consultan en GET /jobs/{id}.
+    """
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+    body = await request.body()
+    
+    if content_type == "application/json":
+        try:
+            job_request = JobRequest.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+        texts, model = job_request.texts, job_request.model
+    elif content_type in UPLOAD_FORMATS:
+        try:
+            texts = read_texts(body, content_type, column)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not texts:
+            raise HTTPException(status_code=400, detail="El archivo no tiene textos")
+        if len(texts) > JOBS_MAX_TEXTS:
+            raise HTTPException(status_code=413, detail=f"El archivo tiene más de {JOBS_MAX_TEXTS} textos")
+    else:
+        raise HTTPException(status_code=415, detail=f"Formato no soportado: {content_type}")
+    
+    job = await asyncio.to_thread(jobs.submit, texts, model.value)
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return job
+
+@app.get("/jobs/{job_id}", response_model=JobResultsResponse)
+def get_job(
+    job_id: str,
+    offset: int = Query(default=0, ge=0, description="Posición del primer resultado"),
+    limit: int = Query(default=JOBS_PAGE_SIZE, ge=0, le=1000, description="Resultados por página (0 para ver solo el avance)"),
+):
+    """
+    Estado del job (avance, textos por segundo y tiempo restante estimado) y
+    una página de los resultados ya analizados, en el orden de entrada.
+    """
+    job = jobs.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    results = jobs.results(job_id, offset, limit) if limit else []
+    next_offset = offset + len(results)
+    return {**job, "results": results, "next_offset": next_offset if next_offset < job['total'] else None}
@@ -1,10 +1,169 @@
-from src.model.logistic_regression_model import LogisticRegressionModel
-from src.model.random_forest_model import RandomForestModel
+import argparse
+import json
+import os
+
+from src.analyzer.cache import CachedSentimentAnalyzer
+from src.analyzer.registry import create_default_registry
 from src.analyzer.sentiment_analyzer import SentimentAnalyzer
-from src.settings import LOGISTIC_REGRESSION_MODEL_PATH, RANDOM_FOREST_MODEL_PATH, DATA_PATH
+from src.model.incremental_model import IncrementalModel
+from src.settings import (
+    BULK_CHUNK_SIZE,
+    BULK_OUTPUT_FORMATS,
+    DATA_PATH,
+    INCREMENTAL_MODEL_PATH,
+    OPTIMIZE_ACCURACY_TOLERANCE,
+    SWEEP_MIN_ACCURACY,
+    TRAIN_CHUNK_SIZE,
+)
+
+# Los modelos se cargan una sola vez y los resultados repetidos salen del cache
+registry = create_default_registry()
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.command == "score":
+        run_score(args)
+    elif args.command in ("train", "update"):
+        run_incremental_training(args)
+    elif args.command == "sweep":
+        run_sweep(args)
+    elif args.command == "optimize":
+        run_optimize(args)
+    else:
+        run_interactive()
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.main_cli", description="The Smart Feedback")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    score = subparsers.add_parser("score", help="Analiza un archivo CSV, JSONL o Parquet completo")
+    score.add_argument("input", help="Archivo de entrada (por ejemplo data/reviews.csv)")
+    score.add_argument("output", help="Archivo de salida (.csv, .jsonl o .parquet)")
+    score.add_argument("--model", choices=registry.names(), default="logistic_regression")
+    score.add_argument("--chunksize", type=int, default=BULK_CHUNK_SIZE, help="Filas por chunk")
+    score.add_argument("--workers", type=int, default=1, help="Procesos en paralelo")
+    score.add_argument("--text-column", default="message", help="Columna con el texto")
+    score.add_argument("--format", choices=BULK_OUTPUT_FORMATS, help="Formato de salida (por defecto, según la extensión)")
+    score.add_argument("--keep-text", action="store_true", help="Incluir el texto en la salida")
+    
+    train = subparsers.add_parser("train", help="Entrena el modelo incremental leyendo el CSV por chunks")
+    update = subparsers.add_parser("update", help="Actualiza el modelo incremental solo con datos nuevos")
+    for subparser in (train, update):
+        subparser.add_argument("data", help="CSV con columnas message y sentiment")
+        subparser.add_argument("--model-path", default=str(INCREMENTAL_MODEL_PATH), help="Archivo del modelo")
+        subparser.add_argument("--chunksize", type=int, default=TRAIN_CHUNK_SIZE, help="Filas por chunk")
+        subparser.add_argument("--no-resume", dest="resume", action="store_false", help="Ignorar un checkpoint previo")
+    
+    sweep_parser = subparsers.add_parser("sweep", help="Entrena y compara varias configuraciones en paralelo")
+    sweep_parser.add_argument("data", nargs="?", default=DATA_PATH, help="CSV con columnas message y sentiment")
+    sweep_parser.add_argument("--configs", help="JSON con la lista de configuraciones (por defecto, las de src/model/sweep.py)")
+    sweep_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos en paralelo")
+    sweep_parser.add_argument("--min-accuracy", type=float, default=SWEEP_MIN_ACCURACY, help="Accuracy mínima para elegir un modelo")
+    sweep_parser.add_argument("--output", help="Guardar los resultados en un JSON")
+    sweep_parser.add_argument("--publish", action="store_true", help="Reemplazar el modelo que usa la API por el elegido")
+    
+    optimize = subparsers.add_parser("optimize", help="Achica el artefacto de un modelo entrenado (poda y float32)")
+    optimize.add_argument("--model", choices=["logistic_regression", "random_forest"], default="logistic_regression")
+    optimize.add_argument("--model-path", help="Archivo .pkl del modelo (por defecto, el que usa la API)")
+    optimize.add_argument("--data", default=DATA_PATH, help="CSV con el que se entrenó (para el split de test)")
+    optimize.add_argument("--tolerance", type=float, default=OPTIMIZE_ACCURACY_TOLERANCE, help="Accuracy que se puede perder")
+    optimize.add_argument("--trim-trees", action="store_true", help="Random Forest: quedarse con el menor subconjunto de árboles")
+    optimize.add_argument("--output", help="Artefacto de salida (por defecto, reemplaza al que sirve la API)")
+    optimize.add_argument("--report", help="Guardar el reporte en un JSON")
+    
+    return parser
+
+def run_score(args: argparse.Namespace) -> None:
+    # pandas (y sklearn, en el sweep) se importan solo en los comandos que los usan
+    from src.analyzer.bulk_scorer import score_file
+    
+    print(f"Analizando {args.input} con {args.model}...")
+    stats = score_file(
+        args.input,
+        args.output,
+        model=args.model,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        text_column=args.text_column,
+        output_format=args.format,
+        keep_text=args.keep_text,
+    )
+    print(f"{stats['rows']:,} filas en {stats['seconds']:.1f}s ({stats['rows_per_second']:,.0f} filas/s) -> {args.output}")
 
+def run_incremental_training(args: argparse.Namespace) -> None:
+    if args.command == "train":
+        print(f"Entrenando {args.model_path} con {args.data}...")
+        model = IncrementalModel.train(args.data, args.model_path, chunksize=args.chunksize, resume=args.resume)
+    else:
+        print(f"Actualizando {args.model_path} con {args.data}...")
+        model = IncrementalModel.load(args.model_path).update(
+            args.data, args.model_path, chunksize=args.chunksize, resume=args.resume
+        )
+    print(f"Modelo guardado en {args.model_path} ({model.rows_seen:,} filas de entrenamiento en total)")
 
-def main():
+def run_sweep(args: argparse.Namespace) -> None:
+    from src.model import sweep
+    
+    configs = sweep.load_configs(args.configs) if args.configs else sweep.DEFAULT_CONFIGS
+    print(f"Entrenando {len(configs)} configuraciones con {args.workers} procesos...")
+    results = sweep.run_sweep(configs, args.data, workers=args.workers)
+    best = sweep.select_best(results, args.min_accuracy)
+    
+    print(f"\n  {'configuración':<26} {'accuracy':>9} {'ms/texto':>9} {'tamaño (KB)':>12} {'entrenamiento (s)':>18}")
+    for result in sorted(results, key=lambda r: r['latency_ms']):
+        marker = "*" if result is best else " "
+        print(f"{marker} {result['name']:<26} {result['accuracy']:>9.3f} {result['latency_ms']:>9.3f} "
+              f"{result['size_bytes'] / 1024:>12,.0f} {result['fit_seconds']:>18.2f}")
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({'min_accuracy': args.min_accuracy, 'best': best and best['name'], 'results': results}, f, indent=2, default=str)
+    
+    if best is None:
+        print(f"\nNinguna configuración alcanza accuracy {args.min_accuracy}")
+        return
+    print(f"\nMás rápida con accuracy >= {args.min_accuracy}: {best['name']}")
+    if args.publish:
+        print(f"Modelo publicado en {sweep.publish(best)}")
+
+def run_optimize(args: argparse.Namespace) -> None:
+    from src.model.optimize import optimize_model
+    
+    print(f"Optimizando {args.model} (tolerancia de accuracy {args.tolerance})...")
+    report = optimize_model(
+        args.model,
+        model_path=args.model_path,
+        data_path=args.data,
+        tolerance=args.tolerance,
+        trim_trees=args.trim_trees,
+        output_path=args.output,
+    )
+    
+    before, after = report['before'], report['after']
+    print(f"\n  {'':<14} {'antes':>12} {'después':>12} {'cambio':>9}")
+    rows = [
+        ('size_bytes', 'tamaño (KB)', 1 / 1024, ',.1f'),
+        ('latency_ms', 'ms/texto', 1, '.3f'),
+        ('accuracy', 'accuracy', 1, '.3f'),
+        ('features', 'términos', 1, ',.0f'),
+        ('trees', 'árboles', 1, ',.0f'),
+    ]
+    for key, label, scale, spec in rows:
+        if key not in before:
+            continue
+        # La accuracy cambia en puntos; el resto, en proporción
+        change = after[key] - before[key] if key == 'accuracy' else after[key] / before[key] - 1
+        print(f"  {label:<14} {before[key] * scale:>12{spec}} {after[key] * scale:>12{spec}} {change:>+9.1%}")
+    print(f"\nArtefacto guardado en {report['path']}")
+    
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+def run_interactive():
     print("The Smart Feedback")
     print("> Escribe 'exit' para salir\n")
     print("> Escribe 'change-model-to-rf' para cambiar al modelo con Random Forest\n")
@@ -34,19 +193,11 @@ def main():
         result = analyzer.analyze(text)
         print(f"  > {result['sentiment']} ({result['score']:.1%})\n")
 
-def create_sentiment_analyzer_with_logistic_regression() -> SentimentAnalyzer:
-    if not LOGISTIC_REGRESSION_MODEL_PATH.exists():
-        LogisticRegressionModel.train(DATA_PATH, str(LOGISTIC_REGRESSION_MODEL_PATH))
-        
-    model = LogisticRegressionModel.load(LOGISTIC_REGRESSION_MODEL_PATH)
-    return SentimentAnalyzer(model)
+def create_sentiment_analyzer_with_logistic_regression() -> SentimentAnalyzer | CachedSentimentAnalyzer:
+    return registry.get("logistic_regression")
 
-def create_sentiment_analyzer_with_random_forest() -> SentimentAnalyzer:
-    if not RANDOM_FOREST_MODEL_PATH.exists():
-        RandomForestModel.train(DATA_PATH, str(RANDOM_FOREST_MODEL_PATH))
-        
-    model = RandomForestModel.load(RANDOM_FOREST_MODEL_PATH)
-    return SentimentAnalyzer(model)
+def create_sentiment_analyzer_with_random_forest() -> SentimentAnalyzer | CachedSentimentAnalyzer:
+    return registry.get("random_forest")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,10 +1,11 @@
+import queue
+import threading
+
 import customtkinter as ctk
 from datetime import datetime
 
-from src.model.logistic_regression_model import LogisticRegressionModel
-from src.model.random_forest_model import RandomForestModel
-from src.analyzer.sentiment_analyzer import SentimentAnalyzer
-from src.settings import LOGISTIC_REGRESSION_MODEL_PATH, RANDOM_FOREST_MODEL_PATH, DATA_PATH
+from src.analyzer.registry import create_default_registry
+from src.settings import GUI_POLL_INTERVAL_MS
 
 # Configuración de colores
 COLORS = {
@@ -22,6 +23,12 @@ COLORS = {
     "accent": "#10a37f"
 }
 
+# Nombre en el selector -> nombre del modelo en el registry
+MODEL_NAMES = {
+    "Regresión Logística": "logistic_regression",
+    "Random Forest": "random_forest",
+}
+
 
 class ChatMessage(ctk.CTkFrame):
     """Widget para mostrar un mensaje en el chat"""
@@ -77,7 +84,17 @@ class ChatMessage(ctk.CTkFrame):
 
 
 class SentimentAnalyzerGUI(ctk.CTk):
-    """Interfaz gráfica principal para el analizador de sentimientos"""
+    """
+    Interfaz gráfica principal para el analizador de sentimientos.
+
+    Tk no es thread-safe y cargar (o entrenar) un modelo puede tardar varios
+    segundos, así que la carga y el análisis corren en un hilo de trabajo.
+    Las tareas se procesan en orden: un mensaje enviado después de cambiar
+    de modelo se analiza con el modelo nuevo. Los resultados vuelven por una
+    cola que el hilo principal revisa con `after()`, y solo ese hilo toca
+    los widgets. El registry mantiene cada modelo cargado, así que volver a
+    un modelo ya usado no lo lee de nuevo desde disco.
+    """
     
     def __init__(self):
         super().__init__()
@@ -94,11 +111,19 @@ class SentimentAnalyzerGUI(ctk.CTk):
         
         # Variables
         self.current_model = ctk.StringVar(value="Regresión Logística")
-        self.analyzer = None
         self.messages = []
+        self.registry = create_default_registry()
+        
+        # Hilo de trabajo: recibe (tarea, callback, callback de error) y deja los resultados en _results
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._status = ""
+        threading.Thread(target=self._run_tasks, daemon=True).start()
         
         # Crear interfaz
         self._create_ui()
+        self.after(GUI_POLL_INTERVAL_MS, self._poll_results)
         
         # Cargar modelo por defecto
         self._load_model()
@@ -232,6 +257,26 @@ class SentimentAnalyzerGUI(ctk.CTk):
         self._set_placeholder()
         self.text_input.bind("<FocusIn>", self._on_focus_in)
         self.text_input.bind("<FocusOut>", self._on_focus_out)
+        
+        # Estado del trabajo en segundo plano (sobre la barra de input)
+        self.status_bar = ctk.CTkFrame(self, fg_color=COLORS["bg_dark"], height=28)
+        self.status_bar.pack(fill="x", side="bottom", padx=0, pady=0, before=self.input_bar)
+        
+        self.progress_bar = ctk.CTkProgressBar(
+            self.status_bar,
+            mode="indeterminate",
+            width=160,
+            height=6,
+            progress_color=COLORS["accent"]
+        )
+        
+        self.status_label = ctk.CTkLabel(
+            self.status_bar,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=COLORS["text_secondary"]
+        )
+        self.status_label.pack(side="left", padx=20)
     
     def _set_placeholder(self):
         """Establecer placeholder en el textbox"""
@@ -308,36 +353,74 @@ class SentimentAnalyzerGUI(ctk.CTk):
                 text_color=COLORS["text_secondary"]
             ).pack(padx=20, pady=(0, 15))
     
-    def _load_model(self):
-        """Cargar el modelo seleccionado"""
-        model_name = self.current_model.get()
-        
-        try:
-            if model_name == "Regresión Logística":
-                self.analyzer = self._create_logistic_regression_analyzer()
+    def _run_tasks(self):
+        """Hilo de trabajo: ejecuta las tareas en orden, sin tocar widgets"""
+        while True:
+            task, on_done, on_error = self._tasks.get()
+            try:
+                result = task()
+            except Exception as e:
+                self._results.put((on_error, e))
             else:
-                self.analyzer = self._create_random_forest_analyzer()
-        except Exception as e:
-            self._show_error(f"Error al cargar el modelo: {str(e)}")
+                self._results.put((on_done, result))
+    
+    def _submit(self, task, on_done, on_error, status: str):
+        """Encolar una tarea para el hilo de trabajo"""
+        self._pending += 1
+        self._tasks.put((task, on_done, on_error))
+        self._update_status(status)
+    
+    def _poll_results(self):
+        """Entregar en el hilo principal los resultados del hilo de trabajo"""
+        try:
+            while True:
+                callback, value = self._results.get_nowait()
+                self._pending -= 1
+                callback(value)
+                self._update_status()
+        except queue.Empty:
+            pass
+        self.after(GUI_POLL_INTERVAL_MS, self._poll_results)
     
-    def _create_logistic_regression_analyzer(self) -> SentimentAnalyzer:
-        """Crear analizador con Regresión Logística"""
-        if not LOGISTIC_REGRESSION_MODEL_PATH.exists():
-            LogisticRegressionModel.train(DATA_PATH, str(LOGISTIC_REGRESSION_MODEL_PATH))
-        model = LogisticRegressionModel.load(LOGISTIC_REGRESSION_MODEL_PATH)
-        return SentimentAnalyzer(model)
+    def _update_status(self, status: str = None):
+        """Mostrar u ocultar el indicador de progreso según las tareas pendientes"""
+        if self._pending == 0:
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            self.status_label.configure(text="")
+            return
+        
+        if status:
+            self._status = status
+        queued = f" ({self._pending - 1} en cola)" if self._pending > 1 else ""
+        self.status_label.configure(text=f"{self._status}{queued}")
+        if not self.progress_bar.winfo_ismapped():
+            self.progress_bar.pack(side="left", padx=(20, 0), before=self.status_label)
+            self.progress_bar.start()
     
-    def _create_random_forest_analyzer(self) -> SentimentAnalyzer:
-        """Crear analizador con Random Forest"""
-        if not RANDOM_FOREST_MODEL_PATH.exists():
-            RandomForestModel.train(DATA_PATH, str(RANDOM_FOREST_MODEL_PATH))
-        model = RandomForestModel.load(RANDOM_FOREST_MODEL_PATH)
-        return SentimentAnalyzer(model)
+    def _load_model(self, announce: bool = False):
+        """Cargar el modelo seleccionado en segundo plano"""
+        choice = self.current_model.get()
+        
+        # El registry se queda con el modelo cargado: las consultas lo piden ahí
+        def on_done(_analyzer):
+            if announce:
+                self._add_system_message(f"Modelo cambiado a: {choice}")
+        
+        def on_error(e):
+            self._show_error(f"Error al cargar el modelo: {str(e)}")
+        
+        # Si el modelo no existe en disco el registry lo entrena: puede tardar
+        self._submit(
+            lambda: self.registry.get(MODEL_NAMES[choice]),
+            on_done,
+            on_error,
+            f"Cargando {choice}..."
+        )
     
     def _on_model_change(self, choice):
         """Callback cuando cambia el modelo"""
-        self._load_model()
-        self._add_system_message(f"Modelo cambiado a: {choice}")
+        self._load_model(announce=True)
     
     def _add_system_message(self, text: str):
         """Añadir mensaje del sistema"""
@@ -372,27 +455,33 @@ class SentimentAnalyzerGUI(ctk.CTk):
         user_msg.pack(fill="x", pady=2)
         self.messages.append(user_msg)
         
-        # Analizar
-        try:
-            result = self.analyzer.analyze(text)
-            sentiment = result['sentiment']
-            score = result['score']
-            
+        self._scroll_to_bottom()
+        
+        # Analizar en segundo plano con el modelo seleccionado al enviar
+        model_name = MODEL_NAMES[self.current_model.get()]
+        
+        def on_done(result):
             # Añadir respuesta
             response_msg = ChatMessage(
                 self.chat_scroll, 
                 text, 
                 is_user=False, 
-                sentiment=sentiment, 
-                score=score
+                sentiment=result['sentiment'], 
+                score=result['score']
             )
             response_msg.pack(fill="x", pady=2)
             self.messages.append(response_msg)
-            
-        except Exception as e:
+            self._scroll_to_bottom()
+        
+        def on_error(e):
             self._show_error(f"Error en el análisis: {str(e)}")
         
-        self._scroll_to_bottom()
+        self._submit(
+            lambda: self.registry.get(model_name).analyze(text),
+            on_done,
+            on_error,
+            "Analizando..."
+        )
     
     def _show_error(self, message: str):
         """Mostrar mensaje de error"""
@@ -411,6 +500,7 @@ class SentimentAnalyzerGUI(ctk.CTk):
     
     def _clear_chat(self):
         """Limpiar todos los mensajes del chat"""
+        # Las respuestas pendientes se siguen agregando al llegar
         for widget in self.chat_scroll.winfo_children():
             widget.destroy()
         
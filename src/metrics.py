@@ -0,0 +1,257 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Buckets en segundos: de 100 µs (un texto con el scorer compilado) a 10 s (lotes grandes)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOAD_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[label]) for label in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Líneas de muestras de la métrica, en el formato de texto de Prometheus."""
+        pass
+
+
+class Counter(_Metric):
+    """Contador que solo sube, uno por combinación de labels."""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{self._labels(key)} {value}" for key, value in values]
+
+
+class Histogram(_Metric):
+    """
+    Histograma con buckets fijos. `observe` hace una búsqueda binaria y
+    suma bajo un lock: un par de microsegundos, se puede dejar siempre activo.
+    """
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por labels: conteo de cada bucket (el último es +Inf), suma y cantidad
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        self._observe(value, self._key(labels))
+
+    def _observe(self, value: float, key: Tuple[str, ...]) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels: str) -> "_Timer":
+        """Context manager que observa los segundos que tarda el bloque."""
+        return _Timer(self, self._key(labels))
+
+    def labels(self, **labels: str) -> "BoundHistogram":
+        """Histograma con los labels ya resueltos, para el camino caliente."""
+        return BoundHistogram(self, self._key(labels))
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def sum(self, **labels: str) -> float:
+        entry = self._values.get(self._key(labels))
+        return entry[1] if entry else 0.0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+
+        samples = []
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                samples.append(f"{self.name}_bucket{self._labels(key, ('le', le))} {cumulative}")
+            samples.append(f"{self.name}_sum{self._labels(key)} {total}")
+            samples.append(f"{self.name}_count{self._labels(key)} {count}")
+        return samples
+
+
+class BoundHistogram:
+    __slots__ = ("_histogram", "_key")
+
+    def __init__(self, histogram: Histogram, key: Tuple[str, ...]):
+        self._histogram = histogram
+        self._key = key
+
+    def observe(self, value: float) -> None:
+        self._histogram._observe(value, self._key)
+
+    def time(self) -> "_Timer":
+        return _Timer(self._histogram, self._key)
+
+
+class _Timer:
+    # Clase con __slots__ en vez de @contextmanager: es bastante más barata por bloque
+    __slots__ = ("_histogram", "_key", "_started")
+
+    def __init__(self, histogram: Histogram, key: Tuple[str, ...]):
+        self._histogram = histogram
+        self._key = key
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self._histogram._observe(time.perf_counter() - self._started, self._key)
+
+
+class MetricsRegistry:
+    """
+    Métricas del proceso en formato de texto de Prometheus.
+
+    Además de contadores e histogramas acepta collectors: funciones que al
+    exportar retornan líneas ya armadas (por ejemplo, los valores del cache).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def gauge_lines(name: str, documentation: str, value: float, metric_type: str = "gauge") -> List[str]:
+    """Líneas de una métrica sin labels, para usar en collectors."""
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}", f"{name} {value}"]
+
+
+METRICS = MetricsRegistry()
+
+MODEL_LOAD_SECONDS = METRICS.histogram(
+    "sentiment_model_load_seconds", "Tiempo de carga (y entrenamiento si faltaba) de cada modelo", ["model"], LOAD_BUCKETS
+)
+VECTORIZE_SECONDS = METRICS.histogram(
+    "sentiment_vectorize_seconds", "Tiempo de vectorización (TF-IDF o hashing) por llamada al modelo", ["model"]
+)
+SCORE_SECONDS = METRICS.histogram(
+    "sentiment_score_seconds", "Tiempo del clasificador por llamada al modelo", ["model"]
+)
+ANALYZE_SECONDS = METRICS.histogram(
+    "sentiment_analyze_seconds", "Tiempo total de inferencia por llamada al analyzer", ["model"]
+)
+BATCH_SIZE = METRICS.histogram(
+    "sentiment_batch_size", "Textos válidos por llamada al modelo", ["model"], BATCH_SIZE_BUCKETS
+)
+TEXTS_TOTAL = METRICS.counter(
+    "sentiment_texts_total", "Textos analizados", ["model"]
+)
+INVALID_TEXTS_TOTAL = METRICS.counter(
+    "sentiment_invalid_texts_total", "Textos rechazados por inválidos", ["model"]
+)
+CASCADE_TEXTS_TOTAL = METRICS.counter(
+    "sentiment_cascade_texts_total", "Textos analizados por la cascada, según la etapa que respondió", ["stage"]
+)
+HTTP_REQUESTS_TOTAL = METRICS.counter(
+    "http_requests_total", "Requests HTTP atendidas", ["method", "path", "status"]
+)
+HTTP_REQUEST_SECONDS = METRICS.histogram(
+    "http_request_duration_seconds", "Duración de las requests HTTP, incluida la serialización de la respuesta", ["method", "path"]
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que cuenta y mide cada request HTTP hasta que se envió
+    la respuesta completa (también para respuestas en streaming).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Se usa la ruta (/jobs/{job_id}) y no el path concreto, para no crear una serie por id
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "otras"
+            HTTP_REQUESTS_TOTAL.inc(method=scope["method"], path=path, status=str(status))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=scope["method"], path=path)
@@ -0,0 +1,223 @@
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.model.compiled import CompiledLinearScorer, CompiledTfidfVectorizer
+from src.model.flat_forest import FlatForest
+from src.model.text_normalizer import TextNormalizer
+
+# Formato del archivo:
+#   MAGIC | largo del header (uint64 little-endian) | header JSON | arrays
+# El header trae la versión del formato, el tipo de modelo, las clases en orden,
+# los parámetros del vectorizador (con los de su TextNormalizer, si tiene) y, por array, dtype, shape y offset. Cada array
+# empieza alineado a ALIGNMENT bytes, así se puede mapear con np.memmap.
+MAGIC = b"SFMODEL\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def artifact_path(model_path: Path) -> Path:
+    """Archivo compacto que acompaña a un .pkl: lo que se carga para servir."""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.stem + ".artifact")
+
+
+def write_artifact(path: Path, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    """Escribe el header y los arrays en un archivo temporal y lo reemplaza de una vez."""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    specs = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _aligned(offset)
+        specs[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+
+    header_bytes = json.dumps(
+        {**header, 'format_version': FORMAT_VERSION, 'arrays': specs}, ensure_ascii=False
+    ).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + specs[name]['offset'])
+            f.write(array.tobytes())
+        # Relleno final: ningún offset queda fuera del archivo (por ejemplo, el de un array vacío)
+        f.truncate(data_start + _aligned(offset))
+    os.replace(tmp_path, path)
+
+
+def read_artifact(path: Path, mmap_mode: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Lee un artefacto. Con mmap_mode='r' los arrays se mapean desde el archivo
+    (los procesos que lo abren comparten esas páginas); si no, se lee el
+    archivo una vez y los arrays son vistas de solo lectura sobre esos bytes.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 8)
+        if len(prefix) < len(MAGIC) + 8 or prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} no es un artefacto de modelo")
+        (header_size,) = struct.unpack("<Q", prefix[len(MAGIC):])
+        header = json.loads(f.read(header_size).decode("utf-8"))
+        data = None if mmap_mode else f.read()
+
+    if header.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Versión de artefacto no soportada: {header.get('format_version')}")
+
+    data_start = _aligned(len(MAGIC) + 8 + header_size)
+    # Si se leyó el archivo, `data` empieza justo después del header
+    data_offset = data_start - (len(MAGIC) + 8 + header_size)
+    arrays = {}
+    for name, spec in header.pop('arrays').items():
+        dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        elif mmap_mode:
+            arrays[name] = np.memmap(path, dtype=dtype, mode=mmap_mode, offset=data_start + spec['offset'], shape=shape)
+        else:
+            arrays[name] = np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)), offset=data_offset + spec['offset']).reshape(shape)
+    return header, arrays
+
+
+def current_artifact(model_path: Path) -> Optional[Path]:
+    """El artefacto del .pkl si existe y corresponde al .pkl actual; si no, None."""
+    path = artifact_path(model_path)
+    return path if is_current(path, model_path) else None
+
+
+def is_current(path: Path, model_path: Path) -> bool:
+    """
+    True si el artefacto corresponde al .pkl actual: al guardar, el artefacto
+    queda con el mismo mtime que el .pkl, así uno reemplazado por otro medio
+    no se confunde con el anterior.
+    """
+    try:
+        return Path(path).stat().st_mtime_ns == Path(model_path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def stamp(path: Path, mtime_ns: int) -> None:
+    """Deja `path` con el mtime `mtime_ns`: el artefacto y su .pkl comparten así la versión."""
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def save_linear(scorer: CompiledLinearScorer, path: Path) -> None:
+    """Guarda vocabulario, idf, pesos por feature e intercept de un modelo lineal."""
+    vectorizer_header, vectorizer_arrays = _export_vectorizer(scorer.vectorizer)
+    write_artifact(
+        path,
+        {'kind': 'linear', 'classes': list(scorer.classes), 'vectorizer': vectorizer_header},
+        {**vectorizer_arrays, 'coef_by_feature': scorer.coef_by_feature, 'intercept': scorer.intercept},
+    )
+
+
+def load_linear(path: Path, mmap_mode: Optional[str] = None) -> CompiledLinearScorer:
+    header, arrays = _read_kind(path, 'linear', mmap_mode)
+    return CompiledLinearScorer(
+        _import_vectorizer(header['vectorizer'], arrays),
+        # coef_by_feature ya es contiguo: el scorer lo usa sin copiarlo
+        arrays['coef_by_feature'].T,
+        arrays['intercept'],
+        header['classes'],
+    )
+
+
+def save_forest(vectorizer: CompiledTfidfVectorizer, forest: FlatForest, classes: List[str], path: Path) -> None:
+    """Guarda el vectorizador y los arrays del bosque aplanado."""
+    vectorizer_header, vectorizer_arrays = _export_vectorizer(vectorizer)
+    forest_arrays = forest._arrays()
+    write_artifact(
+        path,
+        {
+            'kind': 'forest',
+            'classes': list(classes),
+            'vectorizer': vectorizer_header,
+            'max_depth': forest_arrays.pop('max_depth'),
+            'n_features': forest_arrays.pop('n_features'),
+        },
+        {**vectorizer_arrays, **forest_arrays},
+    )
+
+
+def load_forest(path: Path, mmap_mode: Optional[str] = None) -> Tuple[CompiledTfidfVectorizer, FlatForest, List[str]]:
+    header, arrays = _read_kind(path, 'forest', mmap_mode)
+    vectorizer = _import_vectorizer(header['vectorizer'], arrays)
+    forest = FlatForest(
+        feature=arrays['feature'],
+        threshold=arrays['threshold'],
+        children_left=arrays['children_left'],
+        children_right=arrays['children_right'],
+        value=arrays['value'],
+        roots=arrays['roots'],
+        max_depth=header['max_depth'],
+        n_features=header['n_features'],
+    )
+    return vectorizer, forest, header['classes']
+
+
+def _read_kind(path: Path, kind: str, mmap_mode: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    header, arrays = read_artifact(path, mmap_mode)
+    if header.get('kind') != kind:
+        raise ValueError(f"{path} es un artefacto '{header.get('kind')}', se esperaba '{kind}'")
+    return header, arrays
+
+
+def _export_vectorizer(vectorizer: CompiledTfidfVectorizer) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    normalizer = _normalizer_of(vectorizer)
+    if normalizer is None and (vectorizer.preprocessor is not None or vectorizer.tokenizer is not None):
+        raise ValueError("No se puede exportar un vectorizador con preprocessor o tokenizer propios")
+
+    # El vocabulario se guarda como la lista de términos ordenada por índice
+    terms = [""] * len(vectorizer.vocabulary)
+    for term, index in vectorizer.vocabulary.items():
+        terms[index] = term
+
+    header = {
+        'terms': terms,
+        'ngram_range': list(vectorizer.ngram_range),
+        'lowercase': vectorizer.lowercase,
+        'strip_accents': vectorizer.strip_accents,
+        'token_pattern': vectorizer.token_pattern,
+        'stop_words': sorted(vectorizer.stop_words) if vectorizer.stop_words else None,
+        'norm': vectorizer.norm,
+        'sublinear_tf': vectorizer.sublinear_tf,
+        'normalizer': normalizer.get_params() if normalizer is not None else None,
+    }
+    return header, {'idf': vectorizer.idf}
+
+
+def _normalizer_of(vectorizer: CompiledTfidfVectorizer) -> Optional[TextNormalizer]:
+    """El TextNormalizer si el tokenizer es el suyo (como en build_tfidf); si no, None."""
+    normalizer = getattr(vectorizer.tokenizer, '__self__', None)
+    if isinstance(normalizer, TextNormalizer) and vectorizer.preprocessor is None and vectorizer.tokenizer == normalizer.tokenize:
+        return normalizer
+    return None
+
+
+def _import_vectorizer(header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> CompiledTfidfVectorizer:
+    normalizer = TextNormalizer(**header['normalizer']) if header.get('normalizer') else None
+    return CompiledTfidfVectorizer(
+        vocabulary={term: index for index, term in enumerate(header['terms'])},
+        idf=arrays['idf'],
+        ngram_range=tuple(header['ngram_range']),
+        lowercase=header['lowercase'],
+        strip_accents=header['strip_accents'],
+        token_pattern=header['token_pattern'],
+        stop_words=frozenset(header['stop_words']) if header['stop_words'] else None,
+        norm=header['norm'],
+        sublinear_tf=header['sublinear_tf'],
+        tokenizer=normalizer.tokenize if normalizer is not None else None,
+    )
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -1,10 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+SENTIMENTS = ['positivo', 'neutral', 'negativo']
 
 
 class Model(ABC):
     """Interfaz para modelos de clasificación de sentimiento."""
     
+    # Nombre con el que se reportan las métricas del modelo
+    name = "model"
+    
     @abstractmethod
     def predict(self, texts: List[str]) -> List[str]:
         """Predice el sentimiento para una lista de textos."""
@@ -13,4 +21,36 @@ class Model(ABC):
     @abstractmethod
     def predict_proba(self, texts: List[str]) -> List[List[float]]:
         """Retorna probabilidades de cada clase para una lista de textos."""
-        pass
\ No newline at end of file
+        pass
+    
+    @property
+    def classes(self) -> List[str]:
+        """Clases en el orden de las columnas de predict_proba."""
+        return SENTIMENTS
+    
+    def predict_with_proba(self, texts: List[str]) -> Tuple[List[str], List[Dict[str, float]]]:
+        """
+        Retorna el sentimiento y las probabilidades por clase de cada texto.
+        
+        Si el modelo implementa `_predict_proba`, se resuelve con una sola
+        pasada: el sentimiento es la clase más probable. Si no, se llama a
+        predict y predict_proba.
+        """
+        probas = self._predict_proba(texts)
+        if probas is None:
+            sentiments = self.predict(texts)
+            probas = self.predict_proba(texts)
+        else:
+            sentiments = np.asarray(self.classes)[probas.argmax(axis=1)].tolist()
+            probas = probas.tolist()
+        
+        classes = self.classes
+        confidences = [dict(zip(classes, map(float, row))) for row in probas]
+        return sentiments, confidences
+    
+    def _predict_proba(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Probabilidades como array (textos x clases, en el orden de `classes`),
+        o None si el modelo no las calcula así.
+        """
+        return None
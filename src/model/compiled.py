@@ -0,0 +1,201 @@
+import re
+import unicodedata
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+
+def strip_accents_unicode(text: str) -> str:
+    """Igual que `strip_accents='unicode'` de sklearn."""
+    normalized = unicodedata.normalize("NFKD", text)
+    if normalized == text:
+        return text
+    return "".join(char for char in normalized if not unicodedata.combining(char))
+
+
+class CompiledTfidfVectorizer:
+    """
+    TF-IDF sin sklearn a partir de un TfidfVectorizer ya entrenado.
+
+    Reproduce su preprocesado, tokenización y n-gramas, pero solo cuenta los
+    términos del vocabulario y devuelve los pesos de cada texto como arrays
+    (índices, valores), sin validaciones ni matrices dispersas de por medio.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        ngram_range: Tuple[int, int] = (1, 1),
+        lowercase: bool = True,
+        strip_accents: Optional[str] = None,
+        token_pattern: str = r"(?u)\b\w\w+\b",
+        stop_words: Optional[FrozenSet[str]] = None,
+        norm: Optional[str] = "l2",
+        sublinear_tf: bool = False,
+        preprocessor: Optional[Callable[[str], str]] = None,
+        tokenizer: Optional[Callable[[str], List[str]]] = None,
+    ):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.strip_accents = strip_accents
+        self.token_pattern = token_pattern
+        self.stop_words = stop_words
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.preprocessor = preprocessor
+        self.tokenizer = tokenizer
+        self._token_regex = re.compile(token_pattern) if token_pattern else None
+
+    @property
+    def n_features(self) -> int:
+        return len(self.idf)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer) -> "CompiledTfidfVectorizer":
+        """Exporta un TfidfVectorizer entrenado. Lanza ValueError si usa opciones no soportadas."""
+        if vectorizer.analyzer != "word":
+            raise ValueError(f"analyzer no soportado: {vectorizer.analyzer}")
+        if vectorizer.strip_accents not in (None, "unicode"):
+            raise ValueError(f"strip_accents no soportado: {vectorizer.strip_accents}")
+        if vectorizer.binary or not vectorizer.use_idf or vectorizer.norm not in (None, "l2"):
+            raise ValueError("Solo se soporta TF-IDF con idf y norma l2 o sin norma")
+        if vectorizer.tokenizer is None and re.compile(vectorizer.token_pattern).groups > 1:
+            raise ValueError("token_pattern con más de un grupo no soportado")
+
+        stop_words = vectorizer.get_stop_words()
+        return cls(
+            vocabulary=vectorizer.vocabulary_,
+            idf=vectorizer.idf_,
+            ngram_range=vectorizer.ngram_range,
+            lowercase=vectorizer.lowercase,
+            strip_accents=vectorizer.strip_accents,
+            token_pattern=vectorizer.token_pattern,
+            stop_words=frozenset(stop_words) if stop_words else None,
+            norm=vectorizer.norm,
+            sublinear_tf=vectorizer.sublinear_tf,
+            preprocessor=vectorizer.preprocessor,
+            tokenizer=vectorizer.tokenizer,
+        )
+
+    def analyze(self, text: str) -> List[str]:
+        """Términos del texto (tokens y n-gramas), como `build_analyzer()` de sklearn."""
+        if self.preprocessor is not None:
+            text = self.preprocessor(text)
+        else:
+            if self.lowercase:
+                text = text.lower()
+            if self.strip_accents == "unicode":
+                text = strip_accents_unicode(text)
+
+        tokens = self.tokenizer(text) if self.tokenizer is not None else self._token_regex.findall(text)
+        if self.stop_words:
+            tokens = [token for token in tokens if token not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            for i in range(len(tokens) - n + 1):
+                terms.append(" ".join(tokens[i:i + n]))
+        return terms
+
+    def features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Índices y pesos TF-IDF de los términos del texto que están en el vocabulario."""
+        counts: Dict[int, int] = {}
+        vocabulary = self.vocabulary
+        for term in self.analyze(text):
+            index = vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        indexes = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.sublinear_tf:
+            weights = np.log(weights) + 1
+        weights *= self.idf[indexes]
+
+        if self.norm == "l2" and len(weights):
+            weights /= np.sqrt(np.dot(weights, weights))
+        return indexes, weights
+
+    def dense(self, texts: List[str], dtype=np.float64) -> np.ndarray:
+        """Matriz densa (textos, features) con los pesos, como `transform(texts).toarray()` de sklearn."""
+        X = np.zeros((len(texts), self.n_features), dtype=dtype)
+        for row, text in enumerate(texts):
+            indexes, weights = self.features(text)
+            X[row, indexes] = weights
+        return X
+
+
+class CompiledLinearScorer:
+    """
+    Scoring de una regresión logística como producto disperso + softmax.
+
+    Guarda los coeficientes por feature (n_features, n_classes), así cada
+    texto se puntúa indexando solo las filas de sus términos.
+    """
+
+    def __init__(
+        self,
+        vectorizer: CompiledTfidfVectorizer,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+        classes: List[str],
+    ):
+        self.vectorizer = vectorizer
+        self.coef_by_feature = np.ascontiguousarray(np.asarray(coef).T)
+        self.intercept = np.asarray(intercept)
+        self.classes = list(classes)
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "CompiledLinearScorer":
+        """Exporta un Pipeline TfidfVectorizer + LogisticRegression. Lanza ValueError si no es compatible."""
+        if len(pipeline.steps) != 2:
+            raise ValueError("Se espera un pipeline TF-IDF + clasificador")
+        vectorizer, classifier = pipeline[0], pipeline[-1]
+        if not hasattr(vectorizer, "idf_") or not hasattr(classifier, "coef_"):
+            raise ValueError("El pipeline no es TF-IDF + modelo lineal")
+        if getattr(classifier, "multi_class", "auto") == "ovr" and len(classifier.classes_) > 2:
+            raise ValueError("multi_class='ovr' no soportado")
+
+        return cls(
+            CompiledTfidfVectorizer.from_sklearn(vectorizer),
+            classifier.coef_,
+            classifier.intercept_,
+            classifier.classes_.tolist(),
+        )
+
+    def transform(self, texts: List[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Índices y pesos TF-IDF de cada texto."""
+        return [self.vectorizer.features(text) for text in texts]
+
+    def decision_function(self, texts: List[str]) -> np.ndarray:
+        return self._decision_function(self.transform(texts))
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        return self.score(self.transform(texts))
+
+    def score(self, features: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Probabilidades por clase a partir de la salida de `transform`."""
+        scores = self._decision_function(features)
+
+        if scores.shape[1] == 1:
+            # Caso binario: sigmoide sobre la única columna
+            positive = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def _decision_function(self, features: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        scores = np.empty((len(features), self.coef_by_feature.shape[1]))
+        for row, (indexes, weights) in enumerate(features):
+            scores[row] = weights @ self.coef_by_feature[indexes] + self.intercept
+        return scores
@@ -0,0 +1,72 @@
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Lock exclusivo entre procesos sobre un archivo.
+
+    Usa flock (Linux/macOS) o msvcrt.locking (Windows), así que el sistema
+    operativo lo libera si el proceso muere y no quedan locks colgados.
+    """
+
+    def __init__(self, path: Path, timeout: Optional[float] = None, poll_interval: float = 0.1):
+        self._path = Path(path)
+        self._timeout = timeout
+        self._poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT)
+        started = time.monotonic()
+
+        while True:
+            try:
+                self._lock(fd)
+                self._fd = fd
+                return
+            except OSError:
+                if self._timeout is not None and time.monotonic() - started >= self._timeout:
+                    os.close(fd)
+                    raise TimeoutError(f"No se pudo tomar el lock {self._path}") from None
+                time.sleep(self._poll_interval)
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            self._unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    @staticmethod
+    def _lock(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    @staticmethod
+    def _unlock(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
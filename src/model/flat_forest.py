@@ -0,0 +1,193 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.model.training import dump_atomic
+from src.settings import FLAT_FOREST_CHUNK_ROWS, FLAT_FOREST_PARALLEL_MIN_ROWS
+
+
+def flat_path(model_path: Path) -> Path:
+    """Archivo del bosque aplanado que acompaña a un .pkl de Random Forest."""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.stem + ".flat.joblib")
+
+
+class FlatForest:
+    """
+    Random Forest aplanado en arrays contiguos de numpy.
+
+    Los nodos de todos los árboles van en los mismos arrays (feature,
+    threshold, hijos y probabilidades por clase) y las hojas apuntan a sí
+    mismas, así un lote de filas se evalúa en todos los árboles a la vez
+    avanzando `max_depth` pasos vectorizados, sin un árbol por vez ni joblib.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children_left: np.ndarray,
+        children_right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        n_features: int,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        # Los threads se crean recién cuando llega un lote grande
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="flat-forest")
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_classes(self) -> int:
+        return self.value.shape[1]
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "FlatForest":
+        """Aplana un RandomForestClassifier entrenado (una sola salida)."""
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Solo se soportan bosques de una salida")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+
+            # Igual que DecisionTreeClassifier.predict_proba: cada nodo normalizado a probabilidades
+            value = tree.value[:, 0, :]
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0] = 1
+            values.append(value / normalizer)
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children_left=np.concatenate(lefts).astype(np.intp),
+            children_right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            n_features=forest.n_features_in_,
+        )
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Promedio de las probabilidades de todos los árboles para cada fila.
+
+        `X` es denso (n_filas, n_features). Los lotes chicos se evalúan en el
+        thread actual; los grandes se parten en chunks de filas que se
+        reparten entre threads.
+        """
+        # Los árboles de sklearn comparan en float32
+        X = np.asarray(X, dtype=np.float32)
+        chunks = [X[start:start + FLAT_FOREST_CHUNK_ROWS] for start in range(0, X.shape[0], FLAT_FOREST_CHUNK_ROWS)]
+        if not chunks:
+            return np.empty((0, self.n_classes))
+
+        n_jobs = self.n_jobs_for(X.shape[0])
+        if n_jobs == 1:
+            return np.concatenate([self._predict_chunk(chunk) for chunk in chunks])
+
+        # Cada thread recorre un grupo contiguo de chunks
+        groups = [list(group) for group in np.array_split(np.arange(len(chunks)), n_jobs)]
+        results = self._executor.map(lambda group: [self._predict_chunk(chunks[i]) for i in group], groups)
+        return np.concatenate([proba for group in results for proba in group])
+
+    @staticmethod
+    def n_jobs_for(n_rows: int) -> int:
+        """Threads a usar según el tamaño del lote: uno solo para lotes chicos."""
+        if n_rows < FLAT_FOREST_PARALLEL_MIN_ROWS:
+            return 1
+        n_chunks = -(-n_rows // FLAT_FOREST_CHUNK_ROWS)
+        return max(1, min(os.cpu_count() or 1, n_chunks))
+
+    def tree_probas(self, X: np.ndarray) -> np.ndarray:
+        """Probabilidades de cada árbol por separado: (n_filas, n_árboles, n_clases)."""
+        X = np.asarray(X, dtype=np.float32)
+        return self.value[self._leaves(X)]
+
+    def subset(self, trees: np.ndarray) -> "FlatForest":
+        """
+        Bosque con solo los árboles indicados, con sus nodos copiados a arrays
+        nuevos (más chicos). Los árboles de cada uno ocupan un rango contiguo
+        de nodos, que termina donde empieza el siguiente.
+        """
+        ends = np.append(self.roots[1:], len(self.feature))
+        ranges = [np.arange(self.roots[tree], ends[tree]) for tree in trees]
+        nodes = np.concatenate(ranges)
+        # Posición nueva de cada nodo conservado, para reescribir los hijos
+        remap = np.full(len(self.feature), -1, dtype=np.intp)
+        remap[nodes] = np.arange(len(nodes))
+        return FlatForest(
+            feature=self.feature[nodes],
+            threshold=self.threshold[nodes],
+            children_left=remap[self.children_left[nodes]].astype(self.children_left.dtype),
+            children_right=remap[self.children_right[nodes]].astype(self.children_right.dtype),
+            value=self.value[nodes],
+            roots=np.cumsum([0] + [len(r) for r in ranges[:-1]]).astype(self.roots.dtype),
+            max_depth=self.max_depth,
+            n_features=self.n_features,
+        )
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        return self.value[self._leaves(X)].mean(axis=1)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Hoja a la que llega cada fila en cada árbol: (n_filas, n_árboles)."""
+        # Índices planos sobre X: `take` en 1-D es más barato que indexar por (fila, feature)
+        X = np.ascontiguousarray(X)
+        values = X.ravel()
+        row_offsets = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+
+        for _ in range(self.max_depth):
+            go_left = values.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes)
+            nodes = np.where(go_left, self.children_left.take(nodes), self.children_right.take(nodes))
+        return nodes
+
+    def save(self, path: Path) -> None:
+        """Guarda los arrays (se pueden cargar con mmap_mode) de forma atómica."""
+        dump_atomic(self._arrays(), path)
+
+    @classmethod
+    def load(cls, path: Path, mmap_mode: Optional[str] = None) -> "FlatForest":
+        import joblib
+
+        return cls(**joblib.load(path, mmap_mode=mmap_mode))
+
+    def _arrays(self) -> Dict:
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'children_left': self.children_left,
+            'children_right': self.children_right,
+            'value': self.value,
+            'roots': self.roots,
+            'max_depth': self.max_depth,
+            'n_features': self.n_features,
+        }
@@ -0,0 +1,178 @@
+import copy
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from src.metrics import SCORE_SECONDS, VECTORIZE_SECONDS
+from src.model.base import Model, SENTIMENTS
+from src.model.training import dump_atomic
+from src.settings import INCREMENTAL_N_FEATURES, TRAIN_CHUNK_SIZE
+
+# pandas, sklearn y joblib se importan al usarlos (al leer el .pkl se importa sklearn igual)
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.pipeline import Pipeline
+
+# Mismo orden que classes_ de los otros modelos (alfabético)
+CLASSES = sorted(SENTIMENTS)
+
+# Porcentaje de filas que no se usan para entrenar (como el test_size=0.2 de los otros modelos)
+HOLDOUT_PERCENT = 20
+
+
+class IncrementalModel(Model):
+    """
+    Implementación de Model que se entrena por chunks, sin cargar el dataset.
+
+    Usa un HashingVectorizer (no necesita ver todos los textos para armar un
+    vocabulario) y un SGDClassifier con log_loss entrenado con partial_fit,
+    así la memoria queda acotada por el tamaño del chunk. El entrenamiento
+    guarda un checkpoint después de cada chunk para poder retomarlo, y un
+    modelo existente se puede actualizar solo con los datos nuevos.
+    """
+
+    name = "incremental"
+
+    def __init__(self, pipeline: "Pipeline", rows_seen: int = 0):
+        self._pipeline = pipeline
+        self.rows_seen = rows_seen
+        self._vectorize_seconds = VECTORIZE_SECONDS.labels(model=self.name)
+        self._score_seconds = SCORE_SECONDS.labels(model=self.name)
+
+    def predict(self, texts: List[str]) -> List[str]:
+        X = self._vectorize(texts)
+        with self._score_seconds.time():
+            return self._pipeline[-1].predict(X).tolist()
+
+    def predict_proba(self, texts: List[str]) -> List[List[float]]:
+        return self._predict_proba(texts).tolist()
+
+    @property
+    def classes(self) -> List[str]:
+        return self._pipeline.classes_.tolist()
+
+    def _predict_proba(self, texts: List[str]):
+        X = self._vectorize(texts)
+        with self._score_seconds.time():
+            return self._pipeline[-1].predict_proba(X)
+
+    def _vectorize(self, texts: List[str]):
+        with self._vectorize_seconds.time():
+            return self._pipeline[0].transform(texts)
+
+    @classmethod
+    def load(cls, path: Path, mmap_mode: Optional[str] = None) -> "IncrementalModel":
+        """Carga un modelo desde un archivo .pkl (ver LogisticRegressionModel.load)."""
+        import joblib
+
+        state = joblib.load(path, mmap_mode=mmap_mode)
+        return cls(state['pipeline'], state['rows_seen'])
+
+    @classmethod
+    def train(
+        cls,
+        data_path: str,
+        output_path: str,
+        chunksize: int = TRAIN_CHUNK_SIZE,
+        resume: bool = True,
+    ) -> "IncrementalModel":
+        """
+        Entrena un modelo nuevo leyendo `data_path` de a `chunksize` filas.
+
+        Si el entrenamiento anterior sobre el mismo archivo se cortó, con
+        resume=True se retoma desde su último checkpoint.
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import Pipeline
+
+        pipeline = Pipeline([
+            ('hashing', HashingVectorizer(
+                n_features=INCREMENTAL_N_FEATURES, ngram_range=(1, 2), alternate_sign=False
+            )),
+            ('classifier', SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)),
+        ])
+        return cls._fit(pipeline, 0, data_path, output_path, chunksize, resume)
+
+    def update(
+        self,
+        data_path: str,
+        output_path: str,
+        chunksize: int = TRAIN_CHUNK_SIZE,
+        resume: bool = True,
+    ) -> "IncrementalModel":
+        """
+        Sigue entrenando el modelo solo con los datos de `data_path` (por
+        ejemplo, los comentarios del último día) y lo guarda en `output_path`.
+
+        Retorna un modelo nuevo: este no se modifica, así se puede seguir
+        usando mientras se actualiza.
+        """
+        pipeline = copy.deepcopy(self._pipeline)
+        return self._fit(pipeline, self.rows_seen, data_path, output_path, chunksize, resume)
+
+    @classmethod
+    def _fit(
+        cls,
+        pipeline: "Pipeline",
+        rows_seen: int,
+        data_path: str,
+        output_path: str,
+        chunksize: int,
+        resume: bool,
+    ) -> "IncrementalModel":
+        import joblib
+        import pandas as pd
+
+        checkpoint_path = Path(f"{output_path}.checkpoint")
+        rows_done = 0
+        initial_rows_seen = rows_seen
+
+        if resume and checkpoint_path.exists():
+            checkpoint = joblib.load(checkpoint_path)
+            if checkpoint['data_path'] == str(data_path):
+                pipeline = checkpoint['pipeline']
+                rows_seen = checkpoint['rows_seen']
+                rows_done = checkpoint['rows_done']
+
+        vectorizer, classifier = pipeline[0], pipeline[-1]
+        reader = pd.read_csv(
+            data_path,
+            chunksize=chunksize,
+            usecols=['message', 'sentiment'],
+            skiprows=range(1, rows_done + 1),
+        )
+        with reader:
+            for chunk in reader:
+                rows = _training_rows(chunk).sample(frac=1, random_state=rows_done % 2**32)
+                if len(rows):
+                    X = vectorizer.transform(rows['message'])
+                    classifier.partial_fit(X, rows['sentiment'], classes=CLASSES)
+                    rows_seen += len(rows)
+
+                rows_done += len(chunk)
+                dump_atomic({
+                    'pipeline': pipeline,
+                    'rows_seen': rows_seen,
+                    'rows_done': rows_done,
+                    'data_path': str(data_path),
+                }, checkpoint_path)
+
+        if rows_seen == initial_rows_seen:
+            raise ValueError(f"No hay filas para entrenar en {data_path}")
+
+        dump_atomic({'pipeline': pipeline, 'rows_seen': rows_seen}, output_path)
+        checkpoint_path.unlink(missing_ok=True)
+
+        return cls(pipeline, rows_seen)
+
+
+def _training_rows(chunk: "pd.DataFrame") -> "pd.DataFrame":
+    """Filas con texto y sentimiento válidos, sin las reservadas para evaluar."""
+    import pandas as pd
+
+    chunk = chunk.dropna()
+    chunk = chunk[chunk['sentiment'].isin(CLASSES)]
+    # La separación depende solo del texto: es la misma en cada chunk, reintento o actualización
+    holdout = pd.util.hash_pandas_object(chunk['message'], index=False) % 100 < HOLDOUT_PERCENT
+    return chunk[~holdout.to_numpy()]
+
@@ -1,52 +1,146 @@
-import joblib
+import logging
+import time
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
+import numpy as np
 
+from src.metrics import SCORE_SECONDS, VECTORIZE_SECONDS
+from src.model.artifact import artifact_path, current_artifact, load_linear, save_linear, stamp
 from src.model.base import Model
+from src.model.compiled import CompiledLinearScorer
+from src.model.training import build_tfidf, dump_atomic, split_dataset
+
+# sklearn y joblib se importan solo para entrenar o leer un .pkl
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
 
 class LogisticRegressionModel(Model):
     """
     Implementación de Model usando sklearn Pipeline.
+    
+    Con compiled=True la inferencia no pasa por sklearn: se usa un
+    CompiledLinearScorer exportado del pipeline (mismo resultado, menos
+    overhead por llamada). Si el pipeline no es compatible se usa sklearn.
+    
+    Cargado desde el artefacto compacto no hay pipeline: solo el scorer.
     """
     
-    def __init__(self, pipeline: Pipeline):
-        self._pipeline: Pipeline = pipeline
+    name = "logistic_regression"
+    
+    def __init__(self, pipeline: Optional["Pipeline"], compiled: bool = False, scorer: Optional[CompiledLinearScorer] = None):
+        if pipeline is None and scorer is None:
+            raise ValueError("Se necesita un pipeline o un scorer compilado")
+        self._pipeline = pipeline
+        self._scorer: Optional[CompiledLinearScorer] = scorer or (self._compile(pipeline) if compiled else None)
+        self._classes = np.asarray(pipeline.classes_ if pipeline is not None else self._scorer.classes)
+        self._vectorize_seconds = VECTORIZE_SECONDS.labels(model=self.name)
+        self._score_seconds = SCORE_SECONDS.labels(model=self.name)
+    
+    @property
+    def is_compiled(self) -> bool:
+        return self._scorer is not None
     
     def predict(self, texts: List[str]) -> List[str]:
-        return self._pipeline.predict(texts).tolist()
+        if self._scorer is None:
+            X = self._vectorize(texts)
+            with self._score_seconds.time():
+                return self._pipeline[-1].predict(X).tolist()
+        return self._classes[self._predict_proba(texts).argmax(axis=1)].tolist()
     
     def predict_proba(self, texts: List[str]) -> List[List[float]]:
-        return self._pipeline.predict_proba(texts).tolist()
+        return self._predict_proba(texts).tolist()
+    
+    @property
+    def classes(self) -> List[str]:
+        return self._classes.tolist()
+    
+    def _predict_proba(self, texts: List[str]):
+        X = self._vectorize(texts)
+        with self._score_seconds.time():
+            if self._scorer is None:
+                return self._pipeline[-1].predict_proba(X)
+            return self._scorer.score(X)
+    
+    def _vectorize(self, texts: List[str]):
+        with self._vectorize_seconds.time():
+            if self._scorer is None:
+                return self._pipeline[0].transform(texts)
+            return self._scorer.transform(texts)
+    
+    @staticmethod
+    def _compile(pipeline: "Pipeline") -> Optional[CompiledLinearScorer]:
+        try:
+            return CompiledLinearScorer.from_pipeline(pipeline)
+        except ValueError as e:
+            logger.warning("No se puede compilar el modelo, se usa sklearn: %s", e)
+            return None
     
     @classmethod
-    def load(cls, path: Path) -> "LogisticRegressionModel":
-        """Carga un modelo desde un archivo .pkl"""
-        pipeline = joblib.load(path)
-        return cls(pipeline)
+    def load(
+        cls, path: Path, mmap_mode: Optional[str] = None, compiled: bool = False, artifact: bool = False
+    ) -> "LogisticRegressionModel":
+        """
+        Carga un modelo desde un archivo .pkl
+        
+        Con mmap_mode='r' los arrays de numpy se mapean desde el archivo en
+        lugar de copiarse, y los procesos que cargan el mismo .pkl comparten
+        esas páginas de memoria. Con compiled=True se usa el scorer compilado.
+        
+        Con artifact=True se carga el artefacto compacto guardado junto al
+        .pkl (solo numpy, sin importar sklearn), si existe y corresponde al
+        .pkl actual; si no, se usa el .pkl.
+        """
+        compact_path = current_artifact(path) if artifact else None
+        if compact_path is not None:
+            return cls(None, scorer=load_linear(compact_path, mmap_mode=mmap_mode))
+        if artifact:
+            logger.info("No hay un artefacto actualizado para %s, se usa el .pkl", path)
+        
+        import joblib
+        
+        pipeline = joblib.load(path, mmap_mode=mmap_mode)
+        return cls(pipeline, compiled=compiled)
     
     @classmethod
     def train(cls, data_path: str, output_path: str) -> "LogisticRegressionModel":
         """Entrena y guarda el modelo."""
-        df = pd.read_csv(data_path)
-        X, y = df['message'], df['sentiment']
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
         
-        X_train, _, y_train, _ = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
+        X_train, _, y_train, _ = split_dataset(data_path)
         
         pipeline = Pipeline([
-            ('tfidf', TfidfVectorizer(max_features=5000, ngram_range=(1, 2))),
+            ('tfidf', build_tfidf(max_features=5000, ngram_range=(1, 2))),
             ('classifier', LogisticRegression(max_iter=1000))
         ])
         pipeline.fit(X_train, y_train)
         
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump(pipeline, output_path)
+        model = cls(pipeline)
+        model.save(output_path)
+        return model
+    
+    def save(self, output_path: str) -> None:
+        """
+        Guarda el pipeline en un .pkl (reemplazándolo de forma atómica) y, al
+        lado, el artefacto compacto con el que se sirve.
+        """
+        if self._pipeline is None:
+            raise ValueError("El modelo se cargó desde un artefacto: no hay pipeline para guardar")
+        
+        # El artefacto se escribe antes que el .pkl, que es el que se vigila para recargar
+        compact_path = artifact_path(output_path)
+        try:
+            save_linear(self._scorer or CompiledLinearScorer.from_pipeline(self._pipeline), compact_path)
+            exported = True
+        except ValueError as e:
+            logger.warning("No se puede exportar el artefacto, se servirá desde el .pkl: %s", e)
+            exported = False
         
-        return cls(pipeline)
\ No newline at end of file
+        # El artefacto toma la versión antes de que aparezca el .pkl, que llega ya con el mismo mtime
+        version = time.time_ns()
+        if exported:
+            stamp(compact_path, version)
+        dump_atomic(self._pipeline, output_path, mtime_ns=version)
\ No newline at end of file
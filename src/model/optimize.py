@@ -0,0 +1,262 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.model.artifact import (
+    artifact_path,
+    load_forest,
+    load_linear,
+    save_forest,
+    save_linear,
+    stamp,
+)
+from src.model.compiled import CompiledLinearScorer, CompiledTfidfVectorizer
+from src.model.flat_forest import FlatForest
+from src.model.logistic_regression_model import LogisticRegressionModel
+from src.model.random_forest_model import RandomForestModel
+from src.model.training import split_dataset
+from src.settings import (
+    DATA_PATH,
+    LOGISTIC_REGRESSION_MODEL_PATH,
+    OPTIMIZE_ACCURACY_TOLERANCE,
+    OPTIMIZE_KEEP_FRACTIONS,
+    OPTIMIZE_LATENCY_SAMPLE,
+    RANDOM_FOREST_MODEL_PATH,
+)
+
+MODEL_PATHS = {
+    'logistic_regression': LOGISTIC_REGRESSION_MODEL_PATH,
+    'random_forest': RANDOM_FOREST_MODEL_PATH,
+}
+
+
+def optimize_model(
+    model: str,
+    model_path: Optional[Path] = None,
+    data_path: str = DATA_PATH,
+    tolerance: float = OPTIMIZE_ACCURACY_TOLERANCE,
+    trim_trees: bool = False,
+    output_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Achica el artefacto con el que se sirve un modelo ya entrenado.
+
+    - Regresión Logística: saca del vocabulario los términos con pesos más
+      cercanos a cero (la menor cantidad de términos que mantiene la
+      accuracy) y guarda pesos e idf en float32.
+    - Random Forest: guarda las probabilidades de las hojas en float32 y los
+      índices de nodos en int32 y, con trim_trees=True, se queda con el
+      menor subconjunto de árboles que mantiene la accuracy.
+
+    "Mantener la accuracy" es no perder más de `tolerance` sobre el split de
+    test que ya separa `train`. Sin `output_path` el artefacto reemplaza al
+    que se sirve junto al .pkl (la API lo recarga sola). Retorna un reporte
+    con tamaño, latencia y accuracy antes y después.
+    """
+    if model not in MODEL_PATHS:
+        raise ValueError(f"Modelo desconocido: {model}")
+    model_path = Path(model_path or MODEL_PATHS[model])
+    if not model_path.exists():
+        raise FileNotFoundError(f"No existe el modelo {model_path}: entrenalo primero")
+
+    _, texts, _, labels = split_dataset(data_path)
+    texts, labels = texts.tolist(), labels.to_numpy()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # El "antes" es el artefacto completo que genera `save`, medido igual que el optimizado
+        baseline_path = Path(tmp_dir) / "baseline.artifact"
+        optimized_path = Path(tmp_dir) / "optimized.artifact"
+        if model == 'logistic_regression':
+            scorer = CompiledLinearScorer.from_pipeline(LogisticRegressionModel.load(model_path)._pipeline)
+            save_linear(scorer, baseline_path)
+            optimized, details = prune_linear(scorer, texts, labels, tolerance)
+            save_linear(optimized, optimized_path)
+        else:
+            pipeline = RandomForestModel.load(model_path)._pipeline
+            vectorizer = CompiledTfidfVectorizer.from_sklearn(pipeline[0])
+            forest = FlatForest.from_sklearn(pipeline[-1])
+            classes = pipeline.classes_.tolist()
+            save_forest(vectorizer, forest, classes, baseline_path)
+            optimized, details = compact_forest(forest, vectorizer, classes, texts, labels, tolerance, trim_trees)
+            save_forest(vectorizer, optimized, classes, optimized_path)
+
+        before = _measure(model, baseline_path, texts, labels)
+        after = _measure(model, optimized_path, texts, labels)
+
+        output_path = Path(output_path) if output_path else artifact_path(model_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(optimized_path, output_path)
+
+    if output_path == artifact_path(model_path):
+        # Un mtime nuevo en el .pkl hace que el registry recargue: el artefacto lo toma primero, así ya es el actual
+        version = time.time_ns()
+        stamp(output_path, version)
+        stamp(model_path, version)
+
+    return {
+        'model': model,
+        'path': str(output_path),
+        'tolerance': tolerance,
+        'before': {**before, **details['before']},
+        'after': {**after, **details['after']},
+    }
+
+
+def prune_linear(
+    scorer: CompiledLinearScorer,
+    texts: List[str],
+    labels: np.ndarray,
+    tolerance: float,
+    keep_fractions: List[float] = OPTIMIZE_KEEP_FRACTIONS,
+) -> Tuple[CompiledLinearScorer, Dict[str, Dict[str, int]]]:
+    """
+    El scorer en float32 con la menor fracción de `keep_fractions` de los
+    términos de mayor peso (el máximo |coef| entre clases) cuya accuracy no
+    cae más de `tolerance`. Si ninguna alcanza, se conservan todos. La
+    fracción se elige y se reporta sobre el mismo split de prueba, así que
+    esa accuracy es algo optimista.
+    """
+    n_features = scorer.coef_by_feature.shape[0]
+    target = _accuracy(scorer.predict_proba(texts), scorer.classes, labels) - tolerance
+    ranking = np.argsort(-np.abs(scorer.coef_by_feature).max(axis=1), kind="stable")
+
+    pruned = linear_subset(scorer, np.arange(n_features))
+    for fraction in sorted(keep_fractions):
+        candidate = linear_subset(scorer, ranking[:max(1, int(np.ceil(fraction * n_features)))])
+        if _accuracy(candidate.predict_proba(texts), candidate.classes, labels) >= target:
+            pruned = candidate
+            break
+
+    return pruned, {
+        'before': {'features': n_features},
+        'after': {'features': pruned.coef_by_feature.shape[0]},
+    }
+
+
+def linear_subset(scorer: CompiledLinearScorer, keep: np.ndarray) -> CompiledLinearScorer:
+    """Scorer en float32 con solo los términos `keep` (renumerados en el orden del vocabulario)."""
+    keep = np.sort(keep)
+    new_index = {int(old): new for new, old in enumerate(keep)}
+    source = scorer.vectorizer
+    vectorizer = CompiledTfidfVectorizer(
+        vocabulary={term: new_index[index] for term, index in source.vocabulary.items() if index in new_index},
+        idf=source.idf[keep].astype(np.float32),
+        ngram_range=source.ngram_range,
+        lowercase=source.lowercase,
+        strip_accents=source.strip_accents,
+        token_pattern=source.token_pattern,
+        stop_words=source.stop_words,
+        norm=source.norm,
+        sublinear_tf=source.sublinear_tf,
+        preprocessor=source.preprocessor,
+        tokenizer=source.tokenizer,
+    )
+    return CompiledLinearScorer(
+        vectorizer,
+        scorer.coef_by_feature[keep].T.astype(np.float32),
+        scorer.intercept.astype(np.float32),
+        scorer.classes,
+    )
+
+
+def compact_forest(
+    forest: FlatForest,
+    vectorizer: CompiledTfidfVectorizer,
+    classes: List[str],
+    texts: List[str],
+    labels: np.ndarray,
+    tolerance: float,
+    trim_trees: bool = False,
+) -> Tuple[FlatForest, Dict[str, Dict[str, int]]]:
+    """
+    El bosque con hojas en float32 e índices en int32 y, con trim_trees=True,
+    con el menor subconjunto de árboles (elegidos de a uno, siempre el que
+    más sube la accuracy) que no pierde más de `tolerance` de accuracy.
+
+    Los umbrales quedan en float64: redondearlos podría cambiar de lado
+    alguna comparación. Los árboles se eligen y se evalúan sobre el mismo
+    split de test, así que la accuracy reportada es algo optimista.
+    """
+    trees = np.arange(forest.n_trees)
+    if trim_trees:
+        probas = forest.tree_probas(vectorizer.dense(texts, dtype=np.float32))
+        trees = select_trees(probas, _label_indexes(classes, labels), tolerance)
+
+    subset = forest.subset(trees)
+    compact = FlatForest(
+        feature=subset.feature.astype(np.int32),
+        threshold=subset.threshold,
+        children_left=subset.children_left.astype(np.int32),
+        children_right=subset.children_right.astype(np.int32),
+        value=subset.value.astype(np.float32),
+        roots=subset.roots.astype(np.int32),
+        max_depth=subset.max_depth,
+        n_features=subset.n_features,
+    )
+    return compact, {'before': {'trees': forest.n_trees}, 'after': {'trees': compact.n_trees}}
+
+
+def select_trees(probas: np.ndarray, targets: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Selección greedy sobre las probabilidades de cada árbol (n_filas,
+    n_árboles, n_clases): agrega en cada paso el árbol con el que el
+    promedio acierta más (a igual accuracy, el que más probabilidad da a la
+    clase correcta) hasta llegar a la accuracy del bosque completo menos
+    `tolerance`.
+    """
+    n_rows, n_trees, _ = probas.shape
+    rows = np.arange(n_rows)
+    target = (probas.sum(axis=1).argmax(axis=1) == targets).mean() - tolerance
+
+    total = np.zeros((n_rows, probas.shape[2]))
+    selected: List[int] = []
+    remaining = list(range(n_trees))
+    while remaining:
+        candidates = total[:, None, :] + probas[:, remaining, :]
+        accuracy = (candidates.argmax(axis=2) == targets[:, None]).mean(axis=0)
+        confidence = candidates[rows, :, targets].mean(axis=0)
+        best = int(np.lexsort((-confidence, -accuracy))[0])
+
+        tree = remaining.pop(best)
+        selected.append(tree)
+        total += probas[:, tree, :]
+        if accuracy[best] >= target:
+            break
+    return np.sort(selected)
+
+
+def _measure(model: str, path: Path, texts: List[str], labels: np.ndarray) -> Dict[str, float]:
+    """Tamaño, accuracy y mediana de la latencia de un texto por llamada, sirviendo desde `path`."""
+    if model == 'logistic_regression':
+        loaded = LogisticRegressionModel(None, scorer=load_linear(path))
+    else:
+        vectorizer, forest, classes = load_forest(path)
+        loaded = RandomForestModel(None, forest, vectorizer, classes)
+
+    sample = texts[:OPTIMIZE_LATENCY_SAMPLE]
+    for text in sample[:20]:
+        loaded.predict_with_proba([text])
+    latencies = []
+    for text in sample:
+        started = time.perf_counter()
+        loaded.predict_with_proba([text])
+        latencies.append(time.perf_counter() - started)
+
+    return {
+        'size_bytes': path.stat().st_size,
+        'latency_ms': float(np.median(latencies) * 1000),
+        'accuracy': float((np.asarray(loaded.predict(texts)) == labels).mean()),
+    }
+
+
+def _accuracy(probas: np.ndarray, classes: List[str], labels: np.ndarray) -> float:
+    return float((np.asarray(classes)[probas.argmax(axis=1)] == labels).mean())
+
+
+def _label_indexes(classes: List[str], labels: np.ndarray) -> np.ndarray:
+    index = {label: i for i, label in enumerate(classes)}
+    return np.array([index[label] for label in labels])
@@ -1,48 +1,141 @@
-import joblib
+import copy
+import logging
+import time
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
+import numpy as np
 
+from src.metrics import SCORE_SECONDS, VECTORIZE_SECONDS
+from src.model.artifact import artifact_path, current_artifact, load_forest, save_forest, stamp
 from src.model.base import Model
+from src.model.compiled import CompiledTfidfVectorizer
+from src.model.flat_forest import FlatForest, flat_path
+from src.model.training import build_tfidf, dump_atomic, split_dataset
+
+# sklearn y joblib se importan solo para entrenar o leer un .pkl
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
 
 
 class RandomForestModel(Model):
     """
     Implementación de Model usando Random Forest.
+    
+    Si se pasa un FlatForest los árboles se evalúan con él (todos juntos,
+    vectorizado); si no, con sklearn, usando todos los cores solo para
+    lotes grandes.
+    
+    Cargado desde el artefacto compacto no hay pipeline: el TF-IDF lo
+    calcula un CompiledTfidfVectorizer y los árboles, el FlatForest.
     """
     
-    def __init__(self, pipeline: Pipeline):
-        self._pipeline: Pipeline = pipeline
+    name = "random_forest"
+    
+    def __init__(
+        self,
+        pipeline: Optional["Pipeline"],
+        flat_forest: Optional[FlatForest] = None,
+        vectorizer: Optional[CompiledTfidfVectorizer] = None,
+        classes: Optional[List[str]] = None,
+    ):
+        if pipeline is None and (flat_forest is None or vectorizer is None or classes is None):
+            raise ValueError("Sin pipeline se necesitan el bosque aplanado, el vectorizador y las clases")
+        self._pipeline = pipeline
+        self._flat_forest: Optional[FlatForest] = flat_forest
+        self._vectorizer: Optional[CompiledTfidfVectorizer] = vectorizer
+        self._classes = np.asarray(pipeline.classes_ if pipeline is not None else classes)
+        self._vectorize_seconds = VECTORIZE_SECONDS.labels(model=self.name)
+        self._score_seconds = SCORE_SECONDS.labels(model=self.name)
+    
+    @property
+    def is_flat(self) -> bool:
+        return self._flat_forest is not None
     
     def predict(self, texts: List[str]) -> List[str]:
-        return self._pipeline.predict(texts).tolist()
+        return self._classes[self._predict_proba(texts).argmax(axis=1)].tolist()
     
     def predict_proba(self, texts: List[str]) -> List[List[float]]:
-        return self._pipeline.predict_proba(texts).tolist()
+        return self._predict_proba(texts).tolist()
+    
+    @property
+    def classes(self) -> List[str]:
+        return self._classes.tolist()
+    
+    def _predict_proba(self, texts: List[str]):
+        with self._vectorize_seconds.time():
+            if self._vectorizer is not None:
+                X = self._vectorizer.dense(texts, dtype=np.float32)
+            else:
+                X = self._pipeline[0].transform(texts)
+                if self._flat_forest is not None:
+                    X = X.astype(np.float32).toarray()
+        
+        with self._score_seconds.time():
+            if self._flat_forest is not None:
+                return self._flat_forest.predict_proba(X)
+            
+            # Para pocos textos repartir los árboles cuesta más que evaluarlos. El n_jobs se elige por
+            # llamada sobre una copia superficial (comparte los árboles): el pipeline no se modifica
+            forest = copy.copy(self._pipeline[-1])
+            forest.n_jobs = FlatForest.n_jobs_for(len(texts))
+            return forest.predict_proba(X)
     
     @classmethod
-    def load(cls, path: Path) -> "RandomForestModel":
-        """Carga un modelo desde un archivo .pkl"""
-        pipeline = joblib.load(path)
-        return cls(pipeline)
+    def load(
+        cls, path: Path, mmap_mode: Optional[str] = None, flat: bool = False, artifact: bool = False
+    ) -> "RandomForestModel":
+        """
+        Carga un modelo desde un archivo .pkl
+        
+        Con mmap_mode='r' los arrays de numpy se mapean desde el archivo en
+        lugar de copiarse, y los procesos que cargan el mismo .pkl comparten
+        esas páginas de memoria. Con flat=True se usa además el bosque
+        aplanado guardado junto al .pkl, si existe y corresponde al modelo.
+        
+        Con artifact=True se carga el artefacto compacto guardado junto al
+        .pkl (solo numpy, sin importar sklearn), si existe y corresponde al
+        .pkl actual; si no, se usa el .pkl.
+        """
+        compact_path = current_artifact(path) if artifact else None
+        if compact_path is not None:
+            vectorizer, flat_forest, classes = load_forest(compact_path, mmap_mode=mmap_mode)
+            return cls(None, flat_forest, vectorizer, classes)
+        if artifact:
+            logger.info("No hay un artefacto actualizado para %s, se usa el .pkl", path)
+        
+        import joblib
+        
+        pipeline = joblib.load(path, mmap_mode=mmap_mode)
+        flat_forest = cls._load_flat_forest(path, pipeline, mmap_mode) if flat else None
+        return cls(pipeline, flat_forest)
+    
+    @staticmethod
+    def _load_flat_forest(path: Path, pipeline: "Pipeline", mmap_mode: Optional[str]) -> Optional[FlatForest]:
+        path = flat_path(path)
+        if not path.exists():
+            logger.info("No hay bosque aplanado en %s, se usa sklearn", path)
+            return None
+        
+        flat_forest = FlatForest.load(path, mmap_mode=mmap_mode)
+        classifier = pipeline[-1]
+        if flat_forest.n_features != classifier.n_features_in_ or flat_forest.n_trees != len(classifier.estimators_):
+            logger.warning("El bosque aplanado %s no corresponde al modelo, se usa sklearn", path)
+            return None
+        return flat_forest
     
     @classmethod
     def train(cls, data_path: str, output_path: str) -> "RandomForestModel":
         """Entrena y guarda el modelo Random Forest."""
-        df = pd.read_csv(data_path)
-        X, y = df['message'], df['sentiment']
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.pipeline import Pipeline
         
-        X_train, _, y_train, _ = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
+        X_train, _, y_train, _ = split_dataset(data_path)
         
         pipeline = Pipeline([
-            ('tfidf', TfidfVectorizer(max_features=3000, ngram_range=(1, 2))),
+            ('tfidf', build_tfidf(max_features=3000, ngram_range=(1, 2))),
             ('classifier', RandomForestClassifier(
                 n_estimators=100,      # número de árboles
                 max_depth=20,          # profundidad máxima
@@ -52,7 +145,33 @@ class RandomForestModel(Model):
         ])
         pipeline.fit(X_train, y_train)
         
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump(pipeline, output_path)
+        model = cls(pipeline)
+        model.save(output_path)
+        return model
+    
+    def save(self, output_path: str) -> None:
+        """
+        Guarda el pipeline en un .pkl y, al lado, el bosque aplanado y el
+        artefacto compacto con el que se sirve.
+        """
+        if self._pipeline is None:
+            raise ValueError("El modelo se cargó desde un artefacto: no hay pipeline para guardar")
+        
+        # Los archivos auxiliares se escriben antes que el .pkl, que es el que se vigila para recargar
+        flat_forest = self._flat_forest or FlatForest.from_sklearn(self._pipeline[-1])
+        flat_forest.save(flat_path(output_path))
+        
+        compact_path = artifact_path(output_path)
+        try:
+            vectorizer = CompiledTfidfVectorizer.from_sklearn(self._pipeline[0])
+            save_forest(vectorizer, flat_forest, self.classes, compact_path)
+            exported = True
+        except ValueError as e:
+            logger.warning("No se puede exportar el artefacto, se servirá desde el .pkl: %s", e)
+            exported = False
         
-        return cls(pipeline)
\ No newline at end of file
+        # El artefacto toma la versión antes de que aparezca el .pkl, que llega ya con el mismo mtime
+        version = time.time_ns()
+        if exported:
+            stamp(compact_path, version)
+        dump_atomic(self._pipeline, output_path, mtime_ns=version)
\ No newline at end of file
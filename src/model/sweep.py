@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from src.model.artifact import current_artifact
+from src.model.flat_forest import flat_path
+from src.model.logistic_regression_model import LogisticRegressionModel
+from src.model.random_forest_model import RandomForestModel
+from src.model.training import build_tfidf, dump_atomic, split_dataset
+from src.settings import (
+    DATA_PATH,
+    LOGISTIC_REGRESSION_COMPILED,
+    LOGISTIC_REGRESSION_MODEL_PATH,
+    MODEL_ARTIFACTS,
+    RANDOM_FOREST_FLAT,
+    RANDOM_FOREST_MODEL_PATH,
+    SWEEP_CACHE_DIR,
+    SWEEP_LATENCY_SAMPLE,
+    TEXT_NORMALIZATION,
+)
+
+MODEL_CLASSES = {
+    'logistic_regression': LogisticRegressionModel,
+    'random_forest': RandomForestModel,
+}
+
+MODEL_PATHS = {
+    'logistic_regression': LOGISTIC_REGRESSION_MODEL_PATH,
+    'random_forest': RANDOM_FOREST_MODEL_PATH,
+}
+
+
+@dataclass
+class SweepConfig:
+    """Una configuración a entrenar: tipo de modelo y parámetros del TF-IDF y del clasificador."""
+    name: str
+    model: str
+    vectorizer: Dict[str, Any] = field(default_factory=dict)
+    classifier: Dict[str, Any] = field(default_factory=dict)
+
+    def build_classifier(self):
+        if self.model == 'logistic_regression':
+            return LogisticRegression(**{'max_iter': 1000, **self.classifier})
+        if self.model == 'random_forest':
+            # Cada configuración corre en su propio proceso: un solo core por bosque
+            return RandomForestClassifier(**{'random_state': 42, **self.classifier, 'n_jobs': 1})
+        raise ValueError(f"Modelo desconocido: {self.model}")
+
+
+DEFAULT_CONFIGS = [
+    SweepConfig("lr_5000_bigramas", "logistic_regression", {'max_features': 5000, 'ngram_range': (1, 2)}),
+    SweepConfig("lr_2000_unigramas", "logistic_regression", {'max_features': 2000, 'ngram_range': (1, 1)}),
+    SweepConfig("lr_20000_bigramas", "logistic_regression", {'max_features': 20000, 'ngram_range': (1, 2)}),
+    SweepConfig("lr_5000_bigramas_c10", "logistic_regression", {'max_features': 5000, 'ngram_range': (1, 2)}, {'C': 10.0}),
+    SweepConfig("rf_100_arboles", "random_forest", {'max_features': 3000, 'ngram_range': (1, 2)}, {'n_estimators': 100, 'max_depth': 20}),
+    SweepConfig("rf_30_arboles", "random_forest", {'max_features': 3000, 'ngram_range': (1, 2)}, {'n_estimators': 30, 'max_depth': 20}),
+]
+
+
+def load_configs(path: str) -> List[SweepConfig]:
+    """Lee configuraciones desde un JSON: una lista de objetos con los campos de SweepConfig."""
+    with open(path, encoding="utf-8") as f:
+        configs = [SweepConfig(**item) for item in json.load(f)]
+    for config in configs:
+        if 'ngram_range' in config.vectorizer:
+            config.vectorizer['ngram_range'] = tuple(config.vectorizer['ngram_range'])
+    return configs
+
+
+def run_sweep(
+    configs: List[SweepConfig] = DEFAULT_CONFIGS,
+    data_path: str = DATA_PATH,
+    workers: int = os.cpu_count() or 1,
+    cache_dir: Path = SWEEP_CACHE_DIR,
+) -> List[Dict[str, Any]]:
+    """
+    Entrena las configuraciones en paralelo (un proceso por configuración) y
+    evalúa cada una sobre el 20% reservado.
+
+    La matriz TF-IDF se calcula una sola vez por combinación de parámetros
+    del vectorizador y se guarda en `cache_dir`; los procesos la abren con
+    mmap, así no la recalculan ni tienen una copia cada uno.
+
+    Retorna una fila por configuración con accuracy, latencia por texto (ms,
+    un texto por llamada, con el mismo motor que usa la API), tamaño en
+    disco de lo que carga la API (el .artifact con MODEL_ARTIFACTS) y tiempo
+    de entrenamiento, y la ruta del modelo entrenado.
+    """
+    cache_dir = Path(cache_dir)
+    features = {}
+    for config in configs:
+        key = _features_key(data_path, config.vectorizer)
+        if key not in features:
+            features[key] = _cache_features(data_path, config.vectorizer, cache_dir / f"features-{key}.joblib")
+
+    jobs = [
+        (config, features[_features_key(data_path, config.vectorizer)], cache_dir / "models" / f"{config.name}.pkl")
+        for config in configs
+    ]
+    if workers <= 1:
+        return [_train_and_evaluate(*job) for job in jobs]
+
+    with ProcessPoolExecutor(min(workers, len(jobs))) as executor:
+        return list(executor.map(_train_and_evaluate, *zip(*jobs)))
+
+
+def select_best(results: List[Dict[str, Any]], min_accuracy: float) -> Optional[Dict[str, Any]]:
+    """El modelo con menor latencia entre los que alcanzan `min_accuracy` (None si ninguno)."""
+    candidates = [result for result in results if result['accuracy'] >= min_accuracy]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda result: (result['latency_ms'], -result['accuracy']))
+
+
+def publish(result: Dict[str, Any]) -> Path:
+    """Copia el modelo elegido a la ruta que usa la API, que lo recarga sola."""
+    model_class = MODEL_CLASSES[result['model']]
+    target = MODEL_PATHS[result['model']]
+    model_class.load(result['path']).save(str(target))
+    return target
+
+
+def _features_key(data_path: str, vectorizer_params: Dict[str, Any]) -> str:
+    # Cambia si cambia el dataset o algún parámetro del vectorizador (incluida la normalización)
+    stat = Path(data_path).stat()
+    params = {'normalize': TEXT_NORMALIZATION, **vectorizer_params}
+    raw = json.dumps([str(data_path), stat.st_size, stat.st_mtime_ns, params], sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _cache_features(data_path: str, vectorizer_params: Dict[str, Any], path: Path) -> Path:
+    if path.exists():
+        return path
+
+    X_train, X_test, y_train, y_test = split_dataset(data_path)
+    vectorizer = build_tfidf(**vectorizer_params)
+    dump_atomic({
+        'vectorizer': vectorizer.fit(X_train),
+        'X_train': vectorizer.transform(X_train),
+        'X_test': vectorizer.transform(X_test),
+        'y_train': y_train.to_numpy(),
+        'y_test': y_test.to_numpy(),
+        'texts_test': X_test.tolist(),
+    }, str(path))
+    return path
+
+
+def _train_and_evaluate(config: SweepConfig, features_path: Path, output_path: Path) -> Dict[str, Any]:
+    features = joblib.load(features_path, mmap_mode="r")
+
+    started = time.perf_counter()
+    classifier = config.build_classifier().fit(features['X_train'], features['y_train'])
+    fit_seconds = time.perf_counter() - started
+
+    accuracy = float((classifier.predict(features['X_test']) == features['y_test']).mean())
+
+    pipeline = Pipeline([('tfidf', features['vectorizer']), ('classifier', classifier)])
+    model = MODEL_CLASSES[config.model](pipeline)
+    model.save(str(output_path))
+
+    return {
+        **asdict(config),
+        'accuracy': accuracy,
+        'latency_ms': _latency_ms(config.model, output_path, features['texts_test']),
+        'size_bytes': _served_size(config.model, output_path),
+        'fit_seconds': fit_seconds,
+        'path': str(output_path),
+    }
+
+
+def _latency_ms(model: str, path: Path, texts: List[str]) -> float:
+    """Mediana de la latencia de un texto por llamada, cargando el modelo como lo hace la API."""
+    if model == 'logistic_regression':
+        loaded = LogisticRegressionModel.load(path, compiled=LOGISTIC_REGRESSION_COMPILED, artifact=MODEL_ARTIFACTS)
+    else:
+        loaded = RandomForestModel.load(path, flat=RANDOM_FOREST_FLAT, artifact=MODEL_ARTIFACTS)
+
+    texts = texts[:SWEEP_LATENCY_SAMPLE]
+    latencies = []
+    for text in texts:
+        started = time.perf_counter()
+        loaded.predict_with_proba([text])
+        latencies.append(time.perf_counter() - started)
+    return float(np.median(latencies) * 1000)
+
+
+def _served_size(model: str, path: Path) -> int:
+    """Bytes en disco de lo que carga la API: el artefacto o, sin él, el .pkl (y el bosque aplanado)."""
+    compact_path = current_artifact(path) if MODEL_ARTIFACTS else None
+    if compact_path is not None:
+        return compact_path.stat().st_size
+
+    size_bytes = path.stat().st_size
+    if model == 'random_forest' and RANDOM_FOREST_FLAT and flat_path(path).exists():
+        size_bytes += flat_path(path).stat().st_size
+    return size_bytes
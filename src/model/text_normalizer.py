@@ -0,0 +1,120 @@
+import re
+import threading
+from typing import Any, Dict, List, Tuple
+
+from src.settings import TEXT_NORMALIZER_CACHE_MAX_CHARS, TEXT_NORMALIZER_CACHE_SIZE
+
+# Emojis frecuentes en las reseñas: se reemplazan por un término con su polaridad
+POSITIVE_EMOJI = "😀😃😄😁😊🙂😍🥰😘😎🤩👍👌👏🙌💪🎉💯❤♥💙💚💛✨⭐🌟✅"
+NEGATIVE_EMOJI = "😞😔😟😕🙁☹😣😖😫😩😢😭😤😠😡🤬😒🙄😑🤦👎💔❌🚫😱"
+POSITIVE_TOKEN = " emojipositivo "
+NEGATIVE_TOKEN = " emojinegativo "
+
+# El resto de los emojis (y los modificadores que los acompañan) se descartan
+_EMOJI = re.compile("[\U0001F000-\U0001FAFF☀-➿⬀-⯿︀-️‍]")
+_EMOJI_TOKENS = {
+    **{char: POSITIVE_TOKEN for char in POSITIVE_EMOJI},
+    **{char: NEGATIVE_TOKEN for char in NEGATIVE_EMOJI},
+}
+
+# La ñ se conserva: "año" y "ano" no son la misma palabra
+_ACCENTS: List[Tuple[str, str]] = [("á", "a"), ("é", "e"), ("í", "i"), ("ó", "o"), ("ú", "u"), ("ü", "u")]
+
+# Una letra repetida 3 o más veces ("holaaaa", "siiii"): en español ninguna palabra lo hace.
+# Se aplica después de sacar los acentos; una clase chica es varias veces más rápida que [^\W\d_]
+_ELONGATION = re.compile(r"([a-zñ])\1\1+")
+
+
+class TextNormalizer:
+    """
+    Normaliza y tokeniza reseñas antes del TF-IDF, igual al entrenar y al servir.
+
+    Pasa a minúsculas, saca acentos (conserva la ñ), reemplaza emojis por un
+    término con su polaridad y acorta las letras alargadas ("buenooo" ->
+    "bueno"); los términos son las secuencias de letras y dígitos, así la
+    puntuación repetida no cuenta ("¡¡¡pésimo!!!" -> "pesimo"). Variantes de
+    una misma palabra dejan de ocupar términos distintos del vocabulario.
+
+    Se usa como `tokenizer` del TfidfVectorizer (ver `build_tfidf`), por eso
+    es picklable; el cache no se guarda. `tokenize` memoiza los textos de
+    hasta `cache_max_chars` caracteres: los mensajes cortos se repiten mucho.
+    """
+
+    def __init__(
+        self,
+        lowercase: bool = True,
+        strip_accents: bool = True,
+        emoji: bool = True,
+        elongation: bool = True,
+        min_token_chars: int = 2,
+        cache_size: int = TEXT_NORMALIZER_CACHE_SIZE,
+        cache_max_chars: int = TEXT_NORMALIZER_CACHE_MAX_CHARS,
+    ):
+        self.lowercase = lowercase
+        self.strip_accents = strip_accents
+        self.emoji = emoji
+        self.elongation = elongation
+        self.min_token_chars = min_token_chars
+        self.cache_size = cache_size
+        self.cache_max_chars = cache_max_chars
+        self._setup()
+
+    def _setup(self) -> None:
+        self._token_regex = re.compile(rf"\w{{{max(self.min_token_chars, 1)},}}")
+        self._cache: Dict[str, Tuple[str, ...]] = {}
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_params(self) -> Dict[str, Any]:
+        """Parámetros de la normalización (sin los del cache): alcanzan para reconstruirla."""
+        return {
+            'lowercase': self.lowercase,
+            'strip_accents': self.strip_accents,
+            'emoji': self.emoji,
+            'elongation': self.elongation,
+            'min_token_chars': self.min_token_chars,
+        }
+
+    def normalize(self, text: str) -> str:
+        """Texto normalizado (sin tokenizar)."""
+        if self.lowercase:
+            text = text.lower()
+        if not text.isascii():
+            if self.strip_accents:
+                # Una pasada de replace por letra es mucho más rápida que str.translate con un dict
+                for accented, plain in _ACCENTS:
+                    text = text.replace(accented, plain)
+            if self.emoji:
+                text = _EMOJI.sub(lambda match: _EMOJI_TOKENS.get(match.group(), " "), text)
+        if self.elongation:
+            text = _ELONGATION.sub(r"\1", text)
+        return text
+
+    def tokenize(self, text: str) -> List[str]:
+        """Términos del texto normalizado."""
+        if len(text) > self.cache_max_chars:
+            return self._token_regex.findall(self.normalize(text))
+
+        tokens = self._cache.get(text)
+        if tokens is not None:
+            self.hits += 1
+            return list(tokens)
+
+        self.misses += 1
+        tokens = tuple(self._token_regex.findall(self.normalize(text)))
+        with self._cache_lock:
+            # Lleno se vacía de una vez: más barato que llevar el orden de uso, y los frecuentes vuelven enseguida
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[text] = tokens
+        return list(tokens)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'params': self.get_params(), 'cache_size': self.cache_size, 'cache_max_chars': self.cache_max_chars}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state['params'])
+        self.cache_size = state['cache_size']
+        self.cache_max_chars = state['cache_max_chars']
+        self._setup()
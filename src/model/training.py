@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+from src.model.text_normalizer import TextNormalizer
+from src.settings import TEXT_NORMALIZATION
+
+# pandas, sklearn y joblib se importan al usarlos: servir un modelo no los necesita
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Split fijo 80/20 compartido por el entrenamiento y la evaluación de los modelos
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+
+def split_dataset(data_path: str) -> Tuple["pd.Series", "pd.Series", "pd.Series", "pd.Series"]:
+    """Retorna (X_train, X_test, y_train, y_test) con los textos y sentimientos del CSV."""
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(data_path)
+    return train_test_split(
+        df['message'], df['sentiment'], test_size=TEST_SIZE, random_state=RANDOM_STATE
+    )
+
+
+def build_tfidf(normalize: bool = TEXT_NORMALIZATION, **params: Any) -> "TfidfVectorizer":
+    """
+    TfidfVectorizer para entrenar. Con normalize=True tokeniza con un
+    TextNormalizer (que ya pasa a minúsculas): queda dentro del pipeline, así
+    al servir se aplica exactamente la misma normalización.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    if normalize:
+        params.update(tokenizer=TextNormalizer().tokenize, token_pattern=None, lowercase=False)
+    return TfidfVectorizer(**params)
+
+
+def dump_atomic(value: Any, output_path: str, mtime_ns: Optional[int] = None) -> None:
+    """
+    Guarda `value` con joblib en un archivo temporal y lo reemplaza de una vez:
+    nunca se pisa un .pkl que otro proceso tiene mapeado ni queda uno a medias.
+    Con `mtime_ns`, el archivo aparece ya con ese mtime.
+    """
+    import joblib
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    joblib.dump(value, tmp_path)
+    if mtime_ns is not None:
+        os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+    os.replace(tmp_path, output_path)
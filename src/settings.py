@@ -1,8 +1,134 @@
+import os
 from pathlib import Path
 
 # Rutas de los modelos
 LOGISTIC_REGRESSION_MODEL_PATH = Path("src/model/logistic_regression_model.pkl")
 RANDOM_FOREST_MODEL_PATH = Path("src/model/random_forest_model.pkl")
+INCREMENTAL_MODEL_PATH = Path("src/model/incremental_model.pkl")
 
 # Ruta del dataset
 DATA_PATH = "data/reviews.csv"
+
+# Cada cuántos segundos se revisa si un .pkl cambió en disco para recargarlo
+MODEL_RELOAD_CHECK_INTERVAL = 2.0
+
+# Cantidad máxima de textos por request en /analyze/batch
+MAX_BATCH_SIZE = 1000
+
+# Micro-batching de /analyze y /predict: tamaño máximo del lote y espera máxima
+BATCH_MAX_SIZE = 32
+BATCH_MAX_WAIT_MS = 5
+
+# Pool de inferencia: threads dedicados y máximo de textos encolados antes de responder 503
+# (INFERENCE_QUEUE_LIMIT debe ser mayor o igual a MAX_BATCH_SIZE)
+INFERENCE_WORKERS = 4
+INFERENCE_QUEUE_LIMIT = 2000
+
+# Con "r" los modelos se cargan con joblib.load(mmap_mode="r"): los workers de
+# uvicorn que cargan el mismo .pkl comparten los arrays en memoria
+MODEL_MMAP_MODE = os.environ.get("MODEL_MMAP_MODE") or None
+
+# Cache de resultados en memoria (RESULT_CACHE_SIZE = 0 la desactiva)
+RESULT_CACHE_SIZE = 10000
+RESULT_CACHE_TTL_SECONDS = 3600
+
+# Cache persistente de resultados debajo del de memoria: un archivo SQLite (modo WAL)
+# compartido por los workers del host que sobrevive a los reinicios. Se activa con
+# RESULT_STORE_PATH; se cuentan las entradas cada RESULT_STORE_TRIM_EVERY escrituras
+RESULT_STORE_PATH = os.environ.get("RESULT_STORE_PATH") or None
+RESULT_STORE_MAX_ENTRIES = 1000000
+RESULT_STORE_TRIM_EVERY = 1000
+
+# Filas por chunk y formatos de salida del análisis masivo de archivos (python -m src.main_cli score)
+BULK_CHUNK_SIZE = 10000
+BULK_OUTPUT_FORMATS = ["csv", "jsonl", "parquet"]
+
+# Líneas NDJSON que /analyze/stream analiza juntas
+STREAM_CHUNK_SIZE = 256
+
+# Textos largos (/analyze/long): largo máximo aceptado, caracteres por chunk
+# (las reseñas de entrenamiento tienen ~570) y spans negativos a reportar
+LONG_TEXT_MAX_CHARS = 50000
+LONG_TEXT_CHUNK_CHARS = 600
+LONG_TEXT_TOP_SPANS = 3
+
+# Cola de casos críticos (/triage): casos que se guardan como máximo (se
+# descartan los menos críticos), antigüedad máxima y tamaño de página
+TRIAGE_MAX_ENTRIES = 10000
+TRIAGE_MAX_AGE_SECONDS = 7 * 24 * 3600
+TRIAGE_PAGE_SIZE = 50
+
+# Jobs asíncronos (/jobs): base SQLite donde se guardan (sobreviven a los
+# reinicios), threads que los procesan en cada proceso, textos por chunk,
+# textos máximos por job y resultados por página. Los procesos buscan jobs
+# nuevos cada JOBS_POLL_INTERVAL segundos; un job tomado por un proceso que no
+# avanza en JOBS_LEASE_SECONDS lo retoma otro. Los jobs terminados se borran
+# después de JOBS_RETENTION_SECONDS
+JOBS_DB_PATH = Path(os.environ.get("JOBS_DB_PATH") or "jobs/jobs.sqlite")
+JOBS_WORKERS = 1
+JOBS_CHUNK_SIZE = 500
+JOBS_MAX_TEXTS = 100000
+JOBS_PAGE_SIZE = 100
+JOBS_POLL_INTERVAL = 1.0
+JOBS_LEASE_SECONDS = 60
+JOBS_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Normalización de texto antes del TF-IDF (src/model/text_normalizer.py) al
+# entrenar. Los textos de hasta TEXT_NORMALIZER_CACHE_MAX_CHARS caracteres se
+# memoizan, hasta TEXT_NORMALIZER_CACHE_SIZE por proceso
+TEXT_NORMALIZATION = True
+TEXT_NORMALIZER_CACHE_SIZE = 20000
+TEXT_NORMALIZER_CACHE_MAX_CHARS = 280
+
+# Cascada (modelo "cascade"): se escala al Random Forest cuando la clase más
+# probable según la Regresión Logística no llega a CASCADE_THRESHOLD. Las
+# probabilidades se combinan con este peso para el segundo modelo (1.0 = solo él)
+CASCADE_THRESHOLD = 0.8
+CASCADE_SECONDARY_WEIGHT = 0.5
+
+# Optimización de modelos (python -m src.main_cli optimize): accuracy que se
+# puede perder sobre el split de test, fracciones de términos a probar al
+# podar la Regresión Logística y textos para medir la latencia
+OPTIMIZE_ACCURACY_TOLERANCE = 0.005
+OPTIMIZE_KEEP_FRACTIONS = [0.05, 0.1, 0.2, 0.3, 0.5, 0.75]
+OPTIMIZE_LATENCY_SAMPLE = 200
+
+# Cada cuánto la GUI revisa los resultados del hilo de trabajo (ms)
+GUI_POLL_INTERVAL_MS = 50
+
+# Textos que cada modelo analiza al cargarse, antes de atender requests
+WARMUP_TEXTS = [
+    "Excelente atención, resolvieron mi problema enseguida",
+    "El pedido llegó en la fecha indicada",
+    "Pésimo servicio, nadie responde los reclamos",
+]
+
+# Inferencia de la Regresión Logística con el scorer compilado (sin pasar por sklearn)
+LOGISTIC_REGRESSION_COMPILED = True
+
+# Random Forest aplanado (src/model/flat_forest.py): se usa si existe el archivo
+# .flat.joblib junto al .pkl. Filas por chunk de evaluación y tamaño de lote a
+# partir del cual se reparte entre threads (y sklearn usa todos los cores)
+RANDOM_FOREST_FLAT = True
+FLAT_FOREST_CHUNK_ROWS = 256
+FLAT_FOREST_PARALLEL_MIN_ROWS = 512
+
+# Servir la Regresión Logística y el Random Forest desde el artefacto compacto
+# (src/model/artifact.py) guardado junto a cada .pkl: se carga solo con numpy
+MODEL_ARTIFACTS = True
+
+# Entrenamiento incremental (src/model/incremental_model.py): filas por chunk y
+# tamaño del espacio de features del HashingVectorizer
+TRAIN_CHUNK_SIZE = 100000
+INCREMENTAL_N_FEATURES = 2 ** 18
+
+# Servir también el modelo incremental (API y `score`). Apagado por defecto: no
+# tiene artefacto compacto, así que cargarlo importa sklearn y, sin .pkl, lo
+# entrena al arrancar
+INCREMENTAL_SERVING = False
+
+# Sweep de configuraciones (python -m src.main_cli sweep): carpeta de las matrices
+# TF-IDF y modelos entrenados, textos para medir latencia y accuracy mínima
+SWEEP_CACHE_DIR = Path(".sweep_cache")
+SWEEP_LATENCY_SAMPLE = 200
+SWEEP_MIN_ACCURACY = 0.9
@@ -0,0 +1,120 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.model.artifact import ALIGNMENT, artifact_path, is_current, read_artifact, write_artifact
+from src.model.logistic_regression_model import LogisticRegressionModel
+from src.model.random_forest_model import RandomForestModel
+from src.model.training import dump_atomic
+
+DATA_PATH = Path("data/reviews.csv")
+
+TEXTS = ["Excelente atención", "Pésimo servicio", "Llegó el pedido", "!!!", ""]
+
+
+@pytest.fixture(scope="module")
+def lr_path(tmp_path_factory) -> Path:
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    output_path = tmp_path_factory.mktemp("lr") / "model.pkl"
+    LogisticRegressionModel.train(str(DATA_PATH), str(output_path))
+    return output_path
+
+
+@pytest.fixture(scope="module")
+def rf_path(tmp_path_factory) -> Path:
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    output_path = tmp_path_factory.mktemp("rf") / "model.pkl"
+    RandomForestModel.train(str(DATA_PATH), str(output_path))
+    return output_path
+
+
+class TestArtifactFormat:
+    def test_roundtrip_keeps_header_and_arrays(self, tmp_path):
+        path = tmp_path / "model.artifact"
+        arrays = {
+            'weights': np.arange(12, dtype=np.float64).reshape(4, 3),
+            'nodes': np.array([3, 1, 2], dtype=np.intp),
+            'empty': np.zeros(0, dtype=np.float32),
+        }
+
+        write_artifact(path, {'kind': 'test', 'classes': ['negativo', 'positivo']}, arrays)
+        header, loaded = read_artifact(path)
+
+        assert header['kind'] == 'test'
+        assert header['classes'] == ['negativo', 'positivo']
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(loaded[name], array)
+            assert loaded[name].dtype == array.dtype
+
+    def test_mmap_mode_maps_aligned_arrays(self, tmp_path):
+        path = tmp_path / "model.artifact"
+        write_artifact(path, {'kind': 'test'}, {'a': np.ones(5), 'b': np.arange(7, dtype=np.int32)})
+
+        _, loaded = read_artifact(path, mmap_mode="r")
+
+        assert isinstance(loaded['b'], np.memmap)
+        assert not loaded['b'].flags.writeable
+        assert loaded['b'].offset % ALIGNMENT == 0
+        np.testing.assert_array_equal(loaded['b'], np.arange(7))
+
+    def test_rejects_files_that_are_not_artifacts(self, tmp_path):
+        path = tmp_path / "model.artifact"
+        path.write_bytes(b"no es un modelo")
+
+        with pytest.raises(ValueError):
+            read_artifact(path)
+
+
+class TestModelArtifacts:
+    def test_save_writes_current_artifact_next_to_model(self, lr_path, rf_path):
+        assert is_current(artifact_path(lr_path), lr_path)
+        assert is_current(artifact_path(rf_path), rf_path)
+
+    def test_linear_artifact_predicts_same_as_pipeline(self, lr_path):
+        regular = LogisticRegressionModel.load(lr_path)
+        compact = LogisticRegressionModel.load(lr_path, mmap_mode="r", artifact=True)
+
+        assert compact._pipeline is None
+        assert compact.is_compiled
+        assert compact.classes == regular.classes
+        assert compact.predict(TEXTS) == regular.predict(TEXTS)
+        np.testing.assert_allclose(compact.predict_proba(TEXTS), regular.predict_proba(TEXTS))
+
+    def test_forest_artifact_predicts_same_as_flat_forest(self, rf_path):
+        flat = RandomForestModel.load(rf_path, flat=True)
+        compact = RandomForestModel.load(rf_path, mmap_mode="r", artifact=True)
+
+        assert compact._pipeline is None
+        assert compact.predict(TEXTS) == flat.predict(TEXTS)
+        np.testing.assert_allclose(compact.predict_proba(TEXTS), flat.predict_proba(TEXTS))
+
+    def test_outdated_artifact_falls_back_to_pkl(self, lr_path, tmp_path):
+        output_path = tmp_path / "model.pkl"
+        LogisticRegressionModel.load(lr_path).save(str(output_path))
+        # Un .pkl reemplazado sin pasar por save: el artefacto ya no le corresponde
+        dump_atomic(LogisticRegressionModel.load(lr_path)._pipeline, str(output_path))
+
+        model = LogisticRegressionModel.load(output_path, artifact=True)
+
+        assert model._pipeline is not None
+
+    def test_model_loaded_from_artifact_cannot_be_saved(self, lr_path, tmp_path):
+        model = LogisticRegressionModel.load(lr_path, artifact=True)
+
+        with pytest.raises(ValueError):
+            model.save(str(tmp_path / "copia.pkl"))
+
+    def test_serving_modules_do_not_import_training_dependencies(self):
+        code = (
+            "import sys, src.main_api, src.main_cli; "
+            "print(sorted(m for m in ('sklearn', 'pandas', 'joblib', 'scipy') if m in sys.modules))"
+        )
+
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.analyzer.batcher import MicroBatcher
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from tests.test_sentiment_analyzer import FakeModel
+
+
+class RecordingModel(FakeModel):
+    """FakeModel que registra los lotes que recibe."""
+    
+    def __init__(self):
+        super().__init__(sentiment="positivo", probas=[0.8, 0.15, 0.05])
+        self.batches = []
+    
+    def predict_with_proba(self, texts):
+        self.batches.append(list(texts))
+        return super().predict_with_proba(texts)
+
+
+async def analyze_all(batcher: MicroBatcher, texts):
+    return await asyncio.gather(*(batcher.analyze(text) for text in texts), return_exceptions=True)
+
+
+class TestMicroBatcher:
+    def test_concurrent_requests_are_scored_in_one_batch(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(lambda: SentimentAnalyzer(model), max_batch_size=10, max_wait_ms=50)
+        
+        results = asyncio.run(analyze_all(batcher, ["Uno", "Dos", "Tres"]))
+        
+        assert model.batches == [["Uno", "Dos", "Tres"]]
+        assert all(r["sentiment"] == "positivo" for r in results)
+    
+    def test_batches_are_split_at_max_batch_size(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(lambda: SentimentAnalyzer(model), max_batch_size=2, max_wait_ms=50)
+        
+        asyncio.run(analyze_all(batcher, ["Uno", "Dos", "Tres"]))
+        
+        assert sorted(len(batch) for batch in model.batches) == [1, 2]
+    
+    def test_invalid_text_raises_error_only_for_its_request(self):
+        batcher = MicroBatcher(lambda: SentimentAnalyzer(FakeModel()), max_wait_ms=50)
+        
+        results = asyncio.run(analyze_all(batcher, ["Bien", ""]))
+        
+        assert results[0]["sentiment"] == "positivo"
+        assert isinstance(results[1], ValueError)
+    
+    def test_model_errors_are_propagated(self):
+        def broken_analyzer():
+            raise RuntimeError("modelo roto")
+        
+        batcher = MicroBatcher(broken_analyzer)
+        
+        with pytest.raises(RuntimeError, match="modelo roto"):
+            asyncio.run(batcher.analyze("Hola"))
+    
+    def test_metrics_record_batch_size(self):
+        batcher = MicroBatcher(lambda: SentimentAnalyzer(FakeModel()), max_batch_size=10, max_wait_ms=50)
+        
+        asyncio.run(analyze_all(batcher, ["Uno", "Dos", "Tres", "Cuatro"]))
+        
+        metrics = batcher.metrics.snapshot()
+        assert metrics["batches"] == 1
+        assert metrics["items"] == 4
+        assert metrics["max_batch_size"] == 4
@@ -0,0 +1,53 @@
+import pytest
+
+from benchmarks.suite import compare, main, summarize
+
+
+def results(p95_ms: float, items_per_sec: float, memory_mb: float = 10.0):
+    return {
+        'meta': {'python': '3.11'},
+        'models': {
+            'logistic_regression': {
+                'analyze': {'p50_ms': 1.0, 'p95_ms': p95_ms, 'p99_ms': 3.0, 'items_per_sec': items_per_sec},
+                'memory_mb': memory_mb,
+            },
+        },
+    }
+
+
+class TestSummarize:
+    def test_percentiles_and_throughput(self):
+        stats = summarize([0.001] * 99 + [0.1], items=2)
+        
+        assert stats['p50_ms'] == pytest.approx(1.0)
+        assert stats['p99_ms'] > stats['p95_ms'] >= stats['p50_ms']
+        assert stats['items_per_sec'] == pytest.approx(200 / (0.099 + 0.1))
+
+
+class TestCompare:
+    def test_no_regressions_within_tolerance(self):
+        assert compare(results(2.3, 900), results(2.0, 1000), tolerance=0.2) == []
+    
+    def test_slower_latency_is_a_regression(self):
+        regressions = compare(results(3.0, 1000), results(2.0, 1000), tolerance=0.2)
+        
+        assert regressions == ["models.logistic_regression.analyze.p95_ms: 2.000 -> 3.000"]
+    
+    def test_lower_throughput_and_more_memory_are_regressions(self):
+        regressions = compare(results(2.0, 500, memory_mb=20.0), results(2.0, 1000), tolerance=0.2)
+        
+        assert len(regressions) == 2
+    
+    def test_improvements_and_metrics_missing_from_baseline_are_ignored(self):
+        current = results(1.0, 2000)
+        current['models']['random_forest'] = current['models']['logistic_regression']
+        
+        assert compare(current, results(2.0, 1000), tolerance=0.2) == []
+
+
+
+class TestMain:
+    def test_check_fails_without_baseline_before_measuring(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("benchmarks.suite.run", lambda *args, **kwargs: pytest.fail("no debería medir"))
+        
+        assert main(["--check", "--baseline", str(tmp_path / "baseline.json")]) == 2
@@ -0,0 +1,89 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.analyzer.bulk_scorer import read_chunks, score_file
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from tests.test_sentiment_analyzer import FakeModel
+
+
+def fake_analyzer() -> SentimentAnalyzer:
+    return SentimentAnalyzer(FakeModel(sentiment="positivo", probas=[0.8, 0.15, 0.05]))
+
+
+@pytest.fixture
+def reviews_path(tmp_path):
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame({
+        "id": [f"review-{i}" for i in range(5)],
+        "sentiment": ["positivo"] * 5,
+        "message": ["Excelente", "Muy bueno", "", "Genial", "Gracias"],
+    }).to_csv(path, index=False)
+    return path
+
+
+class TestBulkScorer:
+    def test_read_chunks_streams_in_chunks(self, reviews_path):
+        chunks = list(read_chunks(str(reviews_path), chunksize=2))
+        
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    
+    def test_score_file_writes_one_row_per_input_row(self, reviews_path, tmp_path):
+        output_path = tmp_path / "scored.csv"
+        
+        stats = score_file(str(reviews_path), str(output_path), chunksize=2, analyzer_factory=fake_analyzer, progress=None)
+        
+        scored = pd.read_csv(output_path)
+        assert stats["rows"] == 5
+        assert scored["id"].tolist() == [f"review-{i}" for i in range(5)]
+        assert "message" not in scored.columns
+        assert scored.loc[0, "predicted_sentiment"] == "positivo"
+        assert scored.loc[0, "confidence_positivo"] == 0.8
+    
+    def test_score_file_reports_invalid_rows_without_failing(self, reviews_path, tmp_path):
+        output_path = tmp_path / "scored.csv"
+        
+        score_file(str(reviews_path), str(output_path), chunksize=2, analyzer_factory=fake_analyzer, progress=None)
+        
+        scored = pd.read_csv(output_path)
+        assert scored.loc[2, "error"] == "El texto no puede estar vacío"
+        assert pd.isna(scored.loc[2, "predicted_sentiment"])
+    
+    def test_score_file_writes_jsonl(self, reviews_path, tmp_path):
+        output_path = tmp_path / "scored.jsonl"
+        
+        score_file(str(reviews_path), str(output_path), chunksize=2, keep_text=True, analyzer_factory=fake_analyzer, progress=None)
+        
+        lines = output_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[1])["message"] == "Muy bueno"
+    
+    def test_score_file_with_workers_keeps_input_order(self, reviews_path, tmp_path):
+        output_path = tmp_path / "scored.csv"
+        
+        score_file(str(reviews_path), str(output_path), chunksize=1, workers=2, analyzer_factory=fake_analyzer, progress=None)
+        
+        assert pd.read_csv(output_path)["id"].tolist() == [f"review-{i}" for i in range(5)]
+    
+    def test_score_file_rejects_unknown_format(self, reviews_path, tmp_path):
+        with pytest.raises(ValueError, match="Formato de salida no soportado"):
+            score_file(str(reviews_path), str(tmp_path / "scored.xlsx"), analyzer_factory=fake_analyzer, progress=None)
+    
+    def test_score_file_rejects_missing_text_column(self, reviews_path, tmp_path):
+        with pytest.raises(ValueError, match="columna 'texto'"):
+            score_file(str(reviews_path), str(tmp_path / "scored.csv"), text_column="texto", analyzer_factory=fake_analyzer, progress=None)
+    
+    def test_score_file_parquet_round_trip_with_late_invalid_row(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        input_path = tmp_path / "reviews.csv"
+        pd.DataFrame({"message": ["bueno", "malo", "", "ok"]}).to_csv(input_path, index=False)
+        output_path = tmp_path / "scored.parquet"
+        
+        score_file(str(input_path), str(output_path), chunksize=2, keep_text=True, analyzer_factory=fake_analyzer, progress=None)
+        
+        scored = pd.read_parquet(output_path)
+        assert scored["message"].fillna("").tolist() == ["bueno", "malo", "", "ok"]
+        assert scored.loc[2, "error"] == "El texto no puede estar vacío"
+        assert pd.isna(scored.loc[0, "error"])
+        assert scored["score"].dtype == "float64"
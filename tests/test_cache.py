@@ -0,0 +1,142 @@
+import time
+
+import pytest
+
+from src.analyzer.cache import CachedSentimentAnalyzer, ResultCache, normalize_text, text_hash
+from src.analyzer.result_store import ResultStore
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from tests.test_sentiment_analyzer import FakeModel
+
+
+class CountingModel(FakeModel):
+    """FakeModel que cuenta los textos que analiza."""
+
+    def __init__(self):
+        super().__init__(sentiment="positivo", probas=[0.8, 0.15, 0.05])
+        self.scored = []
+
+    def predict_with_proba(self, texts):
+        self.scored.extend(texts)
+        return super().predict_with_proba(texts)
+
+
+def cached_analyzer(model, cache=None, version=1) -> CachedSentimentAnalyzer:
+    return CachedSentimentAnalyzer(SentimentAnalyzer(model), cache or ResultCache(), "fake", version)
+
+
+class TestResultCache:
+    def test_get_returns_stored_value(self):
+        cache = ResultCache(max_entries=10)
+        cache.put("a", {"sentiment": "positivo"})
+
+        assert cache.get("a") == {"sentiment": "positivo"}
+        assert cache.stats()["hits"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+
+        cache.put("c", {})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entries_are_not_returned(self):
+        cache = ResultCache(max_entries=10, ttl_seconds=0.01)
+        cache.put("a", {})
+
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_invalidate_removes_only_given_model(self):
+        cache = ResultCache(max_entries=10)
+        cache.put(("lr", 1, "x"), {})
+        cache.put(("rf", 1, "x"), {})
+
+        removed = cache.invalidate("lr")
+
+        assert removed == 1
+        assert cache.get(("rf", 1, "x")) is not None
+
+
+class TestCachedSentimentAnalyzer:
+    def test_repeated_text_is_scored_once(self):
+        model = CountingModel()
+        analyzer = cached_analyzer(model)
+
+        first = analyzer.analyze("Gracias")
+        second = analyzer.analyze("  GRACIAS ")
+
+        assert first == second
+        assert model.scored == ["Gracias"]
+
+    def test_duplicates_in_batch_are_scored_once(self):
+        model = CountingModel()
+        analyzer = cached_analyzer(model)
+
+        results = analyzer.analyze_many(["ok", "Ok", "bien"])
+
+        assert len(results) == 3
+        assert model.scored == ["ok", "bien"]
+
+    def test_invalid_texts_keep_their_error(self):
+        analyzer = cached_analyzer(CountingModel())
+
+        results = analyzer.analyze_many(["ok", ""])
+
+        assert results[1] == {"error": "El texto no puede estar vacío"}
+        with pytest.raises(ValueError, match="texto no puede estar vacío"):
+            analyzer.analyze(" ")
+
+    def test_new_model_version_does_not_reuse_results(self):
+        cache = ResultCache()
+        model = CountingModel()
+        cached_analyzer(model, cache, version=1).analyze("Gracias")
+
+        cached_analyzer(model, cache, version=2).analyze("Gracias")
+
+        assert model.scored == ["Gracias", "Gracias"]
+
+    def test_returned_results_do_not_share_state_with_cache(self):
+        analyzer = cached_analyzer(CountingModel())
+        analyzer.analyze("Gracias")["confidence"]["positivo"] = 0
+
+        assert analyzer.analyze("Gracias")["confidence"]["positivo"] == 0.8
+
+
+def test_normalize_text_collapses_case_and_spaces():
+    assert normalize_text("  Muy   BUENO\n") == "muy bueno"
+
+
+class TestCachedSentimentAnalyzerWithStore:
+    def test_results_are_reused_from_store_after_restart(self, tmp_path):
+        store = ResultStore(tmp_path / "results.sqlite")
+        first = CountingModel()
+        CachedSentimentAnalyzer(SentimentAnalyzer(first), ResultCache(), "fake", 1, store=store).analyze_many(["ok", "bien"])
+
+        # Un proceso nuevo: cache en memoria vacío, mismo store
+        second = CountingModel()
+        analyzer = CachedSentimentAnalyzer(SentimentAnalyzer(second), ResultCache(), "fake", 1, store=store)
+        results = analyzer.analyze_many(["OK", "bien", "nuevo", ""])
+
+        assert second.scored == ["nuevo"]
+        assert results[0] == results[1]
+        assert results[3] == {"error": "El texto no puede estar vacío"}
+        assert store.get_many("fake", 1, [text_hash("nuevo")]) != {}
+        store.close()
+
+    def test_store_errors_fall_back_to_the_model(self, tmp_path):
+        store = ResultStore(tmp_path / "results.sqlite")
+        store.close()
+        (tmp_path / "results.sqlite").unlink()
+        (tmp_path / "results.sqlite").mkdir()
+        model = CountingModel()
+        analyzer = CachedSentimentAnalyzer(SentimentAnalyzer(model), ResultCache(), "fake", 1, store=store)
+
+        assert analyzer.analyze("Gracias")["sentiment"] == "positivo"
+        assert model.scored == ["Gracias"]
@@ -0,0 +1,82 @@
+import pytest
+
+from src.analyzer.cascade import CascadeAnalyzer
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.metrics import CASCADE_TEXTS_TOTAL
+from tests.test_sentiment_analyzer import FakeModel
+
+
+class DoubtfulModel(FakeModel):
+    """Modelo falso: positivo, pero poco seguro si el texto dice 'dudoso'."""
+
+    def predict_proba(self, texts):
+        # Columnas en el orden de SENTIMENTS: positivo, neutral, negativo
+        return [[0.5, 0.3, 0.2] if "dudoso" in text else [0.9, 0.05, 0.05] for text in texts]
+
+
+class CountingAnalyzer(SentimentAnalyzer):
+    """SentimentAnalyzer que registra los lotes que recibe."""
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.batches = []
+
+    def analyze_many(self, texts):
+        self.batches.append(list(texts))
+        return super().analyze_many(texts)
+
+
+@pytest.fixture
+def analyzers():
+    primary = CountingAnalyzer(DoubtfulModel(sentiment="positivo"))
+    secondary = CountingAnalyzer(FakeModel(sentiment="negativo", probas=[0.1, 0.1, 0.8]))
+    return primary, secondary
+
+
+def make_cascade(analyzers, **options) -> CascadeAnalyzer:
+    primary, secondary = analyzers
+    return CascadeAnalyzer(lambda: primary, lambda: secondary, **{'threshold': 0.8, **options})
+
+
+class TestCascadeAnalyzer:
+    def test_confident_texts_are_answered_by_the_primary(self, analyzers):
+        cascade = make_cascade(analyzers)
+
+        result = cascade.analyze("Excelente")
+
+        assert result['stage'] == 'primary'
+        assert result['sentiment'] == 'positivo'
+        assert analyzers[1].batches == []
+
+    def test_uncertain_texts_are_escalated_and_merged(self, analyzers):
+        cascade = make_cascade(analyzers, secondary_weight=0.5)
+
+        result = cascade.analyze("Algo dudoso")
+
+        assert result['stage'] == 'secondary'
+        assert result['sentiment'] == 'negativo'
+        assert result['confidence']['positivo'] == pytest.approx(0.3)
+        assert result['score'] == pytest.approx(0.5)
+
+    def test_only_uncertain_texts_reach_the_secondary(self, analyzers):
+        cascade = make_cascade(analyzers)
+
+        results = cascade.analyze_many(["Bien", "dudoso 1", "", "Muy bien", "dudoso 2"])
+
+        assert [result.get('stage') for result in results] == ['primary', 'secondary', None, 'primary', 'secondary']
+        assert results[2]['error'] == "El texto no puede estar vacío"
+        assert analyzers[0].batches == [["Bien", "dudoso 1", "", "Muy bien", "dudoso 2"]]
+        assert analyzers[1].batches == [["dudoso 1", "dudoso 2"]]
+
+    def test_stats_and_metrics_track_escalation_rate(self, analyzers):
+        cascade = make_cascade(analyzers)
+        escalated_before = CASCADE_TEXTS_TOTAL.value(stage='secondary')
+
+        cascade.analyze_many(["Bien", "dudoso", "Genial", "Excelente"])
+
+        assert cascade.stats()['escalation_rate'] == pytest.approx(0.25)
+        assert CASCADE_TEXTS_TOTAL.value(stage='secondary') == escalated_before + 1
+
+    def test_invalid_text_raises(self, analyzers):
+        with pytest.raises(ValueError):
+            make_cascade(analyzers).analyze("   ")
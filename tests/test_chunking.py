@@ -0,0 +1,115 @@
+import pytest
+
+from src.analyzer.cache import CachedSentimentAnalyzer, ResultCache
+from src.analyzer.chunking import analyze_long, chunk_spans, sentence_spans
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.settings import LONG_TEXT_MAX_CHARS
+from tests.test_sentiment_analyzer import FakeModel
+
+
+class KeywordModel(FakeModel):
+    """Modelo falso: negativo si el texto dice 'malo', positivo si no."""
+    
+    def predict(self, texts):
+        return [self._sentiment_of(text) for text in texts]
+    
+    def predict_proba(self, texts):
+        # Columnas en el orden de SENTIMENTS: positivo, neutral, negativo
+        return [[0.05, 0.05, 0.9] if self._sentiment_of(text) == "negativo" else [0.8, 0.1, 0.1] for text in texts]
+    
+    @staticmethod
+    def _sentiment_of(text):
+        return "negativo" if "malo" in text else "positivo"
+
+
+class TestChunkSpans:
+    def test_sentences_are_split_on_punctuation_and_newlines(self):
+        text = "  Hola. ¿Cómo va?\nTodo bien!  "
+        
+        sentences = [text[span.start:span.end] for span in sentence_spans(text)]
+        
+        assert sentences == ["Hola.", "¿Cómo va?", "Todo bien!"]
+    
+    def test_decimal_points_do_not_split_sentences(self):
+        text = "Pagué 10.50 por el envío. Llegó tarde."
+        
+        sentences = [text[span.start:span.end] for span in sentence_spans(text)]
+        
+        assert sentences == ["Pagué 10.50 por el envío.", "Llegó tarde."]
+    
+    def test_consecutive_sentences_are_packed_up_to_max_chars(self):
+        text = "Uno dos. Tres cuatro. Cinco seis. Siete ocho."
+        
+        chunks = [text[span.start:span.end] for span in chunk_spans(text, max_chars=25)]
+        
+        assert chunks == ["Uno dos. Tres cuatro.", "Cinco seis. Siete ocho."]
+    
+    def test_long_sentences_are_split_into_word_windows(self):
+        text = " ".join(["palabra"] * 50)
+        
+        spans = chunk_spans(text, max_chars=40)
+        
+        assert len(spans) > 1
+        assert all(len(span) <= 40 for span in spans)
+        assert " ".join(text[span.start:span.end] for span in spans) == text
+    
+    def test_number_of_chunks_is_bounded_by_length(self):
+        text = "Ok. " * 2000
+        
+        spans = chunk_spans(text, max_chars=100)
+        
+        assert len(spans) <= 2 * len(text) / 100 + 1
+
+
+class TestAnalyzeLong:
+    def test_aggregates_chunks_weighted_by_length(self):
+        analyzer = SentimentAnalyzer(KeywordModel())
+        text = "Todo excelente, muy contento con la compra. " * 15 + "El envío fue malo."
+        
+        result = analyze_long(analyzer, text)
+        
+        assert result["sentiment"] == "positivo"
+        assert result["confidence"]["positivo"] > result["confidence"]["negativo"] > 0.1
+        assert sum(result["confidence"].values()) == pytest.approx(1.0)
+    
+    def test_reports_most_negative_spans_with_positions(self):
+        analyzer = SentimentAnalyzer(KeywordModel())
+        sentences = ["Buen producto." * 40, "El soporte fue malo y nadie respondió." * 10, "Precio justo." * 40]
+        text = "\n".join(sentences)
+        
+        result = analyzer.analyze_long(text, top_k=2)
+        
+        assert result["chunks"] >= 3
+        assert 0 < len(result["negative_spans"]) <= 2
+        for span in result["negative_spans"]:
+            assert text[span["start"]:span["end"]] == span["text"]
+            assert "malo" in span["text"]
+    
+    def test_analyzes_all_chunks_in_one_batch(self):
+        calls = []
+        model = KeywordModel()
+        original = model.predict_with_proba
+        model.predict_with_proba = lambda texts: calls.append(len(texts)) or original(texts)
+        text = "Una oración bastante larga para el chunk. " * 100
+        
+        result = SentimentAnalyzer(model).analyze_long(text)
+        
+        assert calls == [result["chunks"]]
+    
+    def test_rejects_empty_and_too_long_texts(self):
+        analyzer = SentimentAnalyzer(KeywordModel())
+        
+        with pytest.raises(ValueError):
+            analyzer.analyze_long("   ")
+        with pytest.raises(ValueError):
+            analyzer.analyze_long("a" * (LONG_TEXT_MAX_CHARS + 1))
+    
+    def test_cached_analyzer_supports_long_texts(self):
+        analyzer = CachedSentimentAnalyzer(SentimentAnalyzer(KeywordModel()), ResultCache(), "fake", 1)
+        text = "Producto malo. " * 100
+        
+        first = analyzer.analyze_long(text)
+        second = analyzer.analyze_long(text)
+        
+        assert first == second
+        assert first["sentiment"] == "negativo"
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from src.model.compiled import CompiledLinearScorer, CompiledTfidfVectorizer
+from src.model.logistic_regression_model import LogisticRegressionModel
+
+DATA_PATH = Path("data/reviews.csv")
+
+EDGE_TEXTS = [
+    "",
+    "!!! ??? ...",
+    "xyzzy qwerty asdfgh",
+    "Excelente SERVICIO, MUY RÁPIDO",
+    "pésimo, lentísimo y caro",
+    "no  me   gustó\tnada\n",
+    "a",
+    "muy muy muy muy bueno bueno",
+]
+
+
+@pytest.fixture(scope="module")
+def texts():
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    return pd.read_csv(DATA_PATH)["message"].tolist()[:200] + EDGE_TEXTS
+
+
+@pytest.fixture(scope="module")
+def labels():
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    return pd.read_csv(DATA_PATH)
+
+
+def fit_pipeline(labels, classes=None, **vectorizer_options) -> Pipeline:
+    df = labels if classes is None else labels[labels["sentiment"].isin(classes)]
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer(**vectorizer_options)),
+        ('classifier', LogisticRegression(max_iter=1000)),
+    ])
+    return pipeline.fit(df["message"], df["sentiment"])
+
+
+class TestCompiledLinearScorerParity:
+    @pytest.mark.parametrize("options", [
+        {'max_features': 5000, 'ngram_range': (1, 2)},
+        {'sublinear_tf': True, 'ngram_range': (1, 3)},
+        {'norm': None, 'strip_accents': 'unicode'},
+        {'lowercase': False, 'stop_words': ['de', 'la', 'el']},
+    ])
+    def test_matches_sklearn(self, labels, texts, options):
+        pipeline = fit_pipeline(labels, **options)
+        scorer = CompiledLinearScorer.from_pipeline(pipeline)
+
+        np.testing.assert_allclose(scorer.predict_proba(texts), pipeline.predict_proba(texts), atol=1e-10)
+
+    def test_binary_matches_sklearn(self, labels, texts):
+        pipeline = fit_pipeline(labels, classes=["positivo", "negativo"])
+        scorer = CompiledLinearScorer.from_pipeline(pipeline)
+
+        assert scorer.classes == pipeline.classes_.tolist()
+        np.testing.assert_allclose(scorer.predict_proba(texts), pipeline.predict_proba(texts), atol=1e-10)
+
+    def test_features_match_sklearn_transform(self, labels, texts):
+        pipeline = fit_pipeline(labels, ngram_range=(1, 2))
+        vectorizer = CompiledTfidfVectorizer.from_sklearn(pipeline[0])
+        expected = pipeline[0].transform(texts).toarray()
+
+        for row, text in enumerate(texts):
+            dense = np.zeros(vectorizer.n_features)
+            indexes, weights = vectorizer.features(text)
+            dense[indexes] = weights
+            np.testing.assert_allclose(dense, expected[row], atol=1e-12)
+
+
+class TestCompiledLinearScorerUnsupported:
+    def test_rejects_char_analyzer(self, labels):
+        pipeline = fit_pipeline(labels, analyzer='char')
+        with pytest.raises(ValueError):
+            CompiledLinearScorer.from_pipeline(pipeline)
+
+    def test_rejects_non_tfidf_pipeline(self, labels):
+        pipeline = Pipeline([
+            ('counts', CountVectorizer()),
+            ('classifier', LogisticRegression(max_iter=1000)),
+        ]).fit(labels["message"], labels["sentiment"])
+        with pytest.raises(ValueError):
+            CompiledLinearScorer.from_pipeline(pipeline)
+
+
+class TestCompiledLogisticRegressionModel:
+    def test_compiled_model_matches_sklearn_model(self, labels, texts):
+        pipeline = fit_pipeline(labels, max_features=5000, ngram_range=(1, 2))
+        compiled = LogisticRegressionModel(pipeline, compiled=True)
+        plain = LogisticRegressionModel(pipeline)
+
+        assert compiled.is_compiled
+        assert not plain.is_compiled
+        assert compiled.predict(texts) == plain.predict(texts)
+        np.testing.assert_allclose(compiled.predict_proba(texts), plain.predict_proba(texts), atol=1e-10)
+        assert compiled.predict_with_proba(texts)[0] == plain.predict_with_proba(texts)[0]
+
+    def test_unsupported_pipeline_falls_back_to_sklearn(self, labels, texts):
+        pipeline = fit_pipeline(labels, analyzer='char')
+        model = LogisticRegressionModel(pipeline, compiled=True)
+
+        assert not model.is_compiled
+        assert model.predict(texts[:5]) == pipeline.predict(texts[:5]).tolist()
@@ -0,0 +1,43 @@
+import threading
+import time
+
+import pytest
+
+from src.model.file_lock import FileLock
+
+
+class TestFileLock:
+    def test_second_lock_times_out_while_first_is_held(self, tmp_path):
+        lock_path = tmp_path / "model.lock"
+        
+        with FileLock(lock_path):
+            with pytest.raises(TimeoutError):
+                FileLock(lock_path, timeout=0.2, poll_interval=0.05).acquire()
+    
+    def test_lock_can_be_taken_after_release(self, tmp_path):
+        lock_path = tmp_path / "model.lock"
+        
+        with FileLock(lock_path):
+            pass
+        
+        with FileLock(lock_path, timeout=0.2):
+            assert lock_path.exists()
+    
+    def test_waiting_lock_is_acquired_when_released(self, tmp_path):
+        lock_path = tmp_path / "model.lock"
+        order = []
+        first = FileLock(lock_path)
+        first.acquire()
+        
+        def waiter():
+            with FileLock(lock_path, timeout=5, poll_interval=0.01):
+                order.append("waiter")
+        
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.1)
+        order.append("first")
+        first.release()
+        thread.join()
+        
+        assert order == ["first", "waiter"]
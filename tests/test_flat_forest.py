@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+import src.model.flat_forest as flat_forest_module
+from src.model.flat_forest import FlatForest, flat_path
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.random((600, 20))
+    # Muchos ceros, como una matriz TF-IDF
+    X[X < 0.6] = 0
+    y = np.array(["negativo", "neutral", "positivo"])[(X[:, 0] + X[:, 1] * 2 + rng.random(600)).astype(int) % 3]
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def forest(data):
+    X, y = data
+    return RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(X, y)
+
+
+class TestFlatForest:
+    def test_predict_proba_matches_sklearn(self, forest, data):
+        X, _ = data
+        flat = FlatForest.from_sklearn(forest)
+        
+        np.testing.assert_allclose(flat.predict_proba(X), forest.predict_proba(X))
+    
+    def test_parallel_chunks_match_sequential(self, forest, data, monkeypatch):
+        X, _ = data
+        flat = FlatForest.from_sklearn(forest)
+        expected = flat.predict_proba(X)
+        
+        monkeypatch.setattr(flat_forest_module, "FLAT_FOREST_CHUNK_ROWS", 64)
+        monkeypatch.setattr(flat_forest_module, "FLAT_FOREST_PARALLEL_MIN_ROWS", 1)
+        monkeypatch.setattr(flat_forest_module.os, "cpu_count", lambda: 4)
+        
+        assert FlatForest.n_jobs_for(len(X)) == 4
+        np.testing.assert_array_equal(flat.predict_proba(X), expected)
+    
+    def test_single_leaf_trees(self):
+        X = np.zeros((10, 3))
+        y = ["positivo"] * 5 + ["negativo"] * 5
+        forest = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y)
+        flat = FlatForest.from_sklearn(forest)
+        
+        assert flat.max_depth == 0
+        np.testing.assert_allclose(flat.predict_proba(X), forest.predict_proba(X))
+    
+    def test_empty_batch(self, forest):
+        flat = FlatForest.from_sklearn(forest)
+        
+        assert flat.predict_proba(np.zeros((0, 20))).shape == (0, 3)
+    
+    def test_small_batches_run_on_one_thread(self):
+        assert FlatForest.n_jobs_for(1) == 1
+    
+    def test_save_and_load_with_mmap(self, forest, data, tmp_path):
+        X, _ = data
+        path = flat_path(tmp_path / "model.pkl")
+        FlatForest.from_sklearn(forest).save(path)
+        
+        loaded = FlatForest.load(path, mmap_mode="r")
+        
+        assert path.name == "model.flat.joblib"
+        assert isinstance(loaded.feature, np.memmap)
+        np.testing.assert_allclose(loaded.predict_proba(X), forest.predict_proba(X))
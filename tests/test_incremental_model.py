@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from sklearn.linear_model import SGDClassifier
+
+from src.model.incremental_model import IncrementalModel, _training_rows
+from src.model.base import Model
+
+DATA_PATH = Path("data/reviews.csv")
+
+
+class TestIncrementalModelIntegration:
+    @pytest.fixture
+    def trained_model(self, tmp_path: Path) -> IncrementalModel:
+        """Entrena un modelo temporal para tests."""
+        if not DATA_PATH.exists():
+            pytest.skip("reviews.csv no encontrado")
+        
+        return IncrementalModel.train(str(DATA_PATH), str(tmp_path / "model.pkl"), chunksize=1000)
+    
+    def test_train_creates_model_file_without_checkpoint(self, tmp_path):
+        output_path = tmp_path / "model.pkl"
+        
+        IncrementalModel.train(str(DATA_PATH), str(output_path), chunksize=1000)
+        
+        assert output_path.exists()
+        assert not Path(f"{output_path}.checkpoint").exists()
+    
+    def test_predict_returns_valid_sentiment(self, trained_model: Model):
+        result = trained_model.predict(["Me encanta este producto", "Pésimo servicio"])
+        
+        assert all(s in ["positivo", "neutral", "negativo"] for s in result)
+    
+    def test_classes_use_pipeline_order(self, trained_model: Model):
+        assert trained_model.classes == ["negativo", "neutral", "positivo"]
+    
+    def test_holdout_accuracy(self, trained_model: IncrementalModel):
+        df = pd.read_csv(DATA_PATH)
+        holdout = df.drop(_training_rows(df).index)
+        
+        predicted = np.array(trained_model.predict(holdout["message"].tolist()))
+        
+        assert len(holdout) > 0
+        assert (predicted == holdout["sentiment"].to_numpy()).mean() > 0.8
+    
+    def test_load_with_mmap_mode_predicts_same(self, tmp_path):
+        output_path = tmp_path / "model.pkl"
+        trained = IncrementalModel.train(str(DATA_PATH), str(output_path), chunksize=1000)
+        
+        loaded = IncrementalModel.load(output_path, mmap_mode="r")
+        
+        texts = ["Excelente atención", "Pésimo servicio"]
+        assert loaded.predict_proba(texts) == trained.predict_proba(texts)
+        assert loaded.rows_seen == trained.rows_seen
+    
+    def test_interrupted_training_resumes_from_checkpoint(self, tmp_path, monkeypatch):
+        output_path = tmp_path / "model.pkl"
+        expected = IncrementalModel.train(str(DATA_PATH), str(tmp_path / "full.pkl"), chunksize=1000)
+        
+        partial_fit = SGDClassifier.partial_fit
+        calls = []
+        
+        def failing_partial_fit(self, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return partial_fit(self, *args, **kwargs)
+        
+        monkeypatch.setattr(SGDClassifier, "partial_fit", failing_partial_fit)
+        with pytest.raises(KeyboardInterrupt):
+            IncrementalModel.train(str(DATA_PATH), str(output_path), chunksize=1000)
+        assert Path(f"{output_path}.checkpoint").exists()
+        
+        monkeypatch.setattr(SGDClassifier, "partial_fit", partial_fit)
+        resumed = IncrementalModel.train(str(DATA_PATH), str(output_path), chunksize=1000)
+        
+        texts = ["Excelente atención", "Pésimo servicio"]
+        assert resumed.rows_seen == expected.rows_seen
+        np.testing.assert_allclose(resumed.predict_proba(texts), expected.predict_proba(texts))
+    
+    def test_update_trains_only_on_new_data(self, trained_model: IncrementalModel, tmp_path):
+        new_data = tmp_path / "new.csv"
+        pd.DataFrame({
+            "id": range(6),
+            "sentiment": ["positivo", "negativo", "neutral", "otro", None, "positivo"],
+            "message": ["Excelente", "Horrible", "Normal", "Sin etiqueta válida", "Sin etiqueta", None],
+        }).to_csv(new_data, index=False)
+        before = trained_model.predict_proba(["Excelente"])
+        
+        updated = trained_model.update(str(new_data), str(tmp_path / "updated.pkl"))
+        
+        assert updated.rows_seen == trained_model.rows_seen + len(_training_rows(pd.read_csv(new_data)))
+        assert trained_model.predict_proba(["Excelente"]) == before
+        assert IncrementalModel.load(tmp_path / "updated.pkl").rows_seen == updated.rows_seen
+    
+    def test_update_without_valid_rows_raises(self, trained_model: IncrementalModel, tmp_path):
+        new_data = tmp_path / "new.csv"
+        pd.DataFrame({"id": [0], "sentiment": ["otro"], "message": ["Hola"]}).to_csv(new_data, index=False)
+        
+        with pytest.raises(ValueError):
+            trained_model.update(str(new_data), str(tmp_path / "updated.pkl"))
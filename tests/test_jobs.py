@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+
+from src.analyzer.jobs import JobManager, read_texts
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from tests.test_sentiment_analyzer import FakeModel
+
+TEXTS = ["Excelente", "Malo", "", "Bien", "Gracias", "Nunca más"]
+
+ANALYZER = SentimentAnalyzer(FakeModel(sentiment="positivo", probas=[0.85, 0.10, 0.05]))
+
+
+class RecordingAnalysis:
+    """analyze_many(model, texts) que registra los chunks y puede frenar en uno."""
+
+    def __init__(self, block_on_call: int = 0):
+        self.chunks = []
+        self.gate = threading.Event()
+        self._block_on_call = block_on_call
+
+    def __call__(self, model, texts):
+        self.chunks.append(texts)
+        if len(self.chunks) == self._block_on_call:
+            self.gate.wait(5)
+        return ANALYZER.analyze_many(texts)
+
+
+def make_manager(path, analyze_many, **options) -> JobManager:
+    return JobManager(analyze_many, path=path, chunk_size=2, poll_interval=0.01, **options)
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timeout"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "jobs.sqlite"
+
+
+class TestJobManager:
+    def test_job_is_scored_in_chunks(self, path):
+        analysis = RecordingAnalysis()
+        manager = make_manager(path, analysis)
+
+        job = manager.submit(TEXTS, "logistic_regression")
+        wait_until(lambda: manager.status(job['id'])['status'] == 'done')
+
+        status = manager.status(job['id'])
+        assert analysis.chunks == [TEXTS[0:2], TEXTS[2:4], TEXTS[4:6]]
+        assert status['processed'] == 6
+        assert status['errors'] == 1
+        assert status['eta_seconds'] is None
+        results = manager.results(job['id'], offset=2, limit=3)
+        assert [result['index'] for result in results] == [2, 3, 4]
+        assert results[0] == {'index': 2, 'error': "El texto no puede estar vacío"}
+        manager.stop()
+
+    def test_stopped_job_is_resumed_from_last_chunk_after_restart(self, path):
+        first_analysis = RecordingAnalysis(block_on_call=2)
+        first = make_manager(path, first_analysis)
+        job = first.submit(TEXTS, "logistic_regression")
+        wait_until(lambda: len(first_analysis.chunks) == 2)
+
+        first.stop(timeout=0)
+        first_analysis.gate.set()
+        wait_until(lambda: first.status(job['id'])['status'] == 'queued')
+        assert first.status(job['id'])['processed'] == 4
+
+        second_analysis = RecordingAnalysis()
+        second = make_manager(path, second_analysis)
+        second.start()
+        wait_until(lambda: second.status(job['id'])['status'] == 'done')
+
+        assert second_analysis.chunks == [TEXTS[4:6]]
+        assert len(second.results(job['id'], limit=10)) == 6
+        second.stop()
+
+    def test_job_of_a_stalled_process_is_taken_over_after_its_lease(self, path):
+        stalled_analysis = RecordingAnalysis(block_on_call=1)
+        stalled = make_manager(path, stalled_analysis, lease_seconds=0.1)
+        job = stalled.submit(TEXTS, "logistic_regression")
+        wait_until(lambda: len(stalled_analysis.chunks) == 1)
+
+        other_analysis = RecordingAnalysis()
+        other = make_manager(path, other_analysis)
+        other.start()
+        wait_until(lambda: other.status(job['id'])['status'] == 'done')
+        stalled_analysis.gate.set()
+        stalled.stop()
+
+        assert other_analysis.chunks[0] == TEXTS[0:2]
+        assert other.status(job['id'])['processed'] == 6
+        other.stop()
+
+    def test_analysis_errors_mark_the_job_as_failed(self, path):
+        def broken(model, texts):
+            raise RuntimeError("modelo no disponible")
+
+        manager = make_manager(path, broken)
+        job = manager.submit(TEXTS, "logistic_regression")
+        wait_until(lambda: manager.status(job['id'])['status'] == 'failed')
+
+        assert manager.status(job['id'])['error'] == "modelo no disponible"
+        assert manager.pending() == 0
+        manager.stop()
+
+    def test_finished_jobs_are_purged_after_retention(self, path):
+        manager = make_manager(path, RecordingAnalysis(), retention_seconds=0)
+        job = manager.submit(["Hola"], "logistic_regression")
+        wait_until(lambda: manager.status(job['id']) is None)
+        manager.stop()
+
+    def test_empty_job_is_rejected(self, path):
+        with pytest.raises(ValueError):
+            make_manager(path, RecordingAnalysis()).submit([], "logistic_regression")
+
+
+class TestReadTexts:
+    def test_csv_reads_given_column(self):
+        body = '﻿id,message\n1,"Malo, muy malo"\n2,\n'.encode("utf-8")
+
+        assert read_texts(body, "text/csv") == ["Malo, muy malo", ""]
+
+    def test_csv_without_column_raises(self):
+        with pytest.raises(ValueError, match="columna 'texto'"):
+            read_texts(b"message\nHola\n", "text/csv", column="texto")
+
+    def test_jsonl_accepts_objects_and_strings(self):
+        body = '{"message": "Excelente"}\n\n"Pésimo"\n'.encode("utf-8")
+
+        assert read_texts(body, "application/x-ndjson") == ["Excelente", "Pésimo"]
+
+    def test_invalid_jsonl_line_raises(self):
+        with pytest.raises(ValueError, match="Línea 1"):
+            read_texts(b'"ok"\n{roto\n', "application/x-ndjson")
+
+    def test_plain_text_has_one_comment_per_line(self):
+        assert read_texts("Hola\n\nChau\n".encode("utf-8"), "text/plain") == ["Hola", "Chau"]
+
+    def test_unknown_format_raises(self):
+        with pytest.raises(ValueError, match="Formato no soportado"):
+            read_texts(b"<a/>", "application/xml")
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from pathlib import Path
 
@@ -65,4 +66,39 @@ class TestLogisticRegressionModelIntegration:
     def test_predict_proba_all_positive_values(self, trained_model: Model):
         result = trained_model.predict_proba(["Cualquier texto"])
         
-        assert all(p >= 0 for p in result[0])
\ No newline at end of file
+        assert all(p >= 0 for p in result[0])
+    
+    def test_predict_with_proba_matches_predict(self, trained_model: Model):
+        texts = ["Excelente atención", "Pésimo servicio", "Llegó el pedido"]
+        
+        sentiments, probas = trained_model.predict_with_proba(texts)
+        
+        assert sentiments == trained_model.predict(texts)
+        assert all(p[s] == max(p.values()) for s, p in zip(sentiments, probas))
+    
+    def test_predict_with_proba_uses_pipeline_class_order(self, trained_model: Model):
+        _, probas = trained_model.predict_with_proba(["Buen producto"])
+        
+        expected = dict(zip(trained_model.classes, trained_model.predict_proba(["Buen producto"])[0]))
+        assert probas[0] == pytest.approx(expected)
+    
+    def test_load_with_mmap_mode_predicts_same_as_regular_load(self, tmp_path):
+        data_path = Path("data/reviews.csv")
+        output_path = tmp_path / "test_model.pkl"
+        LogisticRegressionModel.train(str(data_path), str(output_path))
+        
+        regular = LogisticRegressionModel.load(output_path)
+        mapped = LogisticRegressionModel.load(output_path, mmap_mode="r")
+        
+        texts = ["Excelente atención", "Pésimo servicio"]
+        assert mapped.predict_proba(texts) == regular.predict_proba(texts)
+    
+    def test_load_with_mmap_mode_maps_arrays_from_file(self, tmp_path):
+        output_path = tmp_path / "test_model.pkl"
+        LogisticRegressionModel.train("data/reviews.csv", str(output_path))
+        
+        loaded = LogisticRegressionModel.load(output_path, mmap_mode="r")
+        
+        coef = loaded._pipeline.named_steps["classifier"].coef_
+        assert isinstance(coef, np.memmap)
+        assert not coef.flags.writeable
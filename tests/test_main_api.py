@@ -0,0 +1,284 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.main_api as main_api
+from src.analyzer.cascade import CascadeAnalyzer
+from src.analyzer.jobs import JobManager
+from src.analyzer.registry import AnalyzerRegistry
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.analyzer.triage import TriageQueue
+from tests.test_registry import CountingModel
+from tests.test_sentiment_analyzer import FakeModel
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path) -> TestClient:
+    """Cliente de la API con un modelo falso para no entrenar en los tests."""
+    analyzer = SentimentAnalyzer(FakeModel(sentiment="positivo", probas=[0.85, 0.10, 0.05]))
+    monkeypatch.setattr(main_api, "get_analyzer", lambda model_type: analyzer)
+    jobs = JobManager(
+        lambda model, texts: main_api.analyze_many(main_api.ModelType(model), texts),
+        path=tmp_path / "jobs.sqlite", chunk_size=2, poll_interval=0.01,
+    )
+    monkeypatch.setattr(main_api, "jobs", jobs)
+    yield TestClient(main_api.app)
+    jobs.stop()
+
+
+class TestMainApi:
+    def test_health_returns_ok(self, client: TestClient):
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+    
+    def test_analyze_returns_sentiment(self, client: TestClient):
+        response = client.post("/analyze", json={"text": "Excelente servicio"})
+        
+        assert response.status_code == 200
+        assert response.json()["sentiment"] == "positivo"
+        assert response.json()["score"] == 0.85
+    
+    def test_analyze_omits_stage_outside_the_cascade(self, client: TestClient):
+        response = client.post("/analyze", json={"text": "Excelente servicio"})
+        
+        assert "stage" not in response.json()
+    
+    def test_analyze_with_cascade_reports_answering_stage(self, client: TestClient, monkeypatch):
+        cascade = CascadeAnalyzer(
+            lambda: SentimentAnalyzer(FakeModel(sentiment="positivo", probas=[0.5, 0.3, 0.2])),
+            lambda: SentimentAnalyzer(FakeModel(sentiment="negativo", probas=[0.1, 0.1, 0.8])),
+            threshold=0.8,
+        )
+        monkeypatch.setattr(main_api, "get_analyzer", lambda model_type: cascade)
+        
+        response = client.post("/analyze", json={"text": "No sé qué pensar", "model": "cascade"})
+        
+        assert response.status_code == 200
+        assert response.json()["stage"] == "secondary"
+        assert client.get("/metrics/cascade").status_code == 200
+    
+    def test_analyze_batch_returns_result_per_text(self, client: TestClient):
+        response = client.post("/analyze/batch", json={"texts": ["Excelente", "Muy bueno"]})
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["index"] for r in results] == [0, 1]
+        assert all(r["sentiment"] == "positivo" for r in results)
+    
+    def test_analyze_batch_reports_per_item_errors(self, client: TestClient):
+        response = client.post("/analyze/batch", json={"texts": ["Excelente", "   "]})
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["error"] is None
+        assert results[1]["error"] == "El texto no puede estar vacío"
+        assert results[1]["sentiment"] is None
+    
+    def test_analyze_batch_rejects_empty_list(self, client: TestClient):
+        response = client.post("/analyze/batch", json={"texts": []})
+        
+        assert response.status_code == 422
+    
+    def test_analyze_long_returns_aggregate_and_chunk_count(self, client: TestClient):
+        text = "El pedido llegó bien y a tiempo. " * 40
+        
+        response = client.post("/analyze/long", json={"text": text, "top_k": 2})
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["sentiment"] == "positivo"
+        assert body["chunks"] > 1
+        assert body["negative_spans"] == []
+    
+    def test_analyze_long_rejects_texts_over_the_limit(self, client: TestClient):
+        response = client.post("/analyze/long", json={"text": "a" * (main_api.LONG_TEXT_MAX_CHARS + 1)})
+        
+        assert response.status_code == 422
+    
+    def test_triage_ingests_valid_texts_and_lists_them(self, client: TestClient, monkeypatch):
+        monkeypatch.setattr(main_api, "triage", TriageQueue())
+        
+        response = client.post("/triage", json={"items": [{"text": "Sin respuesta", "id": "t-1"}, {"text": "  "}]})
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["id"] == "t-1"
+        assert results[0]["priority"] == 0.05
+        assert results[1]["error"] == "El texto no puede estar vacío"
+        
+        top = client.get("/triage/top", params={"k": 5}).json()["items"]
+        assert [case["id"] for case in top] == ["t-1"]
+        assert top[0]["model"] == "logistic_regression"
+        
+        page = client.get("/triage", params={"limit": 1}).json()
+        assert page["total"] == 1
+        assert page["next_cursor"] is None
+    
+    def test_triage_case_can_be_resolved(self, client: TestClient, monkeypatch):
+        monkeypatch.setattr(main_api, "triage", TriageQueue())
+        client.post("/triage", json={"items": [{"text": "Sin respuesta", "id": "t-1"}]})
+        
+        assert client.delete("/triage/t-1").status_code == 204
+        assert client.delete("/triage/t-1").status_code == 404
+        assert client.get("/triage/top").json()["items"] == []
+    
+    def test_triage_rejects_invalid_cursor(self, client: TestClient):
+        response = client.get("/triage", params={"cursor": "no-es-un-cursor"})
+        
+        assert response.status_code == 400
+    
+    def test_predict_returns_only_sentiment(self, client: TestClient):
+        response = client.post("/predict", json={"text": "Excelente servicio"})
+        
+        assert response.status_code == 200
+        assert response.json() == {"sentiment": "positivo"}
+    
+    def test_batching_metrics_are_reported_per_model(self, client: TestClient):
+        client.post("/analyze", json={"text": "Excelente servicio"})
+        
+        response = client.get("/metrics/batching")
+        
+        assert response.status_code == 200
+        assert response.json()["logistic_regression"]["items"] >= 1
+    
+    def test_prometheus_metrics_include_stage_timing_and_requests(self, client: TestClient):
+        client.post("/analyze", json={"text": "Excelente servicio"})
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'sentiment_analyze_seconds_count{model="model"}' in response.text
+        assert 'http_requests_total{method="POST",path="/analyze",status="200"}' in response.text
+        assert "sentiment_inference_pending" in response.text
+    
+    def test_analyze_returns_503_when_pool_is_saturated(self, client: TestClient):
+        with main_api.pool.reserve(main_api.pool.max_pending):
+            response = client.post("/analyze", json={"text": "Excelente servicio"})
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    
+    def test_analyze_batch_returns_503_when_pool_is_saturated(self, client: TestClient):
+        with main_api.pool.reserve(main_api.pool.max_pending):
+            response = client.post("/analyze/batch", json={"texts": ["Excelente"]})
+        
+        assert response.status_code == 503
+    
+    def test_analyze_stream_returns_one_ndjson_line_per_input_line(self, client: TestClient):
+        body = "\n".join([
+            json.dumps({"text": "Excelente"}),
+            json.dumps({"text": "Muy bueno", "model": "random_forest"}),
+            "",
+            json.dumps({"text": "Genial"}),
+        ])
+        
+        response = client.post("/analyze/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["index"] for r in results] == [0, 1, 3]
+        assert all(r["sentiment"] == "positivo" for r in results)
+    
+    def test_analyze_stream_reports_invalid_lines(self, client: TestClient):
+        body = "\n".join(["no es json", json.dumps({"text": ""}), json.dumps({"text": "Bien"})])
+        
+        response = client.post("/analyze/stream", content=body)
+        
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert results[0]["error"] is not None
+        assert results[1]["error"] is not None
+        assert results[2]["sentiment"] == "positivo"
+    
+    def test_analyze_stream_processes_input_in_chunks(self, client: TestClient, monkeypatch):
+        monkeypatch.setattr(main_api, "STREAM_CHUNK_SIZE", 2)
+        body = "\n".join(json.dumps({"text": f"Comentario {i}"}) for i in range(5))
+        
+        response = client.post("/analyze/stream", content=body)
+        
+        assert [json.loads(line)["index"] for line in response.text.splitlines()] == [0, 1, 2, 3, 4]
+    
+    def test_ready_reports_models_loaded_at_startup(self, monkeypatch, tmp_path):
+        fake_registry = AnalyzerRegistry()
+        fake_registry.register("fake", CountingModel, tmp_path / "model.pkl", "data.csv")
+        monkeypatch.setattr(main_api, "registry", fake_registry)
+        # El lifespan arranca los jobs: se usan unos en tmp_path para no crear jobs/ en el repo
+        jobs = JobManager(lambda model, texts: [], path=tmp_path / "jobs.sqlite")
+        monkeypatch.setattr(main_api, "jobs", jobs)
+        
+        with TestClient(main_api.app) as client:
+            deadline = time.monotonic() + 5
+            response = client.get("/ready")
+            while response.status_code != 200 and time.monotonic() < deadline:
+                time.sleep(0.01)
+                response = client.get("/ready")
+        jobs.stop()
+        
+        assert response.status_code == 200
+        assert response.json()["models"]["fake"]["state"] == "ready"
+    
+    def test_ready_returns_503_until_models_are_loaded(self, monkeypatch, tmp_path):
+        fake_registry = AnalyzerRegistry()
+        fake_registry.register("fake", CountingModel, tmp_path / "model.pkl", "data.csv")
+        monkeypatch.setattr(main_api, "registry", fake_registry)
+        
+        response = TestClient(main_api.app).get("/ready")
+        
+        assert response.status_code == 503
+        assert response.json()["models"]["fake"]["state"] == "pending"
+    
+    def test_job_from_json_is_scored_in_background_and_paged(self, client: TestClient):
+        response = client.post("/jobs", json={"texts": ["Excelente", "", "Muy bueno", "Gracias", "Bien"]})
+        
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        assert response.headers["location"] == f"/jobs/{job_id}"
+        
+        job = wait_for_job(client, job_id)
+        assert job["processed"] == 5
+        assert job["errors"] == 1
+        assert job["progress"] == 1.0
+        assert job["texts_per_second"] > 0
+        
+        page = client.get(f"/jobs/{job_id}", params={"offset": 1, "limit": 2}).json()
+        assert [result["index"] for result in page["results"]] == [1, 2]
+        assert page["results"][0]["error"] == "El texto no puede estar vacío"
+        assert page["results"][1]["sentiment"] == "positivo"
+        assert page["next_offset"] == 3
+    
+    def test_job_from_uploaded_csv(self, client: TestClient):
+        body = "id,message\n1,Excelente\n2,\"Malo, muy malo\"\n"
+        
+        response = client.post("/jobs", params={"model": "random_forest"}, content=body, headers={"Content-Type": "text/csv"})
+        
+        assert response.status_code == 202
+        assert response.json()["model"] == "random_forest"
+        job = wait_for_job(client, response.json()["id"])
+        assert job["total"] == 2
+        assert job["next_offset"] is None
+    
+    def test_job_rejects_missing_column_and_unknown_formats(self, client: TestClient):
+        csv_response = client.post("/jobs", params={"column": "texto"}, content="message\nHola\n", headers={"Content-Type": "text/csv"})
+        xml_response = client.post("/jobs", content="<a/>", headers={"Content-Type": "application/xml"})
+        empty_response = client.post("/jobs", json={"texts": []})
+        
+        assert csv_response.status_code == 400
+        assert xml_response.status_code == 415
+        assert empty_response.status_code == 422
+    
+    def test_unknown_job_returns_404(self, client: TestClient):
+        assert client.get("/jobs/no-existe").status_code == 404
+
+
+def wait_for_job(client: TestClient, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
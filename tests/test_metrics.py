@@ -0,0 +1,120 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.metrics import _Metric, ANALYZE_SECONDS, HTTP_REQUESTS_TOTAL, INVALID_TEXTS_TOTAL, TEXTS_TOTAL, Counter, Histogram, MetricsMiddleware, MetricsRegistry
+from tests.test_sentiment_analyzer import FakeModel
+
+
+class TestCounter:
+    def test_counts_per_label_combination(self):
+        counter = Counter("requests_total", "Requests", ["path"])
+        
+        counter.inc(path="/a")
+        counter.inc(2, path="/a")
+        counter.inc(path="/b")
+        
+        assert counter.value(path="/a") == 3
+        assert counter.value(path="/b") == 1
+        assert counter.value(path="/c") == 0
+    
+    def test_escapes_label_values(self):
+        counter = Counter("requests_total", "Requests", ["path"])
+        
+        counter.inc(path='a"b\\c')
+        
+        assert 'requests_total{path="a\\"b\\\\c"} 1' in counter.render()
+
+
+class TestHistogram:
+    def test_renders_cumulative_buckets(self):
+        histogram = Histogram("latency_seconds", "Latencia", ["model"], buckets=[0.1, 1.0])
+        
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, model="lr")
+        
+        lines = histogram.render()
+        assert '# TYPE latency_seconds histogram' in lines
+        assert 'latency_seconds_bucket{model="lr",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{model="lr",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{model="lr",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{model="lr"} 4' in lines
+        assert histogram.sum(model="lr") == pytest.approx(6.05)
+    
+    def test_time_and_bound_labels_observe_the_same_series(self):
+        histogram = Histogram("latency_seconds", "Latencia", ["model"])
+        
+        with histogram.time(model="lr"):
+            pass
+        with histogram.labels(model="lr").time():
+            pass
+        
+        assert histogram.count(model="lr") == 2
+        assert histogram.count(model="rf") == 0
+
+
+class TestMetricsRegistry:
+    def test_renders_metrics_and_collectors(self):
+        registry = MetricsRegistry()
+        registry.counter("texts_total", "Textos").inc()
+        registry.add_collector(lambda: ["pending 3"])
+        
+        body = registry.render()
+        
+        assert "texts_total 1" in body
+        assert "pending 3" in body
+    
+    def test_rejects_duplicate_names(self):
+        registry = MetricsRegistry()
+        registry.counter("texts_total", "Textos")
+        
+        with pytest.raises(ValueError):
+            registry.histogram("texts_total", "Otra")
+    
+    def test_metric_without_samples_fails_when_created(self):
+        class Gauge(_Metric):
+            type_name = "gauge"
+        
+        with pytest.raises(TypeError):
+            Gauge("pending", "Pendientes")
+
+
+class TestAnalyzerMetrics:
+    def test_analyzer_records_texts_and_timing_per_model(self):
+        analyzer = SentimentAnalyzer(FakeModel(sentiment="positivo"))
+        texts_before = TEXTS_TOTAL.value(model="model")
+        timings_before = ANALYZE_SECONDS.count(model="model")
+        
+        analyzer.analyze_many(["Excelente", "Muy bueno"])
+        
+        assert TEXTS_TOTAL.value(model="model") == texts_before + 2
+        assert ANALYZE_SECONDS.count(model="model") == timings_before + 1
+    
+    def test_analyzer_counts_invalid_texts(self):
+        analyzer = SentimentAnalyzer(FakeModel(sentiment="positivo"))
+        before = INVALID_TEXTS_TOTAL.value(model="model")
+        
+        with pytest.raises(ValueError):
+            analyzer.analyze("   ")
+        
+        assert INVALID_TEXTS_TOTAL.value(model="model") == before + 1
+
+
+class TestMetricsMiddleware:
+    def test_labels_requests_by_route_template(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        
+        @app.get("/items/{item_id}")
+        def get_item(item_id: str) -> dict:
+            return {"id": item_id}
+        
+        client = TestClient(app)
+        before = HTTP_REQUESTS_TOTAL.value(method="GET", path="/items/{item_id}", status="200")
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/no-existe")
+        
+        assert HTTP_REQUESTS_TOTAL.value(method="GET", path="/items/{item_id}", status="200") == before + 2
+        assert HTTP_REQUESTS_TOTAL.value(method="GET", path="otras", status="404") >= 1
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.model.artifact import artifact_path, is_current, read_artifact
+from src.model.compiled import CompiledLinearScorer
+from src.model.flat_forest import FlatForest
+from src.model.logistic_regression_model import LogisticRegressionModel
+from src.model.optimize import linear_subset, optimize_model, select_trees
+from src.model.random_forest_model import RandomForestModel
+
+DATA_PATH = Path("data/reviews.csv")
+
+TEXTS = ["Excelente atención", "Pésimo servicio", "Llegó el pedido", "!!!", ""]
+
+
+@pytest.fixture(scope="module")
+def lr_path(tmp_path_factory) -> Path:
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    output_path = tmp_path_factory.mktemp("lr") / "model.pkl"
+    LogisticRegressionModel.train(str(DATA_PATH), str(output_path))
+    return output_path
+
+
+@pytest.fixture(scope="module")
+def rf_path(tmp_path_factory) -> Path:
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    output_path = tmp_path_factory.mktemp("rf") / "model.pkl"
+    RandomForestModel.train(str(DATA_PATH), str(output_path))
+    return output_path
+
+
+class TestSelectTrees:
+    def test_stops_at_the_smallest_subset_within_tolerance(self):
+        targets = np.array([0, 1, 0, 1])
+        # Los árboles 0 y 2 aciertan todo; el 1 se equivoca en todo
+        right = np.eye(2)[targets]
+        probas = np.stack([right, 1 - right, right], axis=1)
+
+        assert select_trees(probas, targets, tolerance=0.0).tolist() == [0]
+
+
+class TestFlatForestSubset:
+    def test_subset_averages_only_the_chosen_trees(self, rf_path):
+        forest = FlatForest.from_sklearn(RandomForestModel.load(rf_path)._pipeline[-1])
+        X = np.random.default_rng(0).random((20, forest.n_features), dtype=np.float32) * 0.2
+
+        subset = forest.subset(np.array([1, 4, 7]))
+
+        assert subset.n_trees == 3
+        assert len(subset.feature) < len(forest.feature)
+        np.testing.assert_allclose(subset.predict_proba(X), forest.tree_probas(X)[:, [1, 4, 7]].mean(axis=1))
+
+
+class TestOptimizeLinear:
+    def test_subset_with_every_feature_keeps_predictions(self, lr_path):
+        scorer = CompiledLinearScorer.from_pipeline(LogisticRegressionModel.load(lr_path)._pipeline)
+
+        compact = linear_subset(scorer, np.arange(scorer.coef_by_feature.shape[0]))
+
+        assert compact.coef_by_feature.dtype == np.float32
+        np.testing.assert_allclose(compact.predict_proba(TEXTS), scorer.predict_proba(TEXTS), atol=1e-5)
+
+    def test_replaces_served_artifact_with_a_smaller_one(self, lr_path, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        LogisticRegressionModel.load(lr_path).save(str(model_path))
+        size_before = artifact_path(model_path).stat().st_size
+
+        report = optimize_model("logistic_regression", model_path=model_path, data_path=str(DATA_PATH), tolerance=0.01)
+
+        assert report['after']['accuracy'] >= report['before']['accuracy'] - 0.01
+        assert report['after']['features'] < report['before']['features']
+        assert artifact_path(model_path).stat().st_size < size_before
+        assert is_current(artifact_path(model_path), model_path)
+        served = LogisticRegressionModel.load(model_path, artifact=True)
+        assert served._pipeline is None
+        assert len(served.predict(TEXTS)) == len(TEXTS)
+
+    def test_output_path_leaves_served_artifact_untouched(self, lr_path, tmp_path):
+        output_path = tmp_path / "optimizado.artifact"
+        mtime = artifact_path(lr_path).stat().st_mtime_ns
+
+        report = optimize_model("logistic_regression", model_path=lr_path, data_path=str(DATA_PATH), output_path=output_path)
+
+        assert report['path'] == str(output_path)
+        assert read_artifact(output_path)[1]['idf'].dtype == np.float32
+        assert artifact_path(lr_path).stat().st_mtime_ns == mtime
+
+
+class TestOptimizeForest:
+    def test_trims_trees_within_tolerance(self, rf_path, tmp_path):
+        output_path = tmp_path / "optimizado.artifact"
+
+        report = optimize_model(
+            "random_forest", model_path=rf_path, data_path=str(DATA_PATH),
+            tolerance=0.01, trim_trees=True, output_path=output_path,
+        )
+
+        assert report['after']['trees'] < report['before']['trees']
+        assert report['after']['accuracy'] >= report['before']['accuracy'] - 0.01
+        assert report['after']['size_bytes'] < report['before']['size_bytes']
+        assert read_artifact(output_path)[1]['value'].dtype == np.float32
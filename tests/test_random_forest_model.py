@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 from pathlib import Path
 
+from src.model.flat_forest import flat_path
 from src.model.random_forest_model import RandomForestModel
 from src.model.base import Model
 
@@ -69,3 +71,64 @@ class TestRandomForestModelIntegration:
         result = trained_model.predict_proba(["Cualquier texto"])
         
         assert all(p >= 0 for p in result[0])
+    
+    def test_predict_with_proba_matches_predict(self, trained_model: Model):
+        texts = ["Excelente atención", "Pésimo servicio", "Llegó el pedido"]
+        
+        sentiments, probas = trained_model.predict_with_proba(texts)
+        
+        assert sentiments == trained_model.predict(texts)
+        assert all(p[s] == max(p.values()) for s, p in zip(sentiments, probas))
+    
+    def test_predict_with_proba_uses_pipeline_class_order(self, trained_model: Model):
+        _, probas = trained_model.predict_with_proba(["Buen producto"])
+        
+        expected = dict(zip(trained_model.classes, trained_model.predict_proba(["Buen producto"])[0]))
+        assert probas[0] == pytest.approx(expected)
+    
+    def test_large_batches_do_not_change_the_shared_classifier(self, trained_model: RandomForestModel):
+        small = trained_model.predict_proba(["Excelente atención"])
+        
+        large = trained_model.predict_proba(["Excelente atención"] * 600)
+        
+        assert trained_model._pipeline[-1].n_jobs == -1
+        np.testing.assert_allclose(large[0], small[0])
+    
+    def test_load_with_mmap_mode_predicts_same_as_regular_load(self, tmp_path):
+        data_path = Path("data/reviews.csv")
+        output_path = tmp_path / "test_model.pkl"
+        RandomForestModel.train(str(data_path), str(output_path))
+        
+        regular = RandomForestModel.load(output_path)
+        mapped = RandomForestModel.load(output_path, mmap_mode="r")
+        
+        texts = ["Excelente atención", "Pésimo servicio"]
+        assert mapped.predict_proba(texts) == regular.predict_proba(texts)
+    
+    def test_train_writes_flat_forest_next_to_model(self, tmp_path):
+        output_path = tmp_path / "test_model.pkl"
+        RandomForestModel.train("data/reviews.csv", str(output_path))
+        
+        assert flat_path(output_path).exists()
+    
+    def test_flat_load_predicts_same_as_sklearn(self, tmp_path):
+        output_path = tmp_path / "test_model.pkl"
+        RandomForestModel.train("data/reviews.csv", str(output_path))
+        
+        regular = RandomForestModel.load(output_path)
+        flat = RandomForestModel.load(output_path, mmap_mode="r", flat=True)
+        
+        texts = ["Excelente atención", "Pésimo servicio", "Llegó el pedido", "!!!"]
+        assert flat.is_flat
+        assert flat.predict(texts) == regular.predict(texts)
+        np.testing.assert_allclose(flat.predict_proba(texts), regular.predict_proba(texts))
+    
+    def test_flat_load_falls_back_to_sklearn_without_flat_file(self, tmp_path):
+        output_path = tmp_path / "test_model.pkl"
+        RandomForestModel.train("data/reviews.csv", str(output_path))
+        flat_path(output_path).unlink()
+        
+        model = RandomForestModel.load(output_path, flat=True)
+        
+        assert not model.is_flat
+        assert model.predict(["Excelente atención"])[0] in ["positivo", "neutral", "negativo"]
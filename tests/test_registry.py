@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.analyzer.cache import ResultCache
+import src.analyzer.registry as registry_module
+from src.analyzer.registry import AnalyzerRegistry, create_default_registry
+from src.analyzer.result_store import ResultStore
+from src.analyzer.sentiment_analyzer import SentimentAnalyzer
+from src.model.base import Model
+
+
+class CountingModel(Model):
+    """Modelo falso que cuenta cuántas veces se entrena y se carga."""
+
+    trained = 0
+    loaded = 0
+
+    def __init__(self, sentiment: str):
+        self._sentiment = sentiment
+
+    def predict(self, texts: List[str]) -> List[str]:
+        return [self._sentiment] * len(texts)
+
+    def predict_proba(self, texts: List[str]) -> List[List[float]]:
+        return [[0.8, 0.15, 0.05]] * len(texts)
+
+    @classmethod
+    def load(cls, path: Path) -> "CountingModel":
+        cls.loaded += 1
+        return cls(Path(path).read_text())
+
+    @classmethod
+    def train(cls, data_path: str, output_path: str) -> "CountingModel":
+        cls.trained += 1
+        Path(output_path).write_text("positivo")
+        return cls("positivo")
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    CountingModel.trained = 0
+    CountingModel.loaded = 0
+
+
+class TestAnalyzerRegistry:
+    def test_get_loads_model_only_once(self, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        model_path.write_text("positivo")
+        registry = AnalyzerRegistry()
+        registry.register("fake", CountingModel, model_path, "data.csv")
+
+        first = registry.get("fake")
+        second = registry.get("fake")
+
+        assert first is second
+        assert isinstance(first, SentimentAnalyzer)
+        assert CountingModel.loaded == 1
+
+    def test_get_trains_when_model_file_is_missing(self, tmp_path):
+        registry = AnalyzerRegistry()
+        registry.register("fake", CountingModel, tmp_path / "model.pkl", "data.csv")
+
+        registry.get("fake")
+
+        assert CountingModel.trained == 1
+        assert (tmp_path / "model.pkl").exists()
+
+    def test_get_raises_error_on_unknown_model(self):
+        registry = AnalyzerRegistry()
+
+        with pytest.raises(ValueError, match="Modelo desconocido"):
+            registry.get("inexistente")
+
+    def test_default_registry_serves_incremental_model_only_when_enabled(self, monkeypatch):
+        assert "incremental" not in create_default_registry(use_cache=False).names()
+
+        monkeypatch.setattr(registry_module, "INCREMENTAL_SERVING", True)
+
+        assert "incremental" in create_default_registry(use_cache=False).names()
+
+    def test_preload_loads_all_models(self, tmp_path):
+        registry = AnalyzerRegistry()
+        registry.register("a", CountingModel, tmp_path / "a.pkl", "data.csv")
+        registry.register("b", CountingModel, tmp_path / "b.pkl", "data.csv")
+
+        registry.preload()
+
+        assert CountingModel.loaded == 2
+
+    def test_preload_does_not_start_more_models_once_stopped(self, tmp_path):
+        stop = threading.Event()
+
+        class StoppingModel(CountingModel):
+            @classmethod
+            def load(cls, path):
+                stop.set()
+                return super().load(path)
+
+        registry = AnalyzerRegistry()
+        registry.register("a", StoppingModel, tmp_path / "a.pkl", "data.csv")
+        registry.register("b", CountingModel, tmp_path / "b.pkl", "data.csv")
+
+        registry.preload(stop)
+
+        assert registry.status()["a"]["state"] == "ready"
+        assert registry.status()["b"]["state"] == "pending"
+
+    def test_changed_file_is_reloaded_in_background(self, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        model_path.write_text("positivo")
+        registry = AnalyzerRegistry(reload_check_interval=0)
+        registry.register("fake", CountingModel, model_path, "data.csv")
+        old = registry.get("fake")
+
+        model_path.write_text("negativo")
+        stat = model_path.stat()
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        # La request que detecta el cambio sigue usando el modelo anterior
+        assert registry.get("fake") is old
+
+        deadline = time.monotonic() + 5
+        while registry.get("fake") is old and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert registry.get("fake").predict("Hola") == "negativo"
+        assert registry.version("fake") == model_path.stat().st_mtime_ns
+
+    def test_load_options_are_passed_to_model_load(self, tmp_path):
+        received = {}
+
+        class OptionsModel(CountingModel):
+            @classmethod
+            def load(cls, path, **options):
+                received.update(options)
+                return cls("positivo")
+
+        registry = AnalyzerRegistry()
+        registry.register("fake", OptionsModel, tmp_path / "model.pkl", "data.csv", mmap_mode="r")
+
+        registry.get("fake")
+
+        assert received == {"mmap_mode": "r"}
+
+    def test_reload_invalidates_cached_results(self, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        model_path.write_text("positivo")
+        cache = ResultCache()
+        registry = AnalyzerRegistry(cache=cache)
+        registry.register("fake", CountingModel, model_path, "data.csv")
+        registry.get("fake").analyze("Hola")
+
+        model_path.write_text("negativo")
+        registry.reload("fake")
+
+        assert cache.stats()["size"] == 0
+        assert registry.get("fake").analyze("Hola")["sentiment"] == "negativo"
+
+    def test_reload_discards_stored_results_of_previous_version(self, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        model_path.write_text("positivo")
+        store = ResultStore(tmp_path / "results.sqlite")
+        registry = AnalyzerRegistry(cache=ResultCache(), store=store)
+        registry.register("fake", CountingModel, model_path, "data.csv")
+        registry.get("fake").analyze("Hola")
+
+        model_path.write_text("negativo")
+        os.utime(model_path, ns=(time.time_ns(), registry.version("fake") + 10**9))
+        registry.reload("fake")
+
+        assert len(store) == 0
+        assert registry.get("fake").analyze("Hola")["sentiment"] == "negativo"
+        assert len(store) == 1
+        store.close()
+
+    def test_status_reports_load_state_and_time(self, tmp_path):
+        registry = AnalyzerRegistry()
+        registry.register("fake", CountingModel, tmp_path / "model.pkl", "data.csv")
+        assert registry.status()["fake"]["state"] == "pending"
+        assert not registry.is_ready()
+
+        registry.preload()
+
+        status = registry.status()["fake"]
+        assert status["state"] == "ready"
+        assert status["load_seconds"] >= 0
+        assert registry.is_ready()
+
+    def test_preload_records_failed_models_and_continues(self, tmp_path):
+        class BrokenModel(CountingModel):
+            @classmethod
+            def load(cls, path):
+                raise RuntimeError("archivo corrupto")
+
+        registry = AnalyzerRegistry()
+        registry.register("broken", BrokenModel, tmp_path / "broken.pkl", "data.csv")
+        registry.register("fake", CountingModel, tmp_path / "model.pkl", "data.csv")
+
+        registry.preload()
+
+        assert registry.status()["broken"] == {
+            "state": "failed", "load_seconds": None, "version": None, "error": "archivo corrupto"
+        }
+        assert registry.status()["fake"]["state"] == "ready"
+
+    def test_warmup_texts_are_analyzed_on_load(self, tmp_path):
+        analyzed = []
+
+        class WarmupModel(CountingModel):
+            def predict_with_proba(self, texts):
+                analyzed.extend(texts)
+                return super().predict_with_proba(texts)
+
+        registry = AnalyzerRegistry(warmup_texts=["Hola", "Chau"])
+        registry.register("fake", WarmupModel, tmp_path / "model.pkl", "data.csv")
+
+        registry.preload()
+
+        assert analyzed == ["Hola", "Chau"]
@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+import pytest
+
+from src.analyzer.result_store import ResultStore
+
+RESULT = {"sentiment": "positivo", "score": 0.8, "confidence": {"positivo": 0.8, "neutral": 0.15, "negativo": 0.05}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(tmp_path / "results.sqlite")
+    yield store
+    store.close()
+
+
+class TestResultStore:
+    def test_get_many_returns_only_stored_hashes(self, store):
+        store.put_many("lr", 1, {"a": RESULT, "b": {**RESULT, "sentiment": "negativo"}})
+
+        found = store.get_many("lr", 1, ["a", "b", "c", "a"])
+
+        assert found == {"a": RESULT, "b": {**RESULT, "sentiment": "negativo"}}
+        assert store.stats()["hits"] == 2
+        assert store.stats()["misses"] == 1
+
+    def test_keys_include_model_and_version(self, store):
+        store.put_many("lr", 1, {"a": RESULT})
+
+        assert store.get_many("lr", 2, ["a"]) == {}
+        assert store.get_many("rf", 1, ["a"]) == {}
+
+    def test_large_batches_are_read_in_chunks(self, store):
+        results = {f"h{i}": RESULT for i in range(1200)}
+        store.put_many("lr", 1, results)
+
+        assert len(store.get_many("lr", 1, list(results))) == 1200
+
+    def test_results_survive_a_restart(self, tmp_path):
+        path = tmp_path / "results.sqlite"
+        first = ResultStore(path)
+        first.put_many("lr", 1, {"a": RESULT})
+        first.close()
+
+        second = ResultStore(path)
+
+        assert second.get_many("lr", 1, ["a"]) == {"a": RESULT}
+        second.close()
+
+    def test_is_shared_between_processes(self, store):
+        code = (
+            "from src.analyzer.result_store import ResultStore;"
+            f"ResultStore({str(store.path)!r}).put_many('lr', 1, {{'a': {{'sentiment': 'neutral'}}}})"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+        assert store.get_many("lr", 1, ["a"]) == {"a": {"sentiment": "neutral"}}
+
+    def test_oldest_entries_are_evicted_past_max_entries(self, tmp_path):
+        store = ResultStore(tmp_path / "results.sqlite", max_entries=10, trim_every=1)
+
+        for i in range(25):
+            store.put_many("lr", 1, {f"h{i}": RESULT})
+
+        assert len(store) <= 10
+        assert store.get_many("lr", 1, ["h24"]) != {}
+        assert store.get_many("lr", 1, ["h0"]) == {}
+        assert store.stats()["evictions"] >= 15
+        store.close()
+
+    def test_discard_stale_keeps_only_given_version(self, store):
+        store.put_many("lr", 1, {"a": RESULT})
+        store.put_many("lr", 2, {"a": RESULT})
+        store.put_many("rf", 1, {"a": RESULT})
+
+        removed = store.discard_stale("lr", 2)
+
+        assert removed == 1
+        assert store.get_many("lr", 2, ["a"]) != {}
+        assert store.get_many("rf", 1, ["a"]) != {}
@@ -80,4 +80,44 @@ class TestSentimentAnalyzer:
         analyzer = SentimentAnalyzer(FakeModel())
         
         with pytest.raises(ValueError, match="texto no puede estar vacío"):
-            analyzer.analyze("")
\ No newline at end of file
+            analyzer.analyze("")
+    
+    def test_analyze_many_returns_one_result_per_text(self):
+        analyzer = SentimentAnalyzer(FakeModel(sentiment="negativo", probas=[0.1, 0.2, 0.7]))
+        
+        results = analyzer.analyze_many(["Malo", "Muy malo", "Pésimo"])
+        
+        assert len(results) == 3
+        assert all(r["sentiment"] == "negativo" for r in results)
+        assert all(r["score"] == 0.7 for r in results)
+    
+    def test_analyze_many_calls_model_once_for_whole_batch(self):
+        model = FakeModel()
+        calls = []
+        original_predict = model.predict
+        model.predict = lambda texts: calls.append(texts) or original_predict(texts)
+        analyzer = SentimentAnalyzer(model)
+        
+        analyzer.analyze_many(["Uno", "Dos", "Tres"])
+        
+        assert calls == [["Uno", "Dos", "Tres"]]
+    
+    def test_analyze_many_reports_invalid_texts_without_failing_batch(self):
+        analyzer = SentimentAnalyzer(FakeModel(sentiment="positivo"))
+        
+        results = analyzer.analyze_many(["Excelente", "", "Genial"])
+        
+        assert results[0]["sentiment"] == "positivo"
+        assert results[1] == {"error": "El texto no puede estar vacío"}
+        assert results[2]["sentiment"] == "positivo"
+    
+    def test_analyze_uses_model_class_order(self):
+        class AlphabeticalModel(FakeModel):
+            classes = ["negativo", "neutral", "positivo"]
+        
+        analyzer = SentimentAnalyzer(AlphabeticalModel(sentiment="negativo", probas=[0.7, 0.2, 0.1]))
+        
+        result = analyzer.analyze("Pésimo")
+        
+        assert result["score"] == 0.7
+        assert result["confidence"]["positivo"] == 0.1
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from pathlib import Path
+
+from src.model.artifact import artifact_path
+from src.model import sweep
+from src.model.logistic_regression_model import LogisticRegressionModel
+from src.model.sweep import SweepConfig, load_configs, run_sweep, select_best
+
+DATA_PATH = Path("data/reviews.csv")
+
+CONFIGS = [
+    SweepConfig("lr_chico", "logistic_regression", {'max_features': 500}),
+    SweepConfig("lr_chico_c10", "logistic_regression", {'max_features': 500}, {'C': 10.0}),
+    SweepConfig("rf_chico", "random_forest", {'max_features': 300}, {'n_estimators': 5, 'max_depth': 5}),
+]
+
+
+@pytest.fixture(scope="module")
+def results(tmp_path_factory):
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    cache_dir = tmp_path_factory.mktemp("sweep")
+    return cache_dir, run_sweep(CONFIGS, str(DATA_PATH), workers=2, cache_dir=cache_dir)
+
+
+class TestRunSweep:
+    def test_reports_every_config(self, results):
+        _, rows = results
+        
+        assert [row['name'] for row in rows] == [config.name for config in CONFIGS]
+        for row in rows:
+            assert 0 <= row['accuracy'] <= 1
+            assert row['latency_ms'] > 0
+            assert row['size_bytes'] > 0
+            assert Path(row['path']).exists()
+    
+    def test_size_is_that_of_the_served_artifact(self, results):
+        _, rows = results
+        
+        for row in rows:
+            assert row['size_bytes'] == artifact_path(Path(row['path'])).stat().st_size
+    
+    def test_tfidf_matrix_is_cached_once_per_vectorizer(self, results):
+        cache_dir, _ = results
+        
+        assert len(list(cache_dir.glob("features-*.joblib"))) == 2
+    
+    def test_trained_models_can_be_loaded(self, results):
+        _, rows = results
+        
+        model = LogisticRegressionModel.load(rows[0]['path'])
+        
+        assert model.predict(["Excelente atención"])[0] in ["positivo", "neutral", "negativo"]
+    
+    def test_publish_replaces_the_served_model(self, results, tmp_path, monkeypatch):
+        _, rows = results
+        target = tmp_path / "logistic_regression_model.pkl"
+        monkeypatch.setitem(sweep.MODEL_PATHS, "logistic_regression", target)
+        
+        assert sweep.publish(rows[0]) == target
+        assert target.exists()
+
+
+class TestSelectBest:
+    def test_picks_fastest_model_over_the_accuracy_bar(self):
+        rows = [
+            {'name': 'preciso', 'accuracy': 0.95, 'latency_ms': 2.0},
+            {'name': 'rapido', 'accuracy': 0.91, 'latency_ms': 0.5},
+            {'name': 'impreciso', 'accuracy': 0.80, 'latency_ms': 0.1},
+        ]
+        
+        assert select_best(rows, 0.9)['name'] == 'rapido'
+    
+    def test_returns_none_when_no_model_meets_the_bar(self):
+        assert select_best([{'name': 'a', 'accuracy': 0.5, 'latency_ms': 1.0}], 0.9) is None
+
+
+class TestLoadConfigs:
+    def test_reads_configs_from_json(self, tmp_path):
+        path = tmp_path / "configs.json"
+        path.write_text(json.dumps([
+            {"name": "lr", "model": "logistic_regression", "vectorizer": {"ngram_range": [1, 2]}},
+        ]))
+        
+        configs = load_configs(str(path))
+        
+        assert configs == [SweepConfig("lr", "logistic_regression", {'ngram_range': (1, 2)})]
+    
+    def test_unknown_model_raises(self):
+        with pytest.raises(ValueError):
+            SweepConfig("x", "svm").build_classifier()
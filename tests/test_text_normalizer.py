@@ -0,0 +1,88 @@
+import pickle
+
+import joblib
+import pandas as pd
+import pytest
+from pathlib import Path
+
+from src.model.compiled import CompiledTfidfVectorizer
+from src.model.text_normalizer import TextNormalizer
+from src.model.training import build_tfidf
+
+DATA_PATH = Path("data/reviews.csv")
+
+
+@pytest.fixture(scope="module")
+def texts():
+    if not DATA_PATH.exists():
+        pytest.skip("reviews.csv no encontrado")
+    return pd.read_csv(DATA_PATH)["message"].tolist()[:300]
+
+
+class TestTextNormalizer:
+    def test_strips_accents_case_and_repeated_punctuation(self):
+        normalizer = TextNormalizer()
+
+        assert normalizer.tokenize("¡¡¡PÉSIMO!!! Atención...") == ["pesimo", "atencion"]
+
+    def test_keeps_enie(self):
+        assert TextNormalizer().tokenize("Un año de señal") == ["un", "año", "de", "señal"]
+
+    def test_collapses_elongated_words(self):
+        assert TextNormalizer().tokenize("buenooo siiiii, llegó correcto") == ["bueno", "si", "llego", "correcto"]
+
+    def test_maps_emoji_to_polarity_terms(self):
+        tokens = TextNormalizer().tokenize("genial😍👍🏽 pero tarde😡 🚀")
+
+        assert tokens == ["genial", "emojipositivo", "emojipositivo", "pero", "tarde", "emojinegativo"]
+
+    def test_options_can_be_disabled(self):
+        normalizer = TextNormalizer(lowercase=False, strip_accents=False, emoji=False, elongation=False)
+
+        assert normalizer.tokenize("Buenooo 👍 atención") == ["Buenooo", "atención"]
+
+    def test_memoizes_short_texts_only(self):
+        normalizer = TextNormalizer(cache_max_chars=20)
+
+        first = normalizer.tokenize("Muy bueno")
+        first.append("modificado")
+        assert normalizer.tokenize("Muy bueno") == ["muy", "bueno"]
+        normalizer.tokenize("un texto bastante más largo que veinte caracteres")
+
+        assert (normalizer.hits, normalizer.misses) == (1, 1)
+
+    def test_cache_is_bounded(self):
+        normalizer = TextNormalizer(cache_size=3)
+
+        for i in range(10):
+            normalizer.tokenize(f"mensaje {i}")
+
+        assert len(normalizer._cache) <= 3
+
+    def test_pickle_keeps_params_but_not_cache(self):
+        normalizer = TextNormalizer(elongation=False)
+        normalizer.tokenize("Muy bueno")
+
+        restored = pickle.loads(pickle.dumps(normalizer))
+
+        assert restored.get_params() == normalizer.get_params()
+        assert restored._cache == {}
+        assert restored.tokenize("Buenooo") == ["buenooo"]
+
+
+class TestBuildTfidf:
+    def test_normalization_reduces_vocabulary(self, texts):
+        plain = build_tfidf(normalize=False).fit(texts)
+        normalized = build_tfidf(normalize=True).fit(texts)
+
+        assert len(normalized.vocabulary_) < len(plain.vocabulary_)
+
+    def test_fitted_vectorizer_survives_joblib_and_compiles(self, texts, tmp_path):
+        vectorizer = build_tfidf(ngram_range=(1, 2)).fit(texts)
+        joblib.dump(vectorizer, tmp_path / "tfidf.pkl")
+        loaded = joblib.load(tmp_path / "tfidf.pkl")
+        compiled = CompiledTfidfVectorizer.from_sklearn(loaded)
+        sample = texts[:20] + ["¡¡¡Pésimo!!! 😡", ""]
+
+        assert (loaded.transform(sample) != vectorizer.transform(sample)).nnz == 0
+        assert compiled.dense(sample) == pytest.approx(vectorizer.transform(sample).toarray())
@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from src.analyzer.triage import TriageQueue
+
+
+def result(negative: float) -> dict:
+    """Resultado con la forma de SentimentAnalyzer.analyze."""
+    rest = (1 - negative) / 2
+    confidence = {'positivo': rest, 'neutral': rest, 'negativo': negative}
+    return {'sentiment': max(confidence, key=confidence.get), 'score': max(confidence.values()), 'confidence': confidence}
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTriageQueue:
+    def test_top_orders_by_negative_probability(self):
+        queue = TriageQueue()
+        for text, negative in [("a", 0.2), ("b", 0.9), ("c", 0.5)]:
+            queue.ingest(text, result(negative))
+        
+        assert [entry.text for entry in queue.top(2)] == ["b", "c"]
+    
+    def test_ties_are_ordered_by_recency(self):
+        clock = FakeClock()
+        queue = TriageQueue(clock=clock)
+        queue.ingest("viejo", result(0.801))
+        clock.now += 10
+        queue.ingest("nuevo", result(0.799))
+        
+        assert [entry.text for entry in queue.top(2)] == ["nuevo", "viejo"]
+    
+    def test_least_critical_cases_are_evicted_when_full(self):
+        queue = TriageQueue(max_entries=2)
+        for text, negative in [("a", 0.9), ("b", 0.1), ("c", 0.5)]:
+            queue.ingest(text, result(negative))
+        
+        assert [entry.text for entry in queue.top(10)] == ["a", "c"]
+        assert queue.stats()['evicted'] == 1
+    
+    def test_old_cases_expire(self):
+        clock = FakeClock()
+        queue = TriageQueue(max_age_seconds=60, clock=clock)
+        queue.ingest("viejo", result(0.9))
+        clock.now += 30
+        queue.ingest("nuevo", result(0.1))
+        clock.now += 40
+        
+        assert [entry.text for entry in queue.top(10)] == ["nuevo"]
+        assert queue.stats()['expired'] == 1
+    
+    def test_same_id_replaces_previous_case(self):
+        clock = FakeClock()
+        queue = TriageQueue(max_age_seconds=60, clock=clock)
+        queue.ingest("primera versión", result(0.9), case_id="ticket-1")
+        clock.now += 50
+        queue.ingest("segunda versión", result(0.3), case_id="ticket-1")
+        clock.now += 20
+        
+        assert len(queue) == 1
+        assert queue.get("ticket-1").text == "segunda versión"
+    
+    def test_pages_cover_every_case_once_even_with_new_arrivals(self):
+        queue = TriageQueue()
+        for i in range(25):
+            queue.ingest(f"caso {i}", result(i / 100))
+        
+        seen, cursor = [], None
+        while True:
+            entries, cursor = queue.page(10, cursor)
+            seen.extend(entry.text for entry in entries)
+            # Un caso nuevo más crítico que todos no desplaza las páginas siguientes
+            queue.ingest("urgente", result(0.99))
+            if cursor is None:
+                break
+        
+        assert seen == [f"caso {i}" for i in reversed(range(25))]
+    
+    def test_invalid_cursor_raises_value_error(self):
+        with pytest.raises(ValueError):
+            TriageQueue().page(10, "no-es-un-cursor")
+    
+    def test_remove_takes_case_out_of_the_queue(self):
+        queue = TriageQueue()
+        entry = queue.ingest("a", result(0.9))
+        
+        assert queue.remove(entry.id)
+        assert not queue.remove(entry.id)
+        assert queue.top(10) == []
+    
+    def test_queries_on_a_full_queue_are_sub_millisecond(self):
+        queue = TriageQueue(max_entries=10000)
+        for i in range(12000):
+            queue.ingest(f"caso {i}", result((i * 7919 % 1000) / 1000))
+        
+        started = time.perf_counter()
+        for _ in range(100):
+            queue.top(10)
+            queue.page(50)
+        elapsed = (time.perf_counter() - started) / 200
+        
+        assert len(queue) == 10000
+        assert elapsed < 0.001
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from src.analyzer.worker_pool import InferencePool, PoolSaturatedError
+
+
+class TestInferencePool:
+    def test_run_returns_function_result(self):
+        pool = InferencePool(max_workers=1, max_pending=10)
+        
+        result = asyncio.run(pool.run(sum, [1, 2, 3]))
+        
+        assert result == 6
+    
+    def test_reserve_raises_error_when_queue_is_full(self):
+        pool = InferencePool(max_workers=1, max_pending=2)
+        
+        with pool.reserve(2):
+            with pytest.raises(PoolSaturatedError):
+                with pool.reserve(1):
+                    pass
+    
+    def test_reserve_releases_slots_on_exit(self):
+        pool = InferencePool(max_workers=1, max_pending=2)
+        
+        with pool.reserve(2):
+            assert pool.pending == 2
+        
+        assert pool.pending == 0
+    
+    def test_reserve_releases_slots_on_error(self):
+        pool = InferencePool(max_workers=1, max_pending=2)
+        
+        with pytest.raises(RuntimeError):
+            with pool.reserve(1):
+                raise RuntimeError("falla")
+        
+        assert pool.pending == 0
+    
+    def test_reserve_when_available_waits_for_free_slots(self):
+        pool = InferencePool(max_workers=1, max_pending=1)
+        
+        async def scenario():
+            order = []
+            
+            async def holder():
+                with pool.reserve(1):
+                    await asyncio.sleep(0.05)
+                    order.append("holder")
+            
+            async def waiter():
+                await asyncio.sleep(0.01)
+                async with pool.reserve_when_available(1):
+                    order.append("waiter")
+            
+            await asyncio.gather(holder(), waiter())
+            return order
+        
+        assert asyncio.run(scenario()) == ["holder", "waiter"]
+        assert pool.pending == 0